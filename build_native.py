@@ -8,61 +8,127 @@ to provide maximum performance for cryptographic operations.
 
 import os
 import sys
+import json
 import subprocess
 import platform
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
+
+# Assembler probe results, keyed by compiler binary; reused across builds
+PROBE_CACHE_FILE = Path(
+    os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+) / 'fastcrypter' / 'cpu_probe.json'
+
+
+# Extra flags for compute-bound kernel translation units (hot=True). These
+# drop stack canaries and asynchronous unwind tables, trading a little
+# hardening for shorter prologues in per-block functions that are called
+# millions of times and use no variable-length stack buffers.
+HOT_PATH_UNHARDENED_FLAGS = [
+    '-fno-stack-protector',
+    '-fno-asynchronous-unwind-tables',
+    '-fomit-frame-pointer',
+]
+
+
+@lru_cache(maxsize=None)
+def _detect_platform() -> str:
+    """Detect current platform."""
+    system = platform.system()
+    if system == 'Windows':
+        return 'windows'
+    elif system == 'Darwin':
+        return 'macos'
+    else:
+        return 'linux'
+
+
+@lru_cache(maxsize=None)
+def _detect_compilers(platform_name: str) -> tuple:
+    """Detect available compilers as (language, compiler) pairs."""
+    compilers = {}
+    
+    # C compiler
+    for cc in ['gcc', 'clang', 'cc']:
+        if shutil.which(cc):
+            compilers['c'] = cc
+            break
+    
+    # C++ compiler
+    for cxx in ['g++', 'clang++', 'c++']:
+        if shutil.which(cxx):
+            compilers['cxx'] = cxx
+            break
+    
+    # Windows-specific
+    if platform_name == 'windows':
+        if shutil.which('x86_64-w64-mingw32-gcc'):
+            compilers['c'] = 'x86_64-w64-mingw32-gcc'
+        if shutil.which('x86_64-w64-mingw32-g++'):
+            compilers['cxx'] = 'x86_64-w64-mingw32-g++'
+    
+    return tuple(compilers.items())
+
+
+@lru_cache(maxsize=None)
+def _detect_launcher() -> tuple:
+    """Detect a compiler launcher (ccache) for cached rebuilds."""
+    ccache = shutil.which('ccache')
+    return (ccache,) if ccache else ()
 
 
 class NativeLibraryBuilder:
     """Builder for native C/C++ libraries."""
     
-    def __init__(self):
-        """Initialize the builder."""
+    def __init__(self, use_ccache: bool = True, debug: bool = False):
+        """
+        Initialize the builder.
+        
+        Args:
+            use_ccache: Prefix compiler commands with ccache when it is installed
+            debug: Keep debug info and symbols (no -DNDEBUG, no stripping)
+        """
+        self.debug = debug
         self.project_root = Path(__file__).parent
-        self.native_dir = self.project_root / 'fastCrypter' / 'native'
+        self.native_dir = self.project_root / 'fastcrypter' / 'native'
         self.libs_dir = self.native_dir / 'libs'
         self.platform = self._detect_platform()
         self.platform_dir = self.libs_dir / self.platform
+        self.pgo_dir = self.libs_dir / 'pgo'
+        self.obj_dir = self.libs_dir / 'obj' / self.platform
         
         # Compiler settings
         self.compilers = self._detect_compilers()
+        self.launcher = self._detect_launcher() if use_ccache else []
         self.lib_extension = self._get_lib_extension()
         
+        # Compile jobs run concurrently and share stdout
+        self._print_lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._asm_probes = None
+        self._warned_march = False
+        
+    def _log(self, message: str):
+        """Print a message without interleaving output from parallel jobs."""
+        with self._print_lock:
+            print(message, flush=True)
+    
     def _detect_platform(self) -> str:
         """Detect current platform."""
-        system = platform.system()
-        if system == 'Windows':
-            return 'windows'
-        elif system == 'Darwin':
-            return 'macos'
-        else:
-            return 'linux'
+        return _detect_platform()
     
     def _detect_compilers(self) -> dict:
         """Detect available compilers."""
-        compilers = {}
-        
-        # C compiler
-        for cc in ['gcc', 'clang', 'cc']:
-            if shutil.which(cc):
-                compilers['c'] = cc
-                break
-        
-        # C++ compiler
-        for cxx in ['g++', 'clang++', 'c++']:
-            if shutil.which(cxx):
-                compilers['cxx'] = cxx
-                break
-        
-        # Windows-specific
-        if self.platform == 'windows':
-            if shutil.which('x86_64-w64-mingw32-gcc'):
-                compilers['c'] = 'x86_64-w64-mingw32-gcc'
-            if shutil.which('x86_64-w64-mingw32-g++'):
-                compilers['cxx'] = 'x86_64-w64-mingw32-g++'
-        
-        return compilers
+        return dict(_detect_compilers(self.platform))
+    
+    def _detect_launcher(self) -> list:
+        """Detect a compiler launcher (ccache) for cached rebuilds."""
+        return list(_detect_launcher())
     
     def _get_lib_extension(self) -> str:
         """Get library extension for current platform."""
@@ -73,39 +139,242 @@ class NativeLibraryBuilder:
         }
         return extensions.get(self.platform, '.so')
     
-    def _get_compile_flags(self, language: str) -> list:
-        """Get compilation flags for the language."""
+    def _probe_cache_key(self) -> str:
+        """Identify the C compiler binary; a changed mtime invalidates its probes."""
+        compiler = shutil.which(self.compilers.get('c', '')) or ''
+        try:
+            compiler = os.path.realpath(compiler)
+            return f"{compiler}:{os.stat(compiler).st_mtime_ns}"
+        except OSError:
+            return compiler
+    
+    def _load_probe_cache(self) -> dict:
+        """Load the on-disk probe cache (empty if missing or unreadable)."""
+        try:
+            with open(PROBE_CACHE_FILE, 'r') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _probe(self, key: str, args: list, source: str) -> bool:
+        """Check (once) whether the C compiler accepts a source with the given arguments."""
+        with self._probe_lock:
+            if self._asm_probes is None:
+                cache = self._load_probe_cache()
+                self._asm_probes = dict(cache.get(self._probe_cache_key(), {}))
+            
+            if key not in self._asm_probes:
+                try:
+                    result = subprocess.run(
+                        [self.compilers['c'], *args, '-c', '-', '-o', os.devnull],
+                        input=source, capture_output=True, text=True
+                    )
+                    self._asm_probes[key] = result.returncode == 0
+                except (KeyError, OSError):
+                    return False
+                self._save_probe_cache()
+            
+            return self._asm_probes[key]
+    
+    def _probe_asm(self, instruction: str) -> bool:
+        """Check (once) whether the C compiler's assembler accepts an instruction."""
+        return self._probe(instruction, ['-x', 'assembler'], instruction + '\n')
+    
+    def _probe_flags(self, flags: list) -> bool:
+        """Check (once) whether the C compiler accepts a set of flags."""
+        return self._probe('flags: ' + ' '.join(flags), ['-x', 'c', '-Werror', *flags],
+                           'int main(void) { return 0; }\n')
+    
+    def _save_probe_cache(self):
+        """Store the probe results for this compiler, dropping stale entries."""
+        key = self._probe_cache_key()
+        compiler = key.rsplit(':', 1)[0]
+        cache = {k: v for k, v in self._load_probe_cache().items()
+                 if k.rsplit(':', 1)[0] != compiler}
+        cache[key] = self._asm_probes
+        try:
+            PROBE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = PROBE_CACHE_FILE.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(cache, f, indent=2, sort_keys=True)
+            os.replace(tmp_file, PROBE_CACHE_FILE)
+        except OSError:
+            pass  # The cache is only an optimization
+    
+    def _get_sha_flags(self) -> list:
+        """
+        Get flags enabling the SHA-NI SHA-256 path in hash_algorithms.
+        
+        The SHA-NI block function is compiled with a target attribute and
+        selected via CPUID at load time, so only the toolchain is probed
+        here; the library stays safe to load on CPUs without SHA-NI.
+        """
+        if platform.machine().lower() not in ('x86_64', 'amd64', 'i386', 'i686'):
+            return []
+        if self._probe_asm('sha256msg1 %xmm0, %xmm1'):
+            return ['-DCONFIG_HAS_SHA_NI=1']
+        return []
+    
+    def _get_aes_flags(self) -> list:
+        """Get flags enabling the AES-NI/VAES AES-CTR paths in crypto_core (see _get_sha_flags)."""
+        if platform.machine().lower() not in ('x86_64', 'amd64', 'i386', 'i686'):
+            return []
+        if not self._probe_asm('aesenc %xmm0, %xmm1'):
+            return []
+        if self._probe_asm('vaesenc %zmm0, %zmm1, %zmm2'):
+            return ['-DCONFIG_HAS_AES_NI=1', '-DCONFIG_HAS_VAES=1']
+        return ['-DCONFIG_HAS_AES_NI=1']
+    
+    def _isa_variants(self) -> list:
+        """
+        Get the (name, flags) ISA tiers built for fat (--fat) builds.
+        
+        Each tier replaces the host tuning (_get_march_flags) so the
+        shipped libraries do not depend on the build host. The native
+        loader picks the best tier the running CPU supports.
+        """
+        machine = platform.machine().lower()
+        
+        if machine in ('x86_64', 'amd64'):
+            return [
+                ('generic', ['-march=x86-64-v2']),
+                ('avx2', ['-march=x86-64-v3', '-maes', '-mpclmul']),
+                ('avx512', ['-march=x86-64-v4', '-maes', '-mpclmul',
+                            '-mvaes', '-mvpclmulqdq', '-msha']),
+            ]
+        elif machine in ('aarch64', 'arm64'):
+            return [
+                ('generic', ['-march=armv8-a']),
+                ('crypto', ['-march=armv8.2-a+crypto+sha3']),
+            ]
+        
+        return []
+    
+    def _get_march_flags(self) -> list:
+        """
+        Get the CPU tuning flags for host (non --fat) builds.
+        
+        Uses the first candidate the compiler accepts, e.g. clang on Apple
+        Silicon rejects -march=native but takes -mcpu=native. Without a
+        working candidate the build falls back to the compiler's default
+        target. FASTCRYPTER_DISABLE_NATIVE=1 skips host tuning, for
+        libraries that are copied to other machines.
+        """
+        if os.environ.get('FASTCRYPTER_DISABLE_NATIVE') == '1':
+            return []
+        
+        machine = platform.machine().lower()
+        if machine in ('x86_64', 'amd64'):
+            # No x86-64-v3 fallback: unlike -march=native it is not
+            # guaranteed to run on the build host
+            candidates = [['-march=native'],
+                          ['-march=x86-64-v2', '-mtune=native'],
+                          ['-march=x86-64-v2']]
+        elif machine in ('aarch64', 'arm64'):
+            candidates = [['-march=native'], ['-mcpu=native']]
+        else:
+            candidates = [['-march=native']]
+        
+        for flags in candidates:
+            if self._probe_flags(flags):
+                return flags
+        
+        if not self._warned_march:
+            self._warned_march = True
+            self._log("Warning: compiler accepts none of the -march/-mcpu options, "
+                      "building for its default target")
+        return []
+    
+    def _get_compile_flags(self, language: str, variant: str = None, hot: bool = False) -> list:
+        """
+        Get compilation flags for the language and optional ISA variant.
+        
+        hot=True adds HOT_PATH_UNHARDENED_FLAGS for kernel-only sources.
+        """
+        # Fat builds target each ISA tier instead of the build host
+        if variant:
+            march_flags = dict(self._isa_variants())[variant]
+        else:
+            march_flags = self._get_march_flags()
+        
         base_flags = [
             '-O3',           # Maximum optimization
             '-fPIC',         # Position independent code
             '-Wall',         # All warnings
             '-Wextra',       # Extra warnings
-            '-march=native', # Optimize for current CPU
-            '-ffast-math',   # Fast math operations
+            *march_flags,
+            '-fno-math-errno',      # Lets libm calls vectorize/inline
+            '-fno-trapping-math',   # without -ffast-math's FTZ/DAZ side effects
+            '-fvisibility=hidden',  # Only EXPORT-annotated symbols are public
+            '-ffunction-sections',  # Let the linker drop unused functions
+            '-fdata-sections',      # and data (--gc-sections / -dead_strip)
             '-DNDEBUG',      # Release mode
         ]
         
+        if self.debug:
+            base_flags[base_flags.index('-DNDEBUG')] = '-g'
+        
         if language == 'cxx':
             base_flags.append('-std=c++17')
+            base_flags.extend(self._get_sha_flags())
+        else:
+            base_flags.extend(self._get_aes_flags())
         
         # Platform-specific flags
         if self.platform == 'linux':
-            base_flags.extend(['-DLINUX', '-flto', '-funroll-loops'])
+            base_flags.extend(['-DLINUX', '-funroll-loops',
+                               '-fno-semantic-interposition', '-fno-plt'])
         elif self.platform == 'macos':
-            base_flags.extend(['-DMACOS', '-flto', '-funroll-loops'])
+            base_flags.extend(['-DMACOS', '-funroll-loops'])
         elif self.platform == 'windows':
             base_flags.extend(['-DWINDOWS'])
         
+        if hot:
+            # Win64 SEH needs the unwind tables
+            base_flags.extend(flag for flag in HOT_PATH_UNHARDENED_FLAGS
+                              if self.platform != 'windows' or 'unwind' not in flag)
+        
+        base_flags.extend(self._get_lto_flags(language))
+        
         return base_flags
     
-    def _get_link_flags(self) -> list:
+    def _get_lto_flags(self, language: str) -> list:
+        """
+        Get link-time optimization flags for the detected compiler.
+        
+        Clang uses ThinLTO, GCC uses its parallel WHOPR mode (-flto=auto).
+        Set FASTCRYPTER_LTO=0 to disable LTO when debugging.
+        """
+        if os.environ.get('FASTCRYPTER_LTO', '1') == '0':
+            return []
+        
+        compiler = self.compilers.get(language, '')
+        
+        if self.platform == 'windows':
+            # mingw's default linker cannot do ThinLTO, lld can
+            if shutil.which('lld'):
+                return ['-flto=thin', '-fuse-ld=lld']
+            return []
+        
+        if 'clang' in compiler:
+            return ['-flto=thin']
+        return ['-flto=auto', '-fuse-linker-plugin']
+    
+    def _get_link_flags(self, language: str) -> list:
         """Get linking flags."""
         flags = ['-shared']
         
         if self.platform in ['linux', 'macos']:
-            flags.extend(['-lm', '-flto'])
+            flags.append('-lm')
+            flags.extend(self._get_lto_flags(language))
+            if self.platform == 'linux':
+                flags.extend(['-Wl,-O3', '-Wl,--gc-sections'])
+            else:
+                flags.append('-Wl,-dead_strip')
         elif self.platform == 'windows':
-            flags.append('-Wl,--out-implib,lib$@.a')
+            flags.extend(['-Wl,--out-implib,lib$@.a', '-Wl,--gc-sections'])
+            flags.extend(self._get_lto_flags(language))
         
         return flags
     
@@ -124,6 +393,7 @@ class NativeLibraryBuilder:
         
         print(f"C compiler: {self.compilers['c']}")
         print(f"C++ compiler: {self.compilers['cxx']}")
+        print(f"Compiler cache: {self.launcher[0] if self.launcher else 'disabled'}")
         print(f"Platform: {self.platform}")
         print(f"Library extension: {self.lib_extension}")
         
@@ -135,80 +405,110 @@ class NativeLibraryBuilder:
         self.platform_dir.mkdir(parents=True, exist_ok=True)
         print(f"Created: {self.platform_dir}")
     
-    def compile_crypto_core(self) -> bool:
-        """Compile crypto_core library."""
-        print("Compiling crypto_core library...")
-        
-        source_file = self.native_dir / 'crypto_core.c'
-        output_file = self.platform_dir / f'libcrypto_core{self.lib_extension}'
-        
-        if not source_file.exists():
-            print(f"Source file not found: {source_file}")
-            return False
+    def _run_compiler(self, cmd: list, cwd: Path, tag: str) -> bool:
+        """
+        Run a compiler command, streaming its output line by line.
+        
+        Lines are prefixed with the tag so output from parallel jobs can
+        be told apart.
+        """
+        env = os.environ.copy()
+        if self.launcher:
+            # Hash paths relative to the project so caches are shareable
+            env.setdefault('CCACHE_BASEDIR', str(self.project_root))
+        
+        process = subprocess.Popen(
+            cmd, cwd=cwd, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1
+        )
+        with process.stdout:
+            for line in process.stdout:
+                self._log(f"   [{tag}] {line.rstrip()}")
+        return process.wait() == 0
+    
+    def _strip_library(self, output_file: Path) -> bool:
+        """Strip symbols not needed for dynamic linking (release builds only)."""
+        if self.debug or self.platform not in ('linux', 'macos'):
+            return True
         
-        # Build command
-        cmd = [
-            self.compilers['c'],
-            *self._get_compile_flags('c'),
-            *self._get_link_flags(),
-            '-o', str(output_file),
-            str(source_file)
-        ]
+        strip = shutil.which('strip')
+        if not strip:
+            return True
         
-        try:
-            print(f"   Command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.native_dir)
-            
-            if result.returncode == 0:
-                print(f"crypto_core library built: {output_file}")
-                return True
-            else:
-                print(f"Compilation failed:")
-                print(f"   stdout: {result.stdout}")
-                print(f"   stderr: {result.stderr}")
-                return False
-                
-        except Exception as e:
-            print(f"Compilation error: {e}")
-            return False
+        strip_flags = ['--strip-unneeded'] if self.platform == 'linux' else ['-x']
+        return self._run_compiler([strip, *strip_flags, str(output_file)],
+                                  self.native_dir, output_file.name)
     
-    def compile_hash_algorithms(self) -> bool:
-        """Compile hash_algorithms library."""
-        print("Compiling hash_algorithms library...")
-        
-        source_file = self.native_dir / 'hash_algorithms.cpp'
-        output_file = self.platform_dir / f'libhash_algorithms{self.lib_extension}'
+    def _compile_library(self, name: str, source_name: str, language: str,
+                         extra_flags: list = None, variant: str = None,
+                         hot: bool = False) -> bool:
+        """
+        Compile and link one native library.
+        
+        The source is compiled to an object file first and linked in a
+        separate step, so a compiler cache can serve the compile step.
+        """
+        self._log(f"Compiling {name} library{f' ({variant})' if variant else ''}...")
+        
+        source_file = self.native_dir / source_name
+        suffix = f'.{variant}' if variant else ''
+        output_file = self.platform_dir / f'lib{name}{suffix}{self.lib_extension}'
+        object_file = self.obj_dir / f'lib{name}{suffix}.o'
         
         if not source_file.exists():
-            print(f"Source file not found: {source_file}")
+            self._log(f"Source file not found: {source_file}")
             return False
         
-        # Build command
-        cmd = [
-            self.compilers['cxx'],
-            *self._get_compile_flags('cxx'),
-            *self._get_link_flags(),
+        compile_flags = [*self._get_compile_flags(language, variant, hot), *(extra_flags or [])]
+        
+        # Build commands
+        compile_cmd = [
+            *self.launcher,
+            self.compilers[language],
+            *compile_flags,
+            '-c', str(source_file),
+            '-o', str(object_file)
+        ]
+        link_cmd = [
+            self.compilers[language],
+            *compile_flags,
             '-o', str(output_file),
-            str(source_file)
+            str(object_file),
+            # Libraries must follow the objects they resolve symbols for
+            *self._get_link_flags(language),
         ]
         
         try:
-            print(f"   Command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.native_dir)
+            self.obj_dir.mkdir(parents=True, exist_ok=True)
             
-            if result.returncode == 0:
-                print(f"hash_algorithms library built: {output_file}")
-                return True
-            else:
-                print(f"Compilation failed:")
-                print(f"   stdout: {result.stdout}")
-                print(f"   stderr: {result.stderr}")
+            for cmd in (compile_cmd, link_cmd):
+                self._log(f"   Command: {' '.join(cmd)}")
+                if not self._run_compiler(cmd, self.native_dir, output_file.name):
+                    self._log(f"Compilation failed: {output_file.name}")
+                    return False
+            
+            if not self._strip_library(output_file):
+                self._log(f"Strip failed: {output_file.name}")
                 return False
+            
+            self._log(f"{name} library built: {output_file}")
+            return True
                 
         except Exception as e:
-            print(f"Compilation error: {e}")
+            self._log(f"Compilation error: {e}")
             return False
     
+    def compile_crypto_core(self, extra_flags: list = None, variant: str = None) -> bool:
+        """Compile crypto_core library, optionally for a specific ISA variant."""
+        return self._compile_library('crypto_core', 'crypto_core.c', 'c', extra_flags, variant,
+                                     hot=True)
+    
+    def compile_hash_algorithms(self, extra_flags: list = None, variant: str = None) -> bool:
+        """Compile hash_algorithms library, optionally for a specific ISA variant."""
+        return self._compile_library('hash_algorithms', 'hash_algorithms.cpp', 'cxx', extra_flags,
+                                     variant, hot=True)
+    
     def test_libraries(self) -> bool:
         """Test compiled libraries."""
         print("Testing compiled libraries...")
@@ -217,7 +517,7 @@ class NativeLibraryBuilder:
             # Try to load the libraries using Python
             sys.path.insert(0, str(self.project_root))
             
-            from fastCrypterer.native.native_loader import get_native_manager
+            from fastcrypter.native.native_loader import get_native_manager
             
             manager = get_native_manager()
             results = manager.load_all()
@@ -271,8 +571,44 @@ class NativeLibraryBuilder:
             print(f"Library testing failed: {e}")
             return False
     
-    def build_all(self) -> bool:
-        """Build all native libraries."""
+    def _compile_all(self, extra_flags: list = None, variants: list = (None,)) -> bool:
+        """Compile every library for each variant concurrently."""
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            futures = []
+            for variant in variants:
+                futures.append(executor.submit(self.compile_crypto_core, extra_flags, variant))
+                futures.append(executor.submit(self.compile_hash_algorithms, extra_flags, variant))
+            return all([future.result() for future in futures])
+    
+    def _build_variants(self, fat: bool) -> list:
+        """Get the variants to build: None (the plain library), then the ISA tiers."""
+        variants = [None]
+        if fat:
+            for variant, flags in self._isa_variants():
+                # Older compilers lack e.g. -march=x86-64-v4; the loader
+                # falls back to the next tier
+                if self._probe_flags(flags):
+                    variants.append(variant)
+                else:
+                    self._log(f"Warning: compiler rejects {' '.join(flags)}, "
+                              f"skipping the {variant} variant")
+        return variants
+    
+    def _remove_variant_libraries(self):
+        """Remove ISA variant libraries left over from an earlier --fat build."""
+        for variant, _ in self._isa_variants():
+            for lib_file in self.platform_dir.glob(f'lib*.{variant}{self.lib_extension}'):
+                lib_file.unlink()
+                self._log(f"Removed stale variant library: {lib_file.name}")
+    
+    def build_all(self, fat: bool = False) -> bool:
+        """
+        Build all native libraries.
+        
+        Args:
+            fat: Also build one library per ISA tier (see _isa_variants)
+                 for distribution to machines other than the build host
+        """
         print("Building fastCrypter Native Libraries")
         print("=" * 50)
         
@@ -284,13 +620,7 @@ class NativeLibraryBuilder:
         self.create_directories()
         
         # Compile libraries
-        success = True
-        
-        if not self.compile_crypto_core():
-            success = False
-        
-        if not self.compile_hash_algorithms():
-            success = False
+        success = self._compile_all(variants=self._build_variants(fat))
         
         if success:
             print("\nAll libraries compiled successfully!")
@@ -307,6 +637,140 @@ class NativeLibraryBuilder:
             print("\nBuild failed!")
             return False
     
+    def _get_pgo_flags(self, phase: str, profile_dir: Path) -> list:
+        """Get profile-guided optimization flags for 'generate' or 'use'."""
+        if phase == 'generate':
+            return [f'-fprofile-generate={profile_dir}']
+        
+        if 'clang' in self.compilers.get('c', ''):
+            # Clang reads a single merged .profdata file
+            return [f'-fprofile-use={profile_dir / "default.profdata"}']
+        return [f'-fprofile-use={profile_dir}', '-fprofile-correction', '-Wno-missing-profile']
+    
+    def _merge_clang_profiles(self, profile_dir: Path) -> bool:
+        """Merge raw clang profiles into default.profdata."""
+        raw_profiles = [str(p) for p in profile_dir.glob('*.profraw')]
+        profdata = shutil.which('llvm-profdata')
+        
+        if not profdata or not raw_profiles:
+            print("llvm-profdata or raw profiles not found")
+            return False
+        
+        result = subprocess.run(
+            [profdata, 'merge', '-output', str(profile_dir / 'default.profdata'), *raw_profiles],
+            capture_output=True, text=True
+        )
+        return result.returncode == 0
+    
+    def run_training_workload(self, rounds: int = 64) -> bool:
+        """
+        Exercise the native libraries to collect a PGO profile.
+        
+        Runs the regular library tests followed by hashing, XOR and
+        entropy over payloads from 64 bytes up to 1 MiB so that both the
+        short-input and block-loop paths are recorded.
+        """
+        if not self.test_libraries():
+            return False
+        
+        from fastcrypter.native.native_loader import get_native_manager
+        
+        manager = get_native_manager()
+        crypto_core = manager.crypto_core
+        hash_algorithms = manager.hash_algorithms
+        key = os.urandom(32)
+        
+        for size in (64, 1024, 64 * 1024, 1024 * 1024):
+            payload = os.urandom(size)
+            count = max(1, rounds * 64 * 1024 // size)
+            for _ in range(count):
+                if hash_algorithms:
+                    hash_algorithms.fast_sha256(payload)
+                    hash_algorithms.fast_hmac_sha256(key, payload)
+                if crypto_core:
+                    crypto_core.fast_xor(payload, key)
+                    crypto_core.calculate_entropy(payload)
+        
+        if hash_algorithms:
+            hash_algorithms.fast_pbkdf2(b'password', key, 1000, 32)
+        
+        return True
+    
+    def _build_pgo_variant(self, variant: Optional[str]) -> bool:
+        """Run the instrument / train / rebuild cycle for one variant."""
+        label = variant or 'plain'
+        profile_dir = self.pgo_dir / label
+        profile_dir.mkdir(parents=True)
+        
+        # Pass 1: instrumented build
+        print(f"\nPGO pass 1 ({label}): instrumented build")
+        if not self._compile_all(self._get_pgo_flags('generate', profile_dir), [variant]):
+            print("\nInstrumented build failed!")
+            return False
+        
+        # Training run, against this variant's libraries only
+        print(f"\nPGO training run ({label})...")
+        env = dict(os.environ, FASTCRYPTER_ISA=variant or 'none')
+        result = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), '--pgo-train'],
+            cwd=self.project_root, env=env
+        )
+        if result.returncode != 0:
+            if variant is None:
+                print("\nPGO training run failed!")
+                return False
+            # e.g. the avx512 variant on a CPU without AVX-512
+            print(f"Warning: PGO training failed for the {variant} variant, "
+                  "building it without a profile")
+            return self._compile_all(variants=[variant])
+        
+        if 'clang' in self.compilers.get('c', '') and not self._merge_clang_profiles(profile_dir):
+            print("\nFailed to merge clang profiles!")
+            return False
+        
+        # Pass 2: optimized build
+        print(f"\nPGO pass 2 ({label}): profile-guided build")
+        if not self._compile_all(self._get_pgo_flags('use', profile_dir), [variant]):
+            print("\nProfile-guided build failed!")
+            return False
+        return True
+    
+    def build_pgo(self, fat: bool = False) -> bool:
+        """
+        Build all native libraries with profile-guided optimization.
+        
+        For the plain library and, with fat, each ISA variant: the
+        libraries are built with instrumentation, a training workload is
+        run against them in a child process (profiles are only written
+        when the process exits), and they are rebuilt using the profile.
+        Without fat, variant libraries from an earlier --fat build are
+        removed, since the loader would pick them over the PGO build.
+        """
+        print("Building fastCrypter Native Libraries (PGO)")
+        print("=" * 50)
+        
+        if not self.check_dependencies():
+            return False
+        
+        self.create_directories()
+        if not fat:
+            self._remove_variant_libraries()
+        
+        if self.pgo_dir.exists():
+            shutil.rmtree(self.pgo_dir)
+        
+        for variant in self._build_variants(fat):
+            if not self._build_pgo_variant(variant):
+                return False
+        
+        if self.test_libraries():
+            print("\nPGO build completed successfully!")
+            print(f"Libraries available in: {self.platform_dir}")
+            return True
+        
+        print("\nLibrary testing failed!")
+        return False
+    
     def clean(self):
         """Clean build artifacts."""
         print("Cleaning build artifacts...")
@@ -361,10 +825,15 @@ def main():
     parser.add_argument('--clean', action='store_true', help='Clean build artifacts')
     parser.add_argument('--install', action='store_true', help='Install libraries system-wide')
     parser.add_argument('--test-only', action='store_true', help='Only test existing libraries')
+    parser.add_argument('--pgo', action='store_true', help='Build with profile-guided optimization')
+    parser.add_argument('--fat', action='store_true', help='Also build per-ISA variants for distribution')
+    parser.add_argument('--no-ccache', action='store_true', help='Do not use ccache even if installed')
+    parser.add_argument('--debug', action='store_true', help='Build with debug info and keep symbols')
+    parser.add_argument('--pgo-train', action='store_true', help=argparse.SUPPRESS)
     
     args = parser.parse_args()
     
-    builder = NativeLibraryBuilder()
+    builder = NativeLibraryBuilder(use_ccache=not args.no_ccache, debug=args.debug)
     
     if args.clean:
         builder.clean()
@@ -376,8 +845,11 @@ def main():
         else:
             return 1
     
+    if args.pgo_train:
+        return 0 if builder.run_training_workload() else 1
+    
     # Build libraries
-    if builder.build_all():
+    if builder.build_pgo(fat=args.fat) if args.pgo else builder.build_all(fat=args.fat):
         if args.install:
             builder.install_system_wide()
         return 0
@@ -15,35 +15,10 @@ __author__ = "Mmdrza"
 __email__ = "pymmdrza@gmail.com"
 __license__ = "MIT"
 
-# Core imports
-from .core.compressor import Compressor, CompressionAlgorithmType, CompressionLevel
-from .core.encryptor import Encryptor, EncryptionAlgorithmType
-from .core.key_manager import KeyManager
-from .core.custom_encoder import CustomEncoder
+import importlib
+from functools import lru_cache
 
-# High-level interfaces
-from .secure_compressor import SecureCompressor
-from .file_encryptor import FileEncryptor
-from .advanced_encryptor import AdvancedEncryptor
-
-# Enhanced components with native acceleration
-try:
-    from .core.enhanced_compressor import EnhancedCompressor
-    ENHANCED_AVAILABLE = True
-except ImportError:
-    ENHANCED_AVAILABLE = False
-
-# Native library support
-try:
-    from .native.native_loader import (
-        get_native_manager, get_crypto_core, get_hash_algorithms, 
-        is_native_available, NativeLibraryManager
-    )
-    NATIVE_SUPPORT = True
-except ImportError:
-    NATIVE_SUPPORT = False
-
-# Exceptions
+# Exceptions are cheap to import and are needed by almost every caller
 from .exceptions import (
     EncrypterError,
     CompressionError,
@@ -53,6 +28,72 @@ from .exceptions import (
     ErrorCodes,
 )
 
+# Everything else is imported on first attribute access (PEP 562), so that
+# ``import fastcrypter`` does not pull in cryptography, the compression
+# libraries or the native ctypes loader.
+_LAZY_IMPORTS = {
+    # Core classes
+    "Compressor": (".core.compressor", "Compressor"),
+    "CompressionAlgorithmType": (".core.compressor", "CompressionAlgorithmType"),
+    "CompressionLevel": (".core.compressor", "CompressionLevel"),
+    "Encryptor": (".core.encryptor", "Encryptor"),
+    "EncryptionAlgorithmType": (".core.encryptor", "EncryptionAlgorithmType"),
+    "KeyManager": (".core.key_manager", "KeyManager"),
+    "CustomEncoder": (".core.custom_encoder", "CustomEncoder"),
+    
+    # High-level interfaces
+    "SecureCompressor": (".secure_compressor", "SecureCompressor"),
+    "FileEncryptor": (".file_encryptor", "FileEncryptor"),
+    "AdvancedEncryptor": (".advanced_encryptor", "AdvancedEncryptor"),
+    
+    # Enhanced components with native acceleration
+    "EnhancedCompressor": (".core.enhanced_compressor", "EnhancedCompressor"),
+    
+    # Native library support
+    "get_native_manager": (".native.native_loader", "get_native_manager"),
+    "get_crypto_core": (".native.native_loader", "get_crypto_core"),
+    "get_hash_algorithms": (".native.native_loader", "get_hash_algorithms"),
+    "is_native_available": (".native.native_loader", "is_native_available"),
+    "NativeLibraryManager": (".native.native_loader", "NativeLibraryManager"),
+}
+
+_ENHANCED_MODULE = ".core.enhanced_compressor"
+_NATIVE_MODULE = ".native.native_loader"
+
+
+@lru_cache(maxsize=None)
+def _module_available(module_name: str) -> bool:
+    """Check whether an optional submodule can be imported."""
+    try:
+        importlib.import_module(module_name, __name__)
+        return True
+    except ImportError:
+        return False
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module_name, attr = _LAZY_IMPORTS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    elif name == "ENHANCED_AVAILABLE":
+        value = _module_available(_ENHANCED_MODULE)
+    elif name == "NATIVE_SUPPORT":
+        value = _module_available(_NATIVE_MODULE)
+    elif name == "PACKAGE_INFO":
+        value = _build_package_info()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS) |
+                  {"ENHANCED_AVAILABLE", "NATIVE_SUPPORT", "PACKAGE_INFO"})
+
+
 __all__ = [
     # Version info
     "__version__",
@@ -87,52 +128,52 @@ __all__ = [
     # Feature flags
     "ENHANCED_AVAILABLE",
     "NATIVE_SUPPORT",
+    
+    # Enhanced components
+    "EnhancedCompressor",
+    
+    # Native library components
+    "get_native_manager",
+    "get_crypto_core", 
+    "get_hash_algorithms",
+    "is_native_available",
+    "NativeLibraryManager",
 ]
 
-# Add enhanced components if available
-if ENHANCED_AVAILABLE:
-    __all__.append('EnhancedCompressor')
 
-# Add native library components if available
-if NATIVE_SUPPORT:
-    __all__.extend([
-        'get_native_manager',
-        'get_crypto_core', 
-        'get_hash_algorithms',
-        'is_native_available',
-        'NativeLibraryManager'
-    ])
-
-# Package metadata
-PACKAGE_INFO = {
-    "name": "fastCrypter",
-    "version": __version__,
-    "description": "Professional compression and encryption library with native C/C++ acceleration",
-    "author": __author__,
-    "email": __email__,
-    "license": __license__,
-    "url": "https://github.com/Pymmdrza/fastCrypter",
-    "keywords": [
-        "encryption", "compression", "security", "cryptography",
-        "aes", "chacha20", "rsa", "zlib", "lzma", "brotli",
-        "native", "performance", "c++", "custom-encoding", "fast"
-    ],
-    "features": {
-        "enhanced_compressor": ENHANCED_AVAILABLE,
-        "native_acceleration": NATIVE_SUPPORT,
-        "custom_encoding": True,
-        "multiple_algorithms": True,
-        "file_encryption": True,
+def _build_package_info() -> dict:
+    """Build the package metadata (checks the optional features)."""
+    return {
+        "name": "fastCrypter",
+        "version": __version__,
+        "description": "Professional compression and encryption library with native C/C++ acceleration",
+        "author": __author__,
+        "email": __email__,
+        "license": __license__,
+        "url": "https://github.com/Pymmdrza/fastCrypter",
+        "keywords": [
+            "encryption", "compression", "security", "cryptography",
+            "aes", "chacha20", "rsa", "zlib", "lzma", "brotli",
+            "native", "performance", "c++", "custom-encoding", "fast"
+        ],
+        "features": {
+            "enhanced_compressor": _module_available(_ENHANCED_MODULE),
+            "native_acceleration": _module_available(_NATIVE_MODULE),
+            "custom_encoding": True,
+            "multiple_algorithms": True,
+            "file_encryption": True,
+        }
     }
-}
 
 
 def get_version_info():
     """Get comprehensive version and feature information."""
+    from . import PACKAGE_INFO, NATIVE_SUPPORT
     info = PACKAGE_INFO.copy()
     
     if NATIVE_SUPPORT:
         try:
+            from .native.native_loader import get_native_manager
             manager = get_native_manager()
             native_info = manager.get_info()
             info['native_libraries'] = native_info
@@ -157,8 +198,12 @@ def get_recommended_compressor(password: str, **kwargs):
     Returns:
         Compressor instance (EnhancedCompressor or SecureCompressor).
     """
+    from . import ENHANCED_AVAILABLE, NATIVE_SUPPORT, SecureCompressor
+    
     if ENHANCED_AVAILABLE and NATIVE_SUPPORT:
         try:
+            from .core.enhanced_compressor import EnhancedCompressor
+            from .native.native_loader import is_native_available
             if is_native_available():
                 return EnhancedCompressor(password=password, **kwargs)
         except:
@@ -180,6 +225,7 @@ def benchmark_available_features(data_size: int = 1024) -> dict:
     """
     import time
     import secrets
+    from . import ENHANCED_AVAILABLE, NATIVE_SUPPORT, SecureCompressor
     
     results = {
         'data_size': data_size,
@@ -211,6 +257,7 @@ def benchmark_available_features(data_size: int = 1024) -> dict:
     # Test enhanced compressor if available
     if ENHANCED_AVAILABLE:
         try:
+            from .core.enhanced_compressor import EnhancedCompressor
             enhanced = EnhancedCompressor(password=password)
             
             start_time = time.time()
@@ -239,6 +286,7 @@ def benchmark_available_features(data_size: int = 1024) -> dict:
     # Test native libraries if available
     if NATIVE_SUPPORT:
         try:
+            from .native.native_loader import get_native_manager
             manager = get_native_manager()
             native_info = manager.get_info()
             
@@ -259,6 +307,13 @@ def benchmark_available_features(data_size: int = 1024) -> dict:
 # Package initialization message
 def _show_startup_info():
     """Show package startup information."""
+    # Only show in debug mode or if explicitly requested; checking the
+    # features would defeat the lazy imports
+    import os
+    if os.environ.get('fastCrypter_SHOW_INFO', '').lower() not in ('1', 'true', 'yes'):
+        return
+    
+    from . import ENHANCED_AVAILABLE, NATIVE_SUPPORT
     features = []
     
     if ENHANCED_AVAILABLE:
@@ -266,6 +321,7 @@ def _show_startup_info():
     
     if NATIVE_SUPPORT:
         try:
+            from .native.native_loader import is_native_available
             if is_native_available():
                 features.append("Native Acceleration")
             else:
@@ -276,10 +332,7 @@ def _show_startup_info():
     if not features:
         features.append("Standard Features")
     
-    # Only show in debug mode or if explicitly requested
-    import os
-    if os.environ.get('fastCrypter_SHOW_INFO', '').lower() in ('1', 'true', 'yes'):
-        print(f"🚀 fastCrypter v{__version__} loaded with: {', '.join(features)}")
+    print(f"🚀 fastCrypter v{__version__} loaded with: {', '.join(features)}")
 
 # Show startup info if requested
 _show_startup_info() 
\ No newline at end of file
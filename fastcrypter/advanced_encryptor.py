@@ -9,7 +9,7 @@ from typing import Union, Optional, Dict, Any, List
 from .core.compressor import Compressor, CompressionAlgorithmType
 from .core.encryptor import Encryptor, EncryptionAlgorithmType
 from .core.key_manager import KeyManager
-from .algorithms import CompressionAlgorithm, EncryptionAlgorithm
+from .algorithms.base import CompressionAlgorithm, EncryptionAlgorithm
 from .exceptions import EncrypterError, ValidationError, ErrorCodes
 
 
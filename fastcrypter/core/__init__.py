@@ -5,10 +5,34 @@ This package contains the fundamental components for compression,
 encryption, and key management.
 """
 
-from .compressor import Compressor, CompressionAlgorithmType, CompressionLevel
-from .encryptor import Encryptor, EncryptionAlgorithmType
-from .key_manager import KeyManager
-from .custom_encoder import CustomEncoder
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# importing one core module does not import all of them.
+_LAZY_IMPORTS = {
+    "Compressor": (".compressor", "Compressor"),
+    "CompressionAlgorithmType": (".compressor", "CompressionAlgorithmType"),
+    "CompressionLevel": (".compressor", "CompressionLevel"),
+    "Encryptor": (".encryptor", "Encryptor"),
+    "EncryptionAlgorithmType": (".encryptor", "EncryptionAlgorithmType"),
+    "KeyManager": (".key_manager", "KeyManager"),
+    "CustomEncoder": (".custom_encoder", "CustomEncoder"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module_name, attr = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "Compressor",
@@ -18,4 +42,4 @@ __all__ = [
     "EncryptionAlgorithmType",
     "KeyManager",
     "CustomEncoder",
-] 
\ No newline at end of file
+]
@@ -0,0 +1,73 @@
+# cython: language_level=3
+"""
+Cython XOR and entropy loops.
+
+Fallback for fast_crypto when the C extension is not built: the loops
+run without the GIL, and XOR over large buffers is split across
+OpenMP threads.
+"""
+
+from cython.parallel cimport prange
+from libc.math cimport log2
+from libc.string cimport memset
+
+cdef enum:
+    # Below this many bytes threads cost more than they save
+    PARALLEL_MIN = 1 << 16
+
+
+cpdef void xor_inplace(unsigned char[::1] data, const unsigned char[::1] key) noexcept nogil:
+    """XOR data in place with a repeating key."""
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t key_len = key.shape[0]
+    cdef Py_ssize_t i
+
+    if key_len == 0:
+        return
+    if n >= PARALLEL_MIN:
+        for i in prange(n, schedule='static'):
+            data[i] ^= key[i % key_len]
+    else:
+        for i in range(n):
+            data[i] ^= key[i % key_len]
+
+
+def xor_bytes(const unsigned char[::1] data, const unsigned char[::1] key):
+    """XOR data with a repeating key, returning new bytes."""
+    if key.shape[0] == 0:
+        raise ValueError("Key must not be empty")
+
+    result = bytearray(data)
+    xor_inplace(result, key)
+    return bytes(result)
+
+
+def shannon_entropy(const unsigned char[::1] data):
+    """Shannon entropy of data in bits per byte."""
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t i
+    cdef size_t counts[4][256]
+    cdef size_t count
+    cdef double p, entropy = 0.0
+
+    if n == 0:
+        return 0.0
+
+    with nogil:
+        # Four interleaved histograms avoid stalls on repeated bytes
+        memset(counts, 0, sizeof(counts))
+        for i in range(0, n - 3, 4):
+            counts[0][data[i]] += 1
+            counts[1][data[i + 1]] += 1
+            counts[2][data[i + 2]] += 1
+            counts[3][data[i + 3]] += 1
+        for i in range(n - n % 4, n):
+            counts[0][data[i]] += 1
+
+        for i in range(256):
+            count = counts[0][i] + counts[1][i] + counts[2][i] + counts[3][i]
+            if count:
+                p = <double>count / n
+                entropy -= p * log2(p)
+
+    return entropy
@@ -0,0 +1,50 @@
+#ifndef FASTCRYPTER_COMMON_H
+#define FASTCRYPTER_COMMON_H
+
+// Helpers shared by the setup_extensions.py modules, built once as the
+// fastcrypter_common static library and linked into each extension
+
+#include <stddef.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+// No-alias qualifier for the byte pointers of the hot loops, spelled the
+// way GCC, Clang and MSVC all accept in both C and C++
+#define FASTCRYPTER_RESTRICT __restrict
+
+// Alignment for stack buffers the hot loops read with vector loads
+#if defined(_MSC_VER)
+    #define FASTCRYPTER_ALIGN(n) __declspec(align(n))
+#else
+    #define FASTCRYPTER_ALIGN(n) __attribute__((aligned(n)))
+#endif
+
+#define CPU_AESNI (1 << 0)
+#define CPU_CLMUL (1 << 1)
+#define CPU_SHANI (1 << 2)
+
+// Instruction sets of the _fast_crypto_<tier> modules; set whenever the
+// CPU (and, for AVX, the OS) supports them
+#define CPU_PCLMULQDQ (1 << 3)
+#define CPU_BMI2 (1 << 4)
+#define CPU_AVX2 (1 << 5)
+#define CPU_AVX512F (1 << 6)
+#define CPU_AVX512BW (1 << 7)
+#define CPU_VPCLMULQDQ (1 << 8)
+#define CPU_ARMCRYPTO (1 << 9)  // AES + PMULL + SHA2
+
+// Hardware crypto instructions (CPU_AESNI/CLMUL/SHANI) that are both
+// compiled in (HAVE_AESNI / HAVE_CLMUL / HAVE_SHANI) and supported by this
+// CPU, plus the instruction set bits above
+int fastcrypter_cpu_features(void);
+
+// Zero a buffer without the compiler eliding the stores
+void fastcrypter_secure_zero(void* data, size_t len);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
@@ -0,0 +1,106 @@
+#include "common.h"
+
+// Hardware crypto paths are compiled in when setup_extensions.py finds the
+// intrinsics (HAVE_AESNI / HAVE_CLMUL / HAVE_SHANI) and only used when
+// CPUID reports the instructions, so the same binary runs on older CPUs.
+// The vector ISA bits (CPU_AVX2, ...) need no compiler support; they tell
+// fast_crypto.py which _fast_crypto_<tier> module this CPU can run.
+#if defined(_MSC_VER) && (defined(_M_X64) || defined(_M_IX86))
+    #include <intrin.h>
+    #define HAVE_CPUID_GATE 1
+
+    // <cpuid.h>-style wrappers over the MSVC intrinsics
+    static int get_cpuid_count(unsigned int leaf, unsigned int subleaf, unsigned int* eax,
+                               unsigned int* ebx, unsigned int* ecx, unsigned int* edx) {
+        int info[4];
+        __cpuid(info, 0);
+        if ((unsigned int)info[0] < leaf) return 0;
+        __cpuidex(info, (int)leaf, (int)subleaf);
+        *eax = info[0]; *ebx = info[1]; *ecx = info[2]; *edx = info[3];
+        return 1;
+    }
+    #define __get_cpuid(leaf, a, b, c, d) get_cpuid_count(leaf, 0, a, b, c, d)
+    #define __get_cpuid_count get_cpuid_count
+
+    static unsigned long long read_xcr0(void) {
+        return _xgetbv(0);
+    }
+#elif defined(__x86_64__) || defined(__i386__)
+    #include <cpuid.h>
+    #define HAVE_CPUID_GATE 1
+
+    static unsigned long long read_xcr0(void) {
+        unsigned int lo, hi;
+        __asm__ volatile("xgetbv" : "=a"(lo), "=d"(hi) : "c"(0));
+        return ((unsigned long long)hi << 32) | lo;
+    }
+#elif defined(__aarch64__) && defined(__linux__)
+    #include <sys/auxv.h>
+    #define HAVE_HWCAP_GATE 1
+#elif defined(__aarch64__) && defined(__APPLE__)
+    #include <sys/sysctl.h>
+    #define HAVE_SYSCTL_GATE 1
+
+    static int sysctl_flag(const char* name) {
+        int value = 0;
+        size_t size = sizeof(value);
+        return sysctlbyname(name, &value, &size, NULL, 0) == 0 && value;
+    }
+#endif
+
+static int detect_cpu_features(void) {
+    int features = 0;
+#ifdef HAVE_CPUID_GATE
+    unsigned int eax, ebx, ecx, edx;
+    unsigned long long xcr0 = 0;
+
+    // AES: CPUID.1:ECX[25], PCLMULQDQ: CPUID.1:ECX[1]
+    if (__get_cpuid(1, &eax, &ebx, &ecx, &edx)) {
+#ifdef HAVE_AESNI
+        if (ecx & (1u << 25)) features |= CPU_AESNI;
+#endif
+#ifdef HAVE_CLMUL
+        if (ecx & (1u << 1)) features |= CPU_CLMUL;
+#endif
+        if (ecx & (1u << 1)) features |= CPU_PCLMULQDQ;
+        // OSXSAVE: CPUID.1:ECX[27]; XCR0 says which register state the OS saves
+        if (ecx & (1u << 27)) xcr0 = read_xcr0();
+    }
+    if (__get_cpuid_count(7, 0, &eax, &ebx, &ecx, &edx)) {
+#ifdef HAVE_SHANI
+        // SHA: CPUID.(7,0):EBX[29]
+        if (ebx & (1u << 29)) features |= CPU_SHANI;
+#endif
+        // BMI2: EBX[8]; AVX2: EBX[5] with XMM/YMM state;
+        // AVX512F: EBX[16], AVX512BW: EBX[30], VPCLMULQDQ: ECX[10]
+        // with opmask/ZMM state as well
+        if (ebx & (1u << 8)) features |= CPU_BMI2;
+        if ((xcr0 & 0x06) == 0x06 && (ebx & (1u << 5))) features |= CPU_AVX2;
+        if ((xcr0 & 0xE6) == 0xE6) {
+            if (ebx & (1u << 16)) features |= CPU_AVX512F;
+            if (ebx & (1u << 30)) features |= CPU_AVX512BW;
+            if (ecx & (1u << 10)) features |= CPU_VPCLMULQDQ;
+        }
+    }
+#elif defined(HAVE_HWCAP_GATE) && defined(HWCAP_AES) && defined(HWCAP_PMULL) && defined(HWCAP_SHA2)
+    unsigned long hwcap = getauxval(AT_HWCAP);
+    if ((hwcap & (HWCAP_AES | HWCAP_PMULL | HWCAP_SHA2)) == (HWCAP_AES | HWCAP_PMULL | HWCAP_SHA2)) {
+        features |= CPU_ARMCRYPTO;
+    }
+#elif defined(HAVE_SYSCTL_GATE)
+    if (sysctl_flag("hw.optional.arm.FEAT_AES") && sysctl_flag("hw.optional.arm.FEAT_PMULL") &&
+        sysctl_flag("hw.optional.arm.FEAT_SHA256")) {
+        features |= CPU_ARMCRYPTO;
+    }
+#endif
+    return features;
+}
+
+int fastcrypter_cpu_features(void) {
+    // Racing first calls compute the same value, so no locking is needed
+    static int cached = -1;
+    if (cached < 0) {
+        cached = detect_cpu_features();
+    }
+    return cached;
+}
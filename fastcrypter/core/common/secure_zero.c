@@ -0,0 +1,16 @@
+#include <string.h>
+
+#include "common.h"
+
+void fastcrypter_secure_zero(void* data, size_t len) {
+    memset(data, 0, len);
+#if defined(__GNUC__) || defined(__clang__)
+    // The buffer "escapes" here, so the memset cannot be removed
+    __asm__ __volatile__("" : : "r"(data) : "memory");
+#else
+    volatile unsigned char* bytes = (volatile unsigned char*)data;
+    for (size_t i = 0; i < len; i++) {
+        bytes[i] = 0;
+    }
+#endif
+}
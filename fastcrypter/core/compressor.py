@@ -7,13 +7,82 @@ with support for multiple compression algorithms and optimization levels.
 
 import zlib
 import lzma
-import brotli
 import io
-from typing import Union, Dict, Any, Optional, Tuple
+from typing import Union, Dict, Any, Optional, Tuple, Callable
 from enum import Enum
 
 from ..exceptions import CompressionError, ValidationError, ErrorCodes
-from ..algorithms import CompressionAlgorithm
+from ..algorithms.base import CompressionAlgorithm
+
+# Brotli is optional (the `compression` extra)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# The fast codec's C++ implementation is optional; its data can still be
+# decoded without it
+try:
+    from . import fast_compression
+except ImportError:
+    fast_compression = None
+
+
+def _require_brotli():
+    """Get the brotli module, or raise if it is not installed."""
+    if brotli is None:
+        raise CompressionError(
+            "Brotli compression requires the 'brotli' package "
+            "(pip install fastcrypter[compression])",
+            ErrorCodes.UNSUPPORTED_COMPRESSION
+        )
+    return brotli
+
+
+def _require_fast_compression():
+    """Get the fast_compression extension, or raise if it is not built."""
+    if fast_compression is None:
+        raise CompressionError(
+            "Fast compression requires the fast_compression extension "
+            "(python setup_extensions.py build_ext --inplace)",
+            ErrorCodes.UNSUPPORTED_COMPRESSION
+        )
+    return fast_compression
+
+
+def _fast_decompress_py(data: bytes) -> bytes:
+    """
+    Decode the fast codec's format without the extension.
+    
+    Bytes other than 0xFF are literals; ``FF len dist`` copies ``len`` bytes
+    from ``dist`` bytes back (the source may overlap the output) and
+    ``FF 00 00`` is a literal 0xFF.
+    """
+    output = bytearray()
+    position = 0
+    
+    while position < len(data):
+        marker = data.find(b'\xff', position)
+        if marker < 0:
+            output += data[position:]
+            break
+        output += data[position:marker]
+        
+        if marker + 2 >= len(data):
+            raise ValueError("Truncated match token")
+        length, distance = data[marker + 1], data[marker + 2]
+        position = marker + 3
+        
+        if length == 0:
+            output.append(0xFF)
+            continue
+        if distance == 0 or distance > len(output):
+            raise ValueError("Invalid match distance")
+        
+        source = output[-distance:]
+        output += (source * (length // distance + 1))[:length]
+    
+    return bytes(output)
 
 
 class CompressionLevel(Enum):
@@ -29,6 +98,25 @@ class CompressionAlgorithmType(Enum):
     ZLIB = "zlib"
     LZMA = "lzma"
     BROTLI = "brotli"
+    FAST = "fast"
+
+
+class _StreamCodec:
+    """
+    Uniform wrapper over the incremental zlib/lzma/brotli objects.
+    
+    ``process(data)`` feeds the next chunk and returns any output produced,
+    ``finish()`` returns the remaining buffered output.
+    """
+    
+    def __init__(self, process: Callable[[bytes], bytes],
+                 finish: Optional[Callable[[], bytes]] = None):
+        self.process = process
+        self._finish = finish
+    
+    def finish(self) -> bytes:
+        """Flush and return any remaining output."""
+        return self._finish() if self._finish else b''
 
 
 class Compressor:
@@ -39,6 +127,14 @@ class Compressor:
     levels and automatic algorithm selection based on data characteristics.
     """
     
+    # Algorithm IDs used in headers (0 = stored without compression)
+    ALGORITHM_IDS = {
+        CompressionAlgorithmType.ZLIB: 1,
+        CompressionAlgorithmType.LZMA: 2,
+        CompressionAlgorithmType.BROTLI: 3,
+        CompressionAlgorithmType.FAST: 4,
+    }
+    
     # Algorithm-specific settings
     ALGORITHM_SETTINGS = {
         CompressionAlgorithmType.ZLIB: {
@@ -59,6 +155,12 @@ class Compressor:
             'default_level': 6,
             'chunk_size': 64 * 1024,  # 64KB
         },
+        CompressionAlgorithmType.FAST: {
+            'min_level': 1,
+            'max_level': 9,
+            'default_level': 6,  # Ignored, the fast codec has no levels
+            'chunk_size': 64 * 1024,  # 64KB
+        },
     }
     
     def __init__(self, 
@@ -151,6 +253,8 @@ class Compressor:
                 compressed = self._compress_lzma(data)
             elif algorithm == CompressionAlgorithmType.BROTLI:
                 compressed = self._compress_brotli(data)
+            elif algorithm == CompressionAlgorithmType.FAST:
+                compressed = self._compress_fast(data)
             else:
                 raise CompressionError(
                     f"Unsupported algorithm: {algorithm}",
@@ -177,6 +281,39 @@ class Compressor:
                 details={"algorithm": algorithm.value if algorithm else None, "error": str(e)}
             )
     
+    def store(self, data: Union[str, bytes]) -> bytes:
+        """
+        Wrap data in a header without compressing it.
+        
+        The result uses the same "stored" header that compress() falls back
+        to for incompressible data, so decompress() handles it as usual.
+        
+        Args:
+            data: Data to store (string or bytes).
+            
+        Returns:
+            bytes: Uncompressed data with metadata header.
+            
+        Raises:
+            ValidationError: If input data is invalid.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        if not isinstance(data, bytes):
+            raise ValidationError(
+                "Input data must be string or bytes",
+                ErrorCodes.INVALID_INPUT_FORMAT
+            )
+        
+        if len(data) == 0:
+            raise ValidationError(
+                "Cannot compress empty data",
+                ErrorCodes.INVALID_INPUT_SIZE
+            )
+        
+        return self._create_header(None, len(data)) + data
+    
     def decompress(self, data: bytes) -> bytes:
         """
         Decompress data.
@@ -219,6 +356,8 @@ class Compressor:
                 result = self._decompress_lzma(compressed_data)
             elif algorithm == CompressionAlgorithmType.BROTLI:
                 result = self._decompress_brotli(compressed_data)
+            elif algorithm == CompressionAlgorithmType.FAST:
+                result = self._decompress_fast(compressed_data)
             else:
                 raise CompressionError(
                     f"Unsupported algorithm in header: {algorithm}",
@@ -265,11 +404,73 @@ class Compressor:
     
     def _compress_brotli(self, data: bytes) -> bytes:
         """Compress data using Brotli."""
-        return brotli.compress(data, quality=self.level)
+        return _require_brotli().compress(data, quality=self.level)
     
     def _decompress_brotli(self, data: bytes) -> bytes:
         """Decompress Brotli data."""
-        return brotli.decompress(data)
+        return _require_brotli().decompress(data)
+    
+    def _compress_fast(self, data: bytes) -> bytes:
+        """Compress data using the fast_compression extension."""
+        return _require_fast_compression().fast_compress(data)
+    
+    def _decompress_fast(self, data: bytes) -> bytes:
+        """Decompress fast codec data, in pure Python without the extension."""
+        if fast_compression is None:
+            return _fast_decompress_py(data)
+        return fast_compression.fast_decompress(data)
+    
+    def compressobj(self) -> _StreamCodec:
+        """
+        Create an incremental compressor for the configured algorithm.
+        
+        The stream has no metadata header and auto_select is not applied;
+        callers are responsible for recording the algorithm.
+        
+        Returns:
+            _StreamCodec: Object with process(data) and finish() methods.
+        """
+        if self.algorithm == CompressionAlgorithmType.ZLIB:
+            compressor = zlib.compressobj(self.level)
+            return _StreamCodec(compressor.compress, compressor.flush)
+        elif self.algorithm == CompressionAlgorithmType.LZMA:
+            compressor = lzma.LZMACompressor(format=lzma.FORMAT_ALONE, preset=self.level)
+            return _StreamCodec(compressor.compress, compressor.flush)
+        elif self.algorithm == CompressionAlgorithmType.BROTLI:
+            compressor = _require_brotli().Compressor(quality=self.level)
+            return _StreamCodec(compressor.process, compressor.finish)
+        
+        raise CompressionError(
+            f"Unsupported algorithm: {self.algorithm}",
+            ErrorCodes.UNSUPPORTED_COMPRESSION
+        )
+    
+    def decompressobj(self, algorithm: Optional[CompressionAlgorithmType] = None) -> _StreamCodec:
+        """
+        Create an incremental decompressor.
+        
+        Args:
+            algorithm: Algorithm of the stream (defaults to the configured one).
+            
+        Returns:
+            _StreamCodec: Object with process(data) and finish() methods.
+        """
+        algorithm = algorithm or self.algorithm
+        
+        if algorithm == CompressionAlgorithmType.ZLIB:
+            decompressor = zlib.decompressobj()
+            return _StreamCodec(decompressor.decompress, decompressor.flush)
+        elif algorithm == CompressionAlgorithmType.LZMA:
+            decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_ALONE)
+            return _StreamCodec(decompressor.decompress)
+        elif algorithm == CompressionAlgorithmType.BROTLI:
+            decompressor = _require_brotli().Decompressor()
+            return _StreamCodec(decompressor.process)
+        
+        raise CompressionError(
+            f"Unsupported algorithm: {algorithm}",
+            ErrorCodes.UNSUPPORTED_COMPRESSION
+        )
     
     def _select_best_algorithm(self, data: bytes) -> CompressionAlgorithmType:
         """
@@ -297,6 +498,8 @@ class Compressor:
             return CompressionAlgorithmType.LZMA
         
         # Medium entropy - use balanced approach
+        if brotli is None:
+            return CompressionAlgorithmType.ZLIB
         return CompressionAlgorithmType.BROTLI
     
     def _calculate_entropy(self, data: bytes) -> float:
@@ -325,7 +528,7 @@ class Compressor:
         Create metadata header for compressed data.
         
         Header format (8 bytes):
-        - 1 byte: Algorithm ID (0=none, 1=zlib, 2=lzma, 3=brotli)
+        - 1 byte: Algorithm ID (0=none, 1=zlib, 2=lzma, 3=brotli, 4=fast)
         - 1 byte: Compression level
         - 2 bytes: Reserved
         - 4 bytes: Original size (little-endian)
@@ -333,12 +536,7 @@ class Compressor:
         if algorithm is None:
             algo_id = 0
         else:
-            algo_map = {
-                CompressionAlgorithmType.ZLIB: 1,
-                CompressionAlgorithmType.LZMA: 2,
-                CompressionAlgorithmType.BROTLI: 3,
-            }
-            algo_id = algo_map[algorithm]
+            algo_id = self.ALGORITHM_IDS[algorithm]
         
         header = bytearray(8)
         header[0] = algo_id
@@ -348,6 +546,14 @@ class Compressor:
         
         return bytes(header)
     
+    @classmethod
+    def algorithm_from_id(cls, algo_id: int) -> Optional[CompressionAlgorithmType]:
+        """Get the algorithm for a header ID, or None if the ID is unknown."""
+        for algorithm, known_id in cls.ALGORITHM_IDS.items():
+            if known_id == algo_id:
+                return algorithm
+        return None
+    
     def _parse_header(self, data: bytes) -> Tuple[Optional[CompressionAlgorithmType], int]:
         """
         Parse metadata header from compressed data.
@@ -361,12 +567,7 @@ class Compressor:
         if algo_id == 0:
             algorithm = None
         else:
-            algo_map = {
-                1: CompressionAlgorithmType.ZLIB,
-                2: CompressionAlgorithmType.LZMA,
-                3: CompressionAlgorithmType.BROTLI,
-            }
-            algorithm = algo_map.get(algo_id)
+            algorithm = self.algorithm_from_id(algo_id)
             if algorithm is None:
                 raise CompressionError(
                     f"Unknown algorithm ID in header: {algo_id}",
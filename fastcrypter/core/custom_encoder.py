@@ -54,6 +54,9 @@ class CustomEncoder:
         # Create lookup tables for fast encoding/decoding
         self.char_to_value = {char: i for i, char in enumerate(self.charset)}
         self.value_to_char = {i: char for i, char in enumerate(self.charset)}
+        
+        # Digits for length prefixes that must not contain the separator
+        self._length_charset = ''.join(char for char in self.charset if char != self.padding_char)
     
     def encode(self, data: Union[bytes, bytearray]) -> str:
         """
@@ -77,11 +80,15 @@ class CustomEncoder:
         if len(data) == 0:
             return ""
         
+        # Add length prefix to handle leading zeros
+        length_prefix = self._encode_length(len(data))
+        
         # Convert bytes to big integer
         number = int.from_bytes(data, byteorder='big')
         
         if number == 0:
-            return self.charset[0]
+            # All zero bytes: the length alone restores them
+            return length_prefix
         
         # Convert to custom base
         result = []
@@ -92,9 +99,6 @@ class CustomEncoder:
         # Reverse to get correct order
         encoded = ''.join(reversed(result))
         
-        # Add length prefix to handle leading zeros
-        length_prefix = self._encode_length(len(data))
-        
         return length_prefix + encoded
     
     def decode(self, encoded: str) -> bytes:
@@ -153,36 +157,65 @@ class CustomEncoder:
         
         return result
     
+    @staticmethod
+    def _to_digits(number: int, digits: str) -> str:
+        """Write a positive number in base len(digits)."""
+        base = len(digits)
+        result = []
+        while number > 0:
+            result.append(digits[number % base])
+            number //= base
+        return ''.join(reversed(result))
+    
     def _encode_length(self, length: int) -> str:
-        """Encode length as prefix using custom charset."""
+        """
+        Encode length as prefix using custom charset.
+        
+        The prefix is the length in the charset's base followed by the
+        padding character as separator. The padding character is usually
+        a digit too (the last one), so lengths whose digits include it
+        would be cut short at the first one; those are written as
+        separator, length in the remaining characters, separator instead.
+        A plain prefix is never empty, so the two forms cannot be confused.
+        """
         if length == 0:
             return self.charset[0] + self.padding_char
         
-        result = []
-        while length > 0:
-            result.append(self.value_to_char[length % self.base])
-            length //= self.base
+        prefix = self._to_digits(length, self.charset)
+        if self.padding_char not in prefix:
+            return prefix + self.padding_char
         
-        # Add separator
-        return ''.join(reversed(result)) + self.padding_char
+        if len(self._length_charset) == 1:
+            # Two-character charset: the one other character counts in unary
+            prefix = self._length_charset * length
+        else:
+            prefix = self._to_digits(length, self._length_charset)
+        return self.padding_char + prefix + self.padding_char
     
     def _decode_length(self, encoded: str) -> Tuple[int, int]:
         """Decode length prefix and return (length, data_start_index)."""
-        separator_pos = encoded.find(self.padding_char)
+        escaped = encoded.startswith(self.padding_char)
+        start = 1 if escaped else 0
+        separator_pos = encoded.find(self.padding_char, start)
         if separator_pos == -1:
             raise ValidationError(
                 "Invalid encoded format: missing length separator",
                 ErrorCodes.INVALID_INPUT_FORMAT
             )
         
-        length_part = encoded[:separator_pos]
+        length_part = encoded[start:separator_pos]
         if len(length_part) == 0:
             return 0, separator_pos + 1
         
         # Decode length
+        if escaped and len(self._length_charset) == 1:
+            return len(length_part), separator_pos + 1
+        
+        digits = self._length_charset if escaped else self.charset
+        base = len(digits)
         length = 0
         for char in length_part:
-            length = length * self.base + self.char_to_value[char]
+            length = length * base + digits.index(char)
         
         return length, separator_pos + 1
     
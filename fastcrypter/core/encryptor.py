@@ -18,7 +18,7 @@ from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.backends import default_backend
 
 from ..exceptions import EncryptionError, ValidationError, SecurityError, ErrorCodes
-from ..algorithms import EncryptionAlgorithm
+from ..algorithms.base import EncryptionAlgorithm
 
 
 class EncryptionAlgorithmType(Enum):
@@ -203,6 +203,90 @@ class Encryptor:
             EncryptionError: If encryption fails.
             ValidationError: If input data is invalid.
         """
+        return self._encrypt(data, key)
+    
+    def encrypt_with_key(self, data: Union[str, bytes], key: bytes, salt: bytes = b'') -> bytes:
+        """
+        Encrypt data with an already derived key.
+        
+        Use with derive_message_key() to encrypt many messages with a single
+        key derivation. The salt is only recorded in the header so that
+        decrypt() can re-derive the key from the password.
+        
+        Args:
+            data: Data to encrypt (string or bytes).
+            key: Derived key bytes (see derive_message_key).
+            salt: Salt the key was derived with.
+            
+        Returns:
+            bytes: Encrypted data with metadata header.
+            
+        Raises:
+            EncryptionError: If encryption fails.
+            ValidationError: If input data or key is invalid.
+        """
+        if not isinstance(key, bytes) or len(key) < self._message_key_size():
+            raise ValidationError(
+                f"Key must be at least {self._message_key_size()} bytes",
+                ErrorCodes.INVALID_KEY_FORMAT
+            )
+        
+        if self.algorithm == EncryptionAlgorithmType.RSA_4096:
+            raise ValidationError(
+                "Pre-derived keys are not supported for RSA",
+                ErrorCodes.UNSUPPORTED_ENCRYPTION
+            )
+        
+        return self._encrypt(data, key, salt)
+    
+    def decrypt_with_key(self, data: bytes, key: bytes) -> bytes:
+        """
+        Decrypt data with an already derived key.
+        
+        Args:
+            data: Encrypted data with metadata header.
+            key: Key derived with derive_message_key() for the message salt.
+            
+        Returns:
+            bytes: Decrypted data.
+        """
+        if not isinstance(key, bytes):
+            raise ValidationError(
+                "Key must be bytes",
+                ErrorCodes.INVALID_KEY_FORMAT
+            )
+        
+        return self.decrypt(data, key)
+    
+    def derive_message_key(self, password: Union[str, bytes], salt: bytes) -> bytes:
+        """
+        Derive the key used for messages encrypted with the given salt.
+        
+        Args:
+            password: Password used with encrypt()/decrypt().
+            salt: Message salt (see get_message_salt).
+            
+        Returns:
+            bytes: Key for encrypt_with_key()/decrypt_with_key().
+        """
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+        return self._derive_key(password, salt, self._message_key_size())
+    
+    def get_message_salt(self, data: bytes) -> bytes:
+        """Get the key derivation salt stored in an encrypted message."""
+        header_size, salt_size, _, _ = self._parse_header(data)
+        return data[header_size:header_size + salt_size]
+    
+    def _message_key_size(self) -> int:
+        """Get the derived key size (AES-CBC also needs an HMAC key)."""
+        if self.algorithm == EncryptionAlgorithmType.AES_256_CBC:
+            return 64
+        return 32
+    
+    def _encrypt(self, data: Union[str, bytes], key: Union[str, bytes],
+                 salt: Optional[bytes] = None) -> bytes:
+        """Validate input and encrypt with the configured algorithm."""
         # Convert string to bytes if necessary
         if isinstance(data, str):
             data = data.encode('utf-8')
@@ -221,11 +305,11 @@ class Encryptor:
         
         try:
             if self.algorithm == EncryptionAlgorithmType.AES_256_GCM:
-                return self._encrypt_aes_gcm(data, key)
+                return self._encrypt_aes_gcm(data, key, salt)
             elif self.algorithm == EncryptionAlgorithmType.AES_256_CBC:
-                return self._encrypt_aes_cbc(data, key)
+                return self._encrypt_aes_cbc(data, key, salt)
             elif self.algorithm == EncryptionAlgorithmType.CHACHA20_POLY1305:
-                return self._encrypt_chacha20(data, key)
+                return self._encrypt_chacha20(data, key, salt)
             elif self.algorithm == EncryptionAlgorithmType.RSA_4096:
                 return self._encrypt_rsa(data)
             else:
@@ -297,14 +381,15 @@ class Encryptor:
                 details={"error": str(e)}
             )
     
-    def _encrypt_aes_gcm(self, data: bytes, key: Union[str, bytes]) -> bytes:
+    def _encrypt_aes_gcm(self, data: bytes, key: Union[str, bytes],
+                         salt: Optional[bytes] = None) -> bytes:
         """Encrypt data using AES-256-GCM."""
         # Derive or prepare key
         if isinstance(key, str):
             salt = secrets.token_bytes(16)
             derived_key = self._derive_key(key.encode('utf-8'), salt, 32)
         else:
-            salt = b''
+            salt = salt or b''
             derived_key = key[:32]  # Ensure 256-bit key
         
         # Generate IV
@@ -339,7 +424,8 @@ class Encryptor:
         offset += iv_size
         tag = data[offset:offset + tag_size]
         offset += tag_size
-        ciphertext = data[offset:]
+        # View, not a copy: the ciphertext can be large
+        ciphertext = memoryview(data)[offset:]
         
         # Derive or prepare key
         if isinstance(key, str) and salt:
@@ -358,14 +444,15 @@ class Encryptor:
         # Decrypt data
         return decryptor.update(ciphertext) + decryptor.finalize()
     
-    def _encrypt_aes_cbc(self, data: bytes, key: Union[str, bytes]) -> bytes:
+    def _encrypt_aes_cbc(self, data: bytes, key: Union[str, bytes],
+                         salt: Optional[bytes] = None) -> bytes:
         """Encrypt data using AES-256-CBC with HMAC."""
         # Derive or prepare key
         if isinstance(key, str):
             salt = secrets.token_bytes(16)
             derived_key = self._derive_key(key.encode('utf-8'), salt, 64)  # 32 for AES + 32 for HMAC
         else:
-            salt = b''
+            salt = salt or b''
             derived_key = key[:64]  # Ensure we have enough key material
         
         aes_key = derived_key[:32]
@@ -389,7 +476,8 @@ class Encryptor:
         ciphertext = encryptor.update(padded_data) + encryptor.finalize()
         
         # Calculate HMAC
-        hmac_obj = hmac.new(hmac_key, iv + ciphertext, hashlib.sha256)
+        hmac_obj = hmac.new(hmac_key, iv, hashlib.sha256)
+        hmac_obj.update(ciphertext)
         tag = hmac_obj.digest()
         
         # Create header and combine
@@ -409,7 +497,7 @@ class Encryptor:
         offset += iv_size
         tag = data[offset:offset + tag_size]
         offset += tag_size
-        ciphertext = data[offset:]
+        ciphertext = memoryview(data)[offset:]
         
         # Derive or prepare key
         if isinstance(key, str) and salt:
@@ -422,7 +510,9 @@ class Encryptor:
         hmac_key = derived_key[32:64]
         
         # Verify HMAC
-        expected_hmac = hmac.new(hmac_key, iv + ciphertext, hashlib.sha256).digest()
+        hmac_obj = hmac.new(hmac_key, iv, hashlib.sha256)
+        hmac_obj.update(ciphertext)
+        expected_hmac = hmac_obj.digest()
         if not hmac.compare_digest(tag, expected_hmac):
             raise SecurityError(
                 "HMAC verification failed - data may be tampered",
@@ -441,14 +531,15 @@ class Encryptor:
         padded_data = decryptor.update(ciphertext) + decryptor.finalize()
         return self._unpad_pkcs7(padded_data)
     
-    def _encrypt_chacha20(self, data: bytes, key: Union[str, bytes]) -> bytes:
+    def _encrypt_chacha20(self, data: bytes, key: Union[str, bytes],
+                          salt: Optional[bytes] = None) -> bytes:
         """Encrypt data using ChaCha20-Poly1305."""
         # Derive or prepare key
         if isinstance(key, str):
             salt = secrets.token_bytes(16)
             derived_key = self._derive_key(key.encode('utf-8'), salt, 32)
         else:
-            salt = b''
+            salt = salt or b''
             derived_key = key[:32]
         
         # Generate nonce
@@ -475,7 +566,7 @@ class Encryptor:
         offset += salt_size
         nonce = data[offset:offset + nonce_size]
         offset += nonce_size
-        ciphertext_with_tag = data[offset:]  # This includes the tag
+        ciphertext_with_tag = memoryview(data)[offset:]  # This includes the tag
         
         # Derive or prepare key
         if isinstance(key, str) and salt:
@@ -580,6 +671,60 @@ class Encryptor:
             temp_encryptor = Encryptor(EncryptionAlgorithmType.AES_256_GCM, derive_key=False)
             return temp_encryptor._decrypt_aes_gcm(encrypted_data, symmetric_key)
     
+    def create_stream_encryptor(self, key: Union[str, bytes], salt: bytes, iv: bytes,
+                                associated_data: bytes = b''):
+        """
+        Create an incremental AES-256-GCM encryption context.
+        
+        Args:
+            key: Password (derived with ``salt``) or raw key bytes.
+            salt: Salt for key derivation (ignored for raw keys).
+            iv: 96-bit nonce, must be unique per key.
+            associated_data: Data authenticated but not encrypted.
+            
+        Returns:
+            Context with update()/finalize() and a ``tag`` after finalizing.
+        """
+        encryptor = self._create_stream_cipher(key, salt, iv).encryptor()
+        if associated_data:
+            encryptor.authenticate_additional_data(associated_data)
+        return encryptor
+    
+    def create_stream_decryptor(self, key: Union[str, bytes], salt: bytes, iv: bytes,
+                                associated_data: bytes = b''):
+        """
+        Create an incremental AES-256-GCM decryption context.
+        
+        Plaintext returned by update() is unauthenticated until
+        finalize_with_tag() succeeds.
+        
+        Returns:
+            Context with update() and finalize_with_tag(tag).
+        """
+        decryptor = self._create_stream_cipher(key, salt, iv).decryptor()
+        if associated_data:
+            decryptor.authenticate_additional_data(associated_data)
+        return decryptor
+    
+    def _create_stream_cipher(self, key: Union[str, bytes], salt: bytes, iv: bytes) -> Cipher:
+        """Create the AES-256-GCM cipher used for streaming."""
+        if self.algorithm != EncryptionAlgorithmType.AES_256_GCM:
+            raise ValidationError(
+                f"Streaming is only supported for {EncryptionAlgorithmType.AES_256_GCM.value}",
+                ErrorCodes.UNSUPPORTED_ENCRYPTION
+            )
+        
+        if isinstance(key, str):
+            derived_key = self._derive_key(key.encode('utf-8'), salt, 32)
+        else:
+            derived_key = key[:32]
+        
+        return Cipher(
+            algorithms.AES(derived_key),
+            modes.GCM(iv),
+            backend=default_backend()
+        )
+    
     def _derive_key(self, password: bytes, salt: bytes, length: int) -> bytes:
         """Derive key using HKDF."""
         hkdf = HKDF(
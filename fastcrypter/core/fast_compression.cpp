@@ -1,45 +1,215 @@
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <array>
+#include <initializer_list>
 #include <vector>
 #include <algorithm>
 #include <unordered_map>
+#include <cstdint>
 #include <cstring>
 
+#include "common/common.h"
+
+#ifdef HAVE_CLMUL
+    #include <immintrin.h>
+    // The extension is built for the baseline ISA; only the kernel itself
+    // may use PCLMULQDQ, and it runs after a CPUID check
+    #if defined(__GNUC__) || defined(__clang__)
+        #define CLMUL_TARGET __attribute__((target("pclmul,sse2")))
+    #else
+        #define CLMUL_TARGET
+    #endif
+#endif
+
+// Stream format: literal bytes, except 0xFF which starts a 3-byte token
+// (0xFF, length, distance). length 0 is an escaped literal 0xFF; otherwise
+// copy `length` bytes from `distance` bytes back (copies may overlap).
+constexpr unsigned char MATCH_MARKER = 0xFF;
+constexpr size_t MIN_MATCH = 3;
+constexpr size_t MAX_MATCH = 255;
+constexpr size_t MAX_DISTANCE = 255;
+
+constexpr uint32_t key3(const unsigned char* p) {
+    return static_cast<uint32_t>(p[0]) | (static_cast<uint32_t>(p[1]) << 8) |
+           (static_cast<uint32_t>(p[2]) << 16);
+}
+
+// CRC-32 (gzip/zlib polynomial, reflected), byte table for short inputs
+// and tails, generated at compile time
+constexpr uint32_t CRC32_POLY = 0xEDB88320u;
+constexpr std::array<uint32_t, 256> crc32_table = [] {
+    std::array<uint32_t, 256> table{};
+    for (uint32_t i = 0; i < 256; i++) {
+        uint32_t crc = i;
+        for (int bit = 0; bit < 8; bit++) {
+            crc = (crc >> 1) ^ (CRC32_POLY & (0u - (crc & 1u)));
+        }
+        table[i] = crc;
+    }
+    return table;
+}();
+
+// Bytes below which the PCLMULQDQ setup costs more than it saves
+constexpr size_t CRC32_CLMUL_MIN = 64;
+
+static uint32_t crc32_table_update(uint32_t crc, const unsigned char* data, size_t len) {
+    for (size_t i = 0; i < len; i++) {
+        crc = crc32_table[(crc ^ data[i]) & 0xFF] ^ (crc >> 8);
+    }
+    return crc;
+}
+
+#ifdef HAVE_CLMUL
+// Folding CRC-32 with carry-less multiplies (Intel, "Fast CRC Computation
+// for Generic Polynomials Using PCLMULQDQ"). Takes and returns the CRC
+// register (the inverted zlib value); len must be a multiple of 16 and at
+// least 64.
+CLMUL_TARGET
+static uint32_t crc32_clmul(uint32_t crc, const unsigned char* buf, size_t len) {
+    alignas(16) static const uint64_t k1k2[] = {0x0154442bd4, 0x01c6e41596};
+    alignas(16) static const uint64_t k3k4[] = {0x01751997d0, 0x00ccaa009e};
+    alignas(16) static const uint64_t k5k0[] = {0x0163cd6124, 0x0000000000};
+    alignas(16) static const uint64_t poly[] = {0x01db710641, 0x01f7011641};
+    
+    __m128i x0, x1, x2, x3, x4, x5, x6, x7, x8, y5, y6, y7, y8;
+    
+    x1 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x00));
+    x2 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x10));
+    x3 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x20));
+    x4 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x30));
+    x1 = _mm_xor_si128(x1, _mm_cvtsi32_si128(static_cast<int>(crc)));
+    x0 = _mm_load_si128(reinterpret_cast<const __m128i*>(k1k2));
+    buf += 64;
+    len -= 64;
+    
+    // Fold four 128-bit lanes at a time
+    while (len >= 64) {
+        x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+        x6 = _mm_clmulepi64_si128(x2, x0, 0x00);
+        x7 = _mm_clmulepi64_si128(x3, x0, 0x00);
+        x8 = _mm_clmulepi64_si128(x4, x0, 0x00);
+        x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+        x2 = _mm_clmulepi64_si128(x2, x0, 0x11);
+        x3 = _mm_clmulepi64_si128(x3, x0, 0x11);
+        x4 = _mm_clmulepi64_si128(x4, x0, 0x11);
+        y5 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x00));
+        y6 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x10));
+        y7 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x20));
+        y8 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf + 0x30));
+        x1 = _mm_xor_si128(_mm_xor_si128(x1, x5), y5);
+        x2 = _mm_xor_si128(_mm_xor_si128(x2, x6), y6);
+        x3 = _mm_xor_si128(_mm_xor_si128(x3, x7), y7);
+        x4 = _mm_xor_si128(_mm_xor_si128(x4, x8), y8);
+        buf += 64;
+        len -= 64;
+    }
+    
+    // Fold the four lanes into one
+    x0 = _mm_load_si128(reinterpret_cast<const __m128i*>(k3k4));
+    for (__m128i next : {x2, x3, x4}) {
+        x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+        x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+        x1 = _mm_xor_si128(_mm_xor_si128(x1, next), x5);
+    }
+    
+    // Remaining 16-byte blocks
+    while (len >= 16) {
+        x2 = _mm_loadu_si128(reinterpret_cast<const __m128i*>(buf));
+        x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+        x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+        x1 = _mm_xor_si128(_mm_xor_si128(x1, x2), x5);
+        buf += 16;
+        len -= 16;
+    }
+    
+    // Fold 128 bits to 64
+    x2 = _mm_clmulepi64_si128(x1, x0, 0x10);
+    x3 = _mm_setr_epi32(~0, 0, ~0, 0);
+    x1 = _mm_xor_si128(_mm_srli_si128(x1, 8), x2);
+    x0 = _mm_loadl_epi64(reinterpret_cast<const __m128i*>(k5k0));
+    x2 = _mm_srli_si128(x1, 4);
+    x1 = _mm_and_si128(x1, x3);
+    x1 = _mm_clmulepi64_si128(x1, x0, 0x00);
+    x1 = _mm_xor_si128(x1, x2);
+    
+    // Barrett reduction to 32 bits
+    x0 = _mm_load_si128(reinterpret_cast<const __m128i*>(poly));
+    x2 = _mm_and_si128(x1, x3);
+    x2 = _mm_clmulepi64_si128(x2, x0, 0x10);
+    x2 = _mm_and_si128(x2, x3);
+    x2 = _mm_clmulepi64_si128(x2, x0, 0x00);
+    x1 = _mm_xor_si128(x1, x2);
+    
+    return static_cast<uint32_t>(_mm_cvtsi128_si32(_mm_srli_si128(x1, 4)));
+}
+#endif
+
+// zlib.crc32-compatible update: value is the CRC of the preceding data
+static uint32_t crc32_update(uint32_t value, const unsigned char* data, size_t len) {
+    uint32_t crc = ~value;
+    
+#ifdef HAVE_CLMUL
+    static const bool use_clmul = (fastcrypter_cpu_features() & CPU_CLMUL) != 0;
+    if (use_clmul && len >= CRC32_CLMUL_MIN) {
+        const size_t chunk = len & ~static_cast<size_t>(15);
+        crc = crc32_clmul(crc, data, chunk);
+        data += chunk;
+        len -= chunk;
+    }
+#endif
+    
+    return ~crc32_table_update(crc, data, len);
+}
+
 extern "C" {
 
 // Fast LZ77-style compression
 static PyObject* fast_compress(PyObject* self, PyObject* args) {
-    const char* data;
-    Py_ssize_t data_len;
+    Py_buffer view;
     
-    if (!PyArg_ParseTuple(args, "y#", &data, &data_len)) {
+    if (!PyArg_ParseTuple(args, "y*", &view)) {
         return NULL;
     }
     
-    std::vector<char> compressed;
-    compressed.reserve(data_len);
+    const unsigned char* data = static_cast<const unsigned char*>(view.buf);
+    const size_t data_len = static_cast<size_t>(view.len);
+    
+    std::vector<unsigned char> compressed;
+    compressed.reserve(data_len + data_len / 16 + 16);
     
-    std::unordered_map<std::string, size_t> dictionary;
+    // Last position of each 3-byte sequence, packed into an int key
+    std::unordered_map<uint32_t, size_t> dictionary;
+    dictionary.reserve(std::min<size_t>(data_len, 1 << 16));
     
-    for (size_t i = 0; i < static_cast<size_t>(data_len); ) {
+    for (size_t i = 0; i < data_len; ) {
         size_t match_len = 0;
-        size_t match_pos = 0;
+        size_t distance = 0;
         
-        // Look for matches in sliding window
-        for (size_t len = 3; len <= 258 && i + len <= static_cast<size_t>(data_len); len++) {
-            std::string substr(data + i, len);
-            auto it = dictionary.find(substr);
-            if (it != dictionary.end() && it->second < i) {
-                match_len = len;
-                match_pos = it->second;
+        if (i + MIN_MATCH <= data_len) {
+            auto it = dictionary.find(key3(data + i));
+            if (it != dictionary.end() && i - it->second <= MAX_DISTANCE) {
+                const size_t match_pos = it->second;
+                const size_t limit = std::min(MAX_MATCH, data_len - i);
+                match_len = MIN_MATCH;
+                while (match_len < limit && data[match_pos + match_len] == data[i + match_len]) {
+                    match_len++;
+                }
+                distance = i - match_pos;
             }
         }
         
-        if (match_len >= 3) {
+        if (match_len >= MIN_MATCH) {
             // Encode match
-            compressed.push_back(0xFF); // Match marker
-            compressed.push_back(static_cast<char>(match_len));
-            compressed.push_back(static_cast<char>(i - match_pos));
+            compressed.push_back(MATCH_MARKER);
+            compressed.push_back(static_cast<unsigned char>(match_len));
+            compressed.push_back(static_cast<unsigned char>(distance));
             i += match_len;
+        } else if (data[i] == MATCH_MARKER) {
+            // Escaped literal marker byte
+            compressed.push_back(MATCH_MARKER);
+            compressed.push_back(0);
+            compressed.push_back(0);
+            i++;
         } else {
             // Literal byte
             compressed.push_back(data[i]);
@@ -47,46 +217,87 @@ static PyObject* fast_compress(PyObject* self, PyObject* args) {
         }
         
         // Update dictionary
-        if (i >= 3) {
-            std::string key(data + i - 3, 3);
-            dictionary[key] = i - 3;
+        if (i >= MIN_MATCH) {
+            dictionary[key3(data + i - MIN_MATCH)] = i - MIN_MATCH;
         }
     }
     
-    return PyBytes_FromStringAndSize(compressed.data(), compressed.size());
+    PyBuffer_Release(&view);
+    return PyBytes_FromStringAndSize(reinterpret_cast<const char*>(compressed.data()),
+                                     static_cast<Py_ssize_t>(compressed.size()));
 }
 
 // Fast decompression
 static PyObject* fast_decompress(PyObject* self, PyObject* args) {
-    const char* data;
-    Py_ssize_t data_len;
+    Py_buffer view;
     
-    if (!PyArg_ParseTuple(args, "y#", &data, &data_len)) {
+    if (!PyArg_ParseTuple(args, "y*", &view)) {
         return NULL;
     }
     
-    std::vector<char> decompressed;
+    const unsigned char* data = static_cast<const unsigned char*>(view.buf);
+    const size_t data_len = static_cast<size_t>(view.len);
+    
+    std::vector<unsigned char> decompressed;
     decompressed.reserve(data_len * 2);
     
-    for (size_t i = 0; i < static_cast<size_t>(data_len); ) {
-        if (data[i] == static_cast<char>(0xFF) && i + 2 < static_cast<size_t>(data_len)) {
-            // Match found
-            size_t length = static_cast<unsigned char>(data[i + 1]);
-            size_t distance = static_cast<unsigned char>(data[i + 2]);
-            
-            size_t start_pos = decompressed.size() - distance;
-            for (size_t j = 0; j < length; j++) {
-                decompressed.push_back(decompressed[start_pos + j]);
-            }
-            i += 3;
-        } else {
+    for (size_t i = 0; i < data_len; ) {
+        if (data[i] != MATCH_MARKER) {
             // Literal byte
             decompressed.push_back(data[i]);
             i++;
+            continue;
+        }
+        
+        if (i + 2 >= data_len) {
+            PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_ValueError, "Truncated match token");
+            return NULL;
+        }
+        
+        const size_t length = data[i + 1];
+        const size_t distance = data[i + 2];
+        i += 3;
+        
+        if (length == 0) {
+            decompressed.push_back(MATCH_MARKER);
+            continue;
+        }
+        if (distance == 0 || distance > decompressed.size()) {
+            PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_ValueError, "Invalid match distance");
+            return NULL;
+        }
+        
+        // Byte by byte: the source may overlap what is being written
+        size_t start_pos = decompressed.size() - distance;
+        for (size_t j = 0; j < length; j++) {
+            decompressed.push_back(decompressed[start_pos + j]);
         }
     }
     
-    return PyBytes_FromStringAndSize(decompressed.data(), decompressed.size());
+    PyBuffer_Release(&view);
+    return PyBytes_FromStringAndSize(reinterpret_cast<const char*>(decompressed.data()),
+                                     static_cast<Py_ssize_t>(decompressed.size()));
+}
+
+// CRC-32 of data, same result as zlib.crc32(data, value)
+static PyObject* fast_crc32(PyObject* self, PyObject* args) {
+    Py_buffer view;
+    unsigned int value = 0;
+    
+    if (!PyArg_ParseTuple(args, "y*|I", &view, &value)) {
+        return NULL;
+    }
+    
+    uint32_t crc;
+    Py_BEGIN_ALLOW_THREADS
+    crc = crc32_update(value, static_cast<const unsigned char*>(view.buf),
+                       static_cast<size_t>(view.len));
+    Py_END_ALLOW_THREADS
+    
+    PyBuffer_Release(&view);
+    return PyLong_FromUnsignedLong(crc);
 }
 
 // Fast byte frequency analysis
@@ -116,6 +327,7 @@ static PyMethodDef FastCompressionMethods[] = {
     {"fast_compress", fast_compress, METH_VARARGS, "Fast compression"},
     {"fast_decompress", fast_decompress, METH_VARARGS, "Fast decompression"},
     {"fast_analyze", fast_analyze, METH_VARARGS, "Fast byte analysis"},
+    {"fast_crc32", fast_crc32, METH_VARARGS, "CRC-32 compatible with zlib.crc32"},
     {NULL, NULL, 0, NULL}
 };
 
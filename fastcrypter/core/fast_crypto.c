@@ -1,43 +1,172 @@
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <math.h>
 #include <string.h>
 #include <stdlib.h>
+#include <stdint.h>
 
-// Fast XOR operation for large data
+#include "common/common.h"
+
+#if defined(__AVX2__) || defined(__AVX512BW__) || defined(__SSE2__) || \
+    defined(_M_X64) || defined(_M_AMD64)
+    #include <immintrin.h>
+#elif defined(__ARM_NEON)
+    #include <arm_neon.h>
+#endif
+
+// setup_extensions.py builds this file once per instruction set tier,
+// each as its own module (_fast_crypto_<tier>)
+#ifndef FAST_CRYPTO_MODULE
+    #define FAST_CRYPTO_MODULE fast_crypto
+#endif
+#define FAST_CRYPTO_STR_(name) #name
+#define FAST_CRYPTO_STR(name) FAST_CRYPTO_STR_(name)
+#define FAST_CRYPTO_INIT_(name) PyInit_##name
+#define FAST_CRYPTO_INIT(name) FAST_CRYPTO_INIT_(name)
+
+// Keys shorter than this are repeated into a key stream block of at
+// least this many bytes, so the XOR kernel runs over long contiguous spans
+#define KEY_STREAM_MIN 256
+#define KEY_STREAM_BUF (2 * KEY_STREAM_MIN)
+
+// Below this many bytes releasing the GIL costs more than it saves
+#define XOR_NOGIL_MIN (64 * 1024)
+
+// Bytes per round of fast_entropy's 32-bit histograms
+#define ENTROPY_CHUNK ((Py_ssize_t)1 << 30)
+
+// out = in ^ ks over n bytes, with the widest vectors this tier was
+// compiled for (setup_extensions.py builds one module per ISA tier).
+// out is always a fresh bytes object, so none of the buffers overlap
+static void xor_block(unsigned char* FASTCRYPTER_RESTRICT out,
+                      const unsigned char* FASTCRYPTER_RESTRICT in,
+                      const unsigned char* FASTCRYPTER_RESTRICT ks, size_t n) {
+    size_t i = 0;
+    
+#if defined(__AVX512BW__)
+    for (; i + 64 <= n; i += 64) {
+        __m512i v = _mm512_xor_si512(_mm512_loadu_si512((const void*)(in + i)),
+                                     _mm512_loadu_si512((const void*)(ks + i)));
+        _mm512_storeu_si512((void*)(out + i), v);
+    }
+#elif defined(__AVX2__)
+    for (; i + 32 <= n; i += 32) {
+        __m256i v = _mm256_xor_si256(_mm256_loadu_si256((const __m256i*)(in + i)),
+                                     _mm256_loadu_si256((const __m256i*)(ks + i)));
+        _mm256_storeu_si256((__m256i*)(out + i), v);
+    }
+#elif defined(__SSE2__) || defined(_M_X64) || defined(_M_AMD64)
+    for (; i + 16 <= n; i += 16) {
+        __m128i v = _mm_xor_si128(_mm_loadu_si128((const __m128i*)(in + i)),
+                                  _mm_loadu_si128((const __m128i*)(ks + i)));
+        _mm_storeu_si128((__m128i*)(out + i), v);
+    }
+#elif defined(__ARM_NEON)
+    for (; i + 16 <= n; i += 16) {
+        vst1q_u8(out + i, veorq_u8(vld1q_u8(in + i), vld1q_u8(ks + i)));
+    }
+#endif
+    
+    for (; i < n; i++) {
+        out[i] = in[i] ^ ks[i];
+    }
+}
+
+// XOR data with a repeating key, one key stream period at a time
+static void xor_repeating(unsigned char* out, const unsigned char* in, size_t n,
+                          const unsigned char* key, size_t key_len) {
+    // Aligned so key stream loads never split a cache line
+    FASTCRYPTER_ALIGN(64) unsigned char stream[KEY_STREAM_BUF];
+    const unsigned char* ks = key;
+    size_t period = key_len;
+    
+    if (key_len < KEY_STREAM_MIN) {
+        // Largest multiple of key_len that fits, so periods line up
+        period = (KEY_STREAM_BUF / key_len) * key_len;
+        for (size_t i = 0; i < period; i += key_len) {
+            memcpy(stream + i, key, key_len);
+        }
+        ks = stream;
+    }
+    
+    for (size_t offset = 0; offset < n; offset += period) {
+        size_t chunk = n - offset < period ? n - offset : period;
+        xor_block(out + offset, in + offset, ks, chunk);
+    }
+}
+
+// Fast XOR operation for large data. Takes any buffer (bytes, bytearray,
+// memoryview) and XORs straight into the new bytes object
 static PyObject* fast_xor(PyObject* self, PyObject* args) {
-    const char* data;
-    const char* key;
-    Py_ssize_t data_len, key_len;
+    Py_buffer data, key;
     
-    if (!PyArg_ParseTuple(args, "y#y#", &data, &data_len, &key, &key_len)) {
+    if (!PyArg_ParseTuple(args, "y*y*", &data, &key)) {
         return NULL;
     }
     
-    char* result = (char*)malloc(data_len);
-    if (!result) {
-        return PyErr_NoMemory();
+    PyObject* py_result = NULL;
+    if (key.len == 0) {
+        PyErr_SetString(PyExc_ValueError, "Key must not be empty");
+        goto done;
     }
     
-    for (Py_ssize_t i = 0; i < data_len; i++) {
-        result[i] = data[i] ^ key[i % key_len];
+    py_result = PyBytes_FromStringAndSize(NULL, data.len);
+    if (!py_result) {
+        goto done;
     }
     
-    PyObject* py_result = PyBytes_FromStringAndSize(result, data_len);
-    free(result);
+    // PyBytes_AsString: PyBytes_AS_STRING is not in the limited API
+    unsigned char* result = (unsigned char*)PyBytes_AsString(py_result);
+    if (data.len >= XOR_NOGIL_MIN) {
+        Py_BEGIN_ALLOW_THREADS
+        xor_repeating(result, (const unsigned char*)data.buf, (size_t)data.len,
+                      (const unsigned char*)key.buf, (size_t)key.len);
+        Py_END_ALLOW_THREADS
+    } else {
+        xor_repeating(result, (const unsigned char*)data.buf, (size_t)data.len,
+                      (const unsigned char*)key.buf, (size_t)key.len);
+    }
+    
+done:
+    PyBuffer_Release(&data);
+    PyBuffer_Release(&key);
     return py_result;
 }
 
 // Fast entropy calculation
 static PyObject* fast_entropy(PyObject* self, PyObject* args) {
-    const char* data;
-    Py_ssize_t data_len;
+    Py_buffer view;
     
-    if (!PyArg_ParseTuple(args, "y#", &data, &data_len)) {
+    if (!PyArg_ParseTuple(args, "y*", &view)) {
         return NULL;
     }
     
-    int freq[256] = {0};
-    for (Py_ssize_t i = 0; i < data_len; i++) {
-        freq[(unsigned char)data[i]]++;
+    const unsigned char* data = (const unsigned char*)view.buf;
+    Py_ssize_t data_len = view.len;
+    
+    // Four interleaved histograms, so runs of the same byte do not stall
+    // on one counter's load-increment-store chain. 32-bit counters keep
+    // them small; chunks of ENTROPY_CHUNK bytes cannot overflow them
+    Py_ssize_t freq[256] = {0};
+    uint32_t counts[4][256];
+    for (Py_ssize_t start = 0; start < data_len; start += ENTROPY_CHUNK) {
+        const unsigned char* chunk = data + start;
+        Py_ssize_t n = data_len - start < ENTROPY_CHUNK ? data_len - start : ENTROPY_CHUNK;
+        Py_ssize_t pos = 0;
+        
+        memset(counts, 0, sizeof(counts));
+        for (; pos + 4 <= n; pos += 4) {
+            counts[0][chunk[pos]]++;
+            counts[1][chunk[pos + 1]]++;
+            counts[2][chunk[pos + 2]]++;
+            counts[3][chunk[pos + 3]]++;
+        }
+        for (; pos < n; pos++) {
+            counts[0][chunk[pos]]++;
+        }
+        for (int b = 0; b < 256; b++) {
+            freq[b] += (Py_ssize_t)counts[0][b] + counts[1][b] + counts[2][b] + counts[3][b];
+        }
     }
     
     double entropy = 0.0;
@@ -48,50 +177,71 @@ static PyObject* fast_entropy(PyObject* self, PyObject* args) {
         }
     }
     
+    PyBuffer_Release(&view);
     return PyFloat_FromDouble(entropy);
 }
 
-// Fast memory clearing
+// Fast memory clearing of any writable buffer (bytearray, memoryview, ...);
+// read-only objects are left alone
 static PyObject* secure_clear(PyObject* self, PyObject* args) {
     PyObject* obj;
+    Py_buffer view;
     if (!PyArg_ParseTuple(args, "O", &obj)) {
         return NULL;
     }
     
-    if (PyByteArray_Check(obj)) {
-        char* data = PyByteArray_AsString(obj);
-        Py_ssize_t size = PyByteArray_Size(obj);
-        
-        // Multiple overwrites for security
-        for (int pass = 0; pass < 3; pass++) {
-            for (Py_ssize_t i = 0; i < size; i++) {
-                data[i] = (char)(rand() & 0xFF);
-            }
-        }
-        memset(data, 0, size);
+    if (PyObject_GetBuffer(obj, &view, PyBUF_WRITABLE) < 0) {
+        PyErr_Clear();
+        Py_RETURN_NONE;
     }
     
+    // One pass is enough for RAM; random overwrite passes only cost time
+    fastcrypter_secure_zero(view.buf, (size_t)view.len);
+    PyBuffer_Release(&view);
+    
     Py_RETURN_NONE;
 }
 
+// Hardware crypto support, as a dict of feature name -> bool
+static PyObject* cpu_features(PyObject* self, PyObject* args) {
+    int features = fastcrypter_cpu_features();
+    
+    // The instruction set keys use the /proc/cpuinfo names fast_crypto.py
+    // matches its tiers against
+    return Py_BuildValue("{s:O,s:O,s:O,s:O,s:O,s:O,s:O,s:O,s:O,s:O,s:O,s:O}",
+                         "aesni", (features & CPU_AESNI) ? Py_True : Py_False,
+                         "clmul", (features & CPU_CLMUL) ? Py_True : Py_False,
+                         "shani", (features & CPU_SHANI) ? Py_True : Py_False,
+                         "pclmulqdq", (features & CPU_PCLMULQDQ) ? Py_True : Py_False,
+                         "bmi2", (features & CPU_BMI2) ? Py_True : Py_False,
+                         "avx2", (features & CPU_AVX2) ? Py_True : Py_False,
+                         "avx512f", (features & CPU_AVX512F) ? Py_True : Py_False,
+                         "avx512bw", (features & CPU_AVX512BW) ? Py_True : Py_False,
+                         "vpclmulqdq", (features & CPU_VPCLMULQDQ) ? Py_True : Py_False,
+                         "aes", (features & CPU_ARMCRYPTO) ? Py_True : Py_False,
+                         "pmull", (features & CPU_ARMCRYPTO) ? Py_True : Py_False,
+                         "sha2", (features & CPU_ARMCRYPTO) ? Py_True : Py_False);
+}
+
 // Method definitions
 static PyMethodDef fastCrypteroMethods[] = {
     {"fast_xor", fast_xor, METH_VARARGS, "Fast XOR operation"},
     {"fast_entropy", fast_entropy, METH_VARARGS, "Fast entropy calculation"},
     {"secure_clear", secure_clear, METH_VARARGS, "Secure memory clearing"},
+    {"cpu_features", cpu_features, METH_NOARGS, "Available hardware crypto instructions"},
     {NULL, NULL, 0, NULL}
 };
 
 // Module definition
 static struct PyModuleDef fastCrypteromodule = {
     PyModuleDef_HEAD_INIT,
-    "fast_crypto",
+    FAST_CRYPTO_STR(FAST_CRYPTO_MODULE),
     "Fast cryptographic operations in C",
     -1,
     fastCrypteroMethods
 };
 
 // Module initialization
-PyMODINIT_FUNC PyInit_fast_crypto(void) {
+PyMODINIT_FUNC FAST_CRYPTO_INIT(FAST_CRYPTO_MODULE)(void) {
     return PyModule_Create(&fastCrypteromodule);
 } 
\ No newline at end of file
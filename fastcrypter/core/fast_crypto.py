@@ -0,0 +1,166 @@
+"""
+Loader for the fast_crypto C extension.
+
+setup_extensions.py builds the extension once per instruction set tier
+(_fast_crypto_avx512, _fast_crypto_avx2, ...). This module imports the best
+tier the running CPU supports, as reported by the baseline tier's
+cpu_features() (CPUID), and re-exports its functions, so a single wheel
+runs everywhere and still uses wide vectors where available.
+FASTCRYPTER_ISA forces a specific tier. The Rust module (fastcrypter._rust,
+built from rust/ when setuptools-rust is installed) is preferred over the
+C tiers when present. Without any C tier the Cython _xor module is used
+when built, then the Numba versions when numba is installed. A
+RuntimeWarning is raised when a tier that setup_extensions.py built
+(build_config.json) cannot be loaded.
+"""
+
+import importlib
+import json
+import os
+import platform
+import warnings
+from typing import Optional
+
+from ..native.native_loader import _get_cpu_flags
+
+# Tiers, best first, with the CPU flags (/proc/cpuinfo names) each one
+# requires. The last tier is the baseline that runs on every CPU
+ISA_TIERS = {
+    'x86_64': [
+        ('avx512', {'avx2', 'bmi2', 'avx512f', 'avx512bw', 'vpclmulqdq'}),
+        ('avx2', {'avx2', 'bmi2', 'pclmulqdq'}),
+        ('sse2', set()),
+    ],
+    'aarch64': [
+        ('crypto', {'aes', 'pmull', 'sha2'}),
+        ('generic', set()),
+    ],
+}
+
+
+def _get_tier_cpu_flags(baseline: str) -> Optional[set]:
+    """
+    Get the CPU flags from the baseline tier's cpu_features().
+    
+    The baseline module runs on any CPU and checks CPUID (or the OS
+    feature flags on ARM), so this works where /proc/cpuinfo does not.
+    Returns None when the baseline tier is not built.
+    """
+    try:
+        module = importlib.import_module(f'._fast_crypto_{baseline}', __package__)
+    except ImportError:
+        return None
+    return {name for name, present in module.cpu_features().items() if present}
+
+
+def _select_tiers() -> list:
+    """Get the tier names usable on this CPU, best first."""
+    forced = os.environ.get('FASTCRYPTER_ISA')
+    if forced:
+        return [forced]
+
+    machine = platform.machine().lower()
+    machine = {'amd64': 'x86_64', 'arm64': 'aarch64'}.get(machine, machine)
+    tiers = ISA_TIERS.get(machine, [('generic', set())])
+
+    # Without CPU flags only the baseline is safe
+    cpu_flags = _get_tier_cpu_flags(tiers[-1][0])
+    if cpu_flags is None:
+        cpu_flags = _get_cpu_flags()
+    if cpu_flags is None:
+        return [tiers[-1][0]]
+    return [name for name, required in tiers if required <= cpu_flags]
+
+
+def _load():
+    """Import the best available tier, or raise ImportError."""
+    # The Rust build is opt-in, so prefer it unless a tier is forced
+    if not os.environ.get('FASTCRYPTER_ISA'):
+        try:
+            from .. import _rust
+            return 'rust', _FallbackExtension(_rust)
+        except ImportError:
+            pass
+    
+    for tier in _select_tiers():
+        try:
+            return tier, importlib.import_module(f'._fast_crypto_{tier}', __package__)
+        except ImportError:
+            continue
+    
+    # Cython build of the hot loops, for when the C extension is not built
+    try:
+        from . import _xor
+        return 'cython', _FallbackExtension(_xor)
+    except ImportError:
+        pass
+    
+    # Numba needs no build step at all (the `performance` extra)
+    try:
+        from . import fast_crypto_numba
+    except ImportError:
+        raise ImportError("No fast_crypto extension built for this CPU") from None
+    return 'numba', _FallbackExtension(fast_crypto_numba)
+
+
+def _load_build_config() -> dict:
+    """Read build_config.json written by setup_extensions.py, if any."""
+    path = os.path.join(os.path.dirname(__file__), 'build_config.json')
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _check_build(tier: str) -> None:
+    """Warn when a better tier was built than the one that loaded."""
+    if tier == 'rust':
+        return
+    built = _load_build_config().get('tiers', [])
+    expected = next((name for name in _select_tiers() if name in built), None)
+    if expected is not None and expected != tier:
+        warnings.warn(
+            f"fast_crypto was built with the {expected} tier but it could not "
+            f"be imported; using the slower {tier} implementation. Rebuild with "
+            "`python setup_extensions.py build_ext --inplace`.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+
+class _FallbackExtension:
+    """fast_crypto's functions on top of the Rust, Cython or Numba module."""
+    
+    def __init__(self, module):
+        self.fast_xor = module.xor_bytes
+        self.fast_entropy = module.shannon_entropy
+        self._secure_zero = getattr(module, 'secure_zero', None)
+        self._cpu_features = getattr(module, 'cpu_features', None)
+    
+    def secure_clear(self, obj) -> None:
+        # Like the C version: any writable buffer, read-only ones are ignored
+        try:
+            view = memoryview(obj).cast('B')
+        except TypeError:
+            return
+        if view.readonly:
+            return
+        if self._secure_zero is not None:
+            self._secure_zero(view)
+        else:
+            view[:] = bytes(len(view))
+    
+    def cpu_features(self) -> dict:
+        if self._cpu_features is not None:
+            return dict(self._cpu_features())
+        return {'aesni': False, 'clmul': False, 'shani': False}
+
+
+ISA_TIER, _extension = _load()
+_check_build(ISA_TIER)
+
+fast_xor = _extension.fast_xor
+fast_entropy = _extension.fast_entropy
+secure_clear = _extension.secure_clear
+cpu_features = _extension.cpu_features
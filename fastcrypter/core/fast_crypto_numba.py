@@ -0,0 +1,64 @@
+"""
+Numba versions of the fast_crypto loops.
+
+Last-resort fallback for fast_crypto when neither the C extension nor
+the Cython module is built (e.g. Windows without a compiler): the loops
+are compiled at first use and cached on disk, so only `numba` needs to
+be installed (the `performance` extra).
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def _xor(data, key):
+    n = data.shape[0]
+    key_len = key.shape[0]
+    out = np.empty(n, np.uint8)
+    for i in prange(n):
+        out[i] = data[i] ^ key[i % key_len]
+    return out
+
+
+@njit(cache=True, boundscheck=False)
+def _entropy(data):
+    counts = np.zeros(256, np.int64)
+    for i in range(data.shape[0]):
+        counts[data[i]] += 1
+
+    n = data.shape[0]
+    entropy = 0.0
+    for count in counts:
+        if count:
+            p = count / n
+            entropy -= p * np.log2(p)
+    return entropy
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def _zero(data):
+    for i in prange(data.shape[0]):
+        data[i] = 0
+
+
+def xor_bytes(data: bytes, key: bytes) -> bytes:
+    """XOR data with a repeating key, returning new bytes."""
+    if not key:
+        raise ValueError("Key must not be empty")
+    if not data:
+        return b''
+    return _xor(np.frombuffer(data, np.uint8), np.frombuffer(key, np.uint8)).tobytes()
+
+
+def shannon_entropy(data: bytes) -> float:
+    """Shannon entropy of data in bits per byte."""
+    if not data:
+        return 0.0
+    return float(_entropy(np.frombuffer(data, np.uint8)))
+
+
+def secure_zero(buffer: bytearray) -> None:
+    """Zero a writable buffer in place."""
+    if len(buffer):
+        _zero(np.frombuffer(buffer, np.uint8))
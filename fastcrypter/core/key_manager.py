@@ -14,6 +14,7 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
+from argon2.low_level import Type, hash_secret_raw
 
 from ..exceptions import KeyError, SecurityError, ValidationError, ErrorCodes
 
@@ -31,27 +32,32 @@ class KeyManager:
     MIN_SALT_LENGTH = 16
     DEFAULT_ITERATIONS = 100000
     DEFAULT_KEY_LENGTH = 32  # 256 bits
+    DEFAULT_TIME_COST = 2    # Argon2id passes
     
     # Supported KDF algorithms
     KDF_ALGORITHMS = {
         'pbkdf2': 'PBKDF2-HMAC-SHA256',
         'scrypt': 'Scrypt',
         'argon2': 'Argon2id',
+        'argon2id': 'Argon2id (raw)',
     }
     
     def __init__(self, 
                  kdf_algorithm: str = 'pbkdf2',
                  iterations: int = DEFAULT_ITERATIONS,
                  memory_cost: int = 65536,  # For Scrypt/Argon2
-                 parallelism: int = 1):     # For Argon2
+                 parallelism: int = 1,      # For Argon2
+                 time_cost: int = DEFAULT_TIME_COST):  # For Argon2id
         """
         Initialize the KeyManager.
         
         Args:
             kdf_algorithm (str): Key derivation function to use.
             iterations (int): Number of iterations for KDF.
-            memory_cost (int): Memory cost for Scrypt/Argon2.
+            memory_cost (int): Argon2 memory in bytes, for both 'argon2' and
+                'argon2id' (rounded down to whole KiB).
             parallelism (int): Parallelism factor for Argon2.
+            time_cost (int): Number of passes for 'argon2id'.
             
         Raises:
             ValidationError: If parameters are invalid.
@@ -66,6 +72,7 @@ class KeyManager:
         self.iterations = max(iterations, 10000)  # Minimum security
         self.memory_cost = memory_cost
         self.parallelism = parallelism
+        self.time_cost = time_cost
         
         # Initialize Argon2 hasher if needed
         if kdf_algorithm == 'argon2':
@@ -74,6 +81,13 @@ class KeyManager:
                 memory_cost=self.memory_cost // 1024,  # Convert to KB
                 parallelism=self.parallelism
             )
+        elif kdf_algorithm == 'argon2id':
+            self._argon2_hasher = PasswordHasher(
+                time_cost=self.time_cost,
+                memory_cost=self.memory_cost // 1024,  # Convert to KB
+                parallelism=self.parallelism,
+                type=Type.ID
+            )
     
     def generate_salt(self, length: int = MIN_SALT_LENGTH) -> bytes:
         """
@@ -145,6 +159,8 @@ class KeyManager:
                 key = self._derive_scrypt(password, salt, key_length)
             elif self.kdf_algorithm == 'argon2':
                 key = self._derive_argon2(password, salt, key_length)
+            elif self.kdf_algorithm == 'argon2id':
+                key = self._derive_argon2id(password, salt, key_length)
             else:
                 raise KeyError(
                     f"Unsupported KDF algorithm: {self.kdf_algorithm}",
@@ -198,6 +214,18 @@ class KeyManager:
         )
         return hkdf.derive(hash_bytes)
     
+    def _derive_argon2id(self, password: str, salt: bytes, key_length: int) -> bytes:
+        """Derive key using Argon2id, taking the raw tag as the key."""
+        return hash_secret_raw(
+            secret=password.encode('utf-8'),
+            salt=salt,
+            time_cost=self.time_cost,
+            memory_cost=self._argon2_hasher.memory_cost,
+            parallelism=self.parallelism,
+            hash_len=key_length,
+            type=Type.ID
+        )
+    
     def verify_password(self, password: str, stored_hash: str) -> bool:
         """
         Verify a password against a stored hash (Argon2 only).
@@ -209,7 +237,7 @@ class KeyManager:
         Returns:
             bool: True if password matches.
         """
-        if self.kdf_algorithm != 'argon2':
+        if self.kdf_algorithm not in ('argon2', 'argon2id'):
             raise SecurityError(
                 "Password verification only supported with Argon2",
                 ErrorCodes.UNSUPPORTED_ENCRYPTION
@@ -310,6 +338,7 @@ class KeyManager:
             "iterations": self.iterations,
             "memory_cost": self.memory_cost,
             "parallelism": self.parallelism,
+            "time_cost": self.time_cost,
             "default_key_length": self.DEFAULT_KEY_LENGTH,
             "min_salt_length": self.MIN_SALT_LENGTH,
         } 
\ No newline at end of file
@@ -7,7 +7,13 @@
 #include <random>
 #include <chrono>
 
-extern "C" {
+// SHA-NI support is enabled by build_native.py when the assembler
+// understands the SHA extensions; the CPU is still checked at runtime
+#if defined(CONFIG_HAS_SHA_NI) && (defined(__x86_64__) || defined(__i386__))
+    #include <immintrin.h>
+    #include <cpuid.h>
+    #define USE_SHA_NI 1
+#endif
 
 // Export macros for different platforms
 #ifdef _WIN32
@@ -15,7 +21,6 @@ extern "C" {
 #else
     #define EXPORT __attribute__((visibility("default")))
 #endif
-}
 
 // SHA-256 implementation (simplified for demo)
 class SHA256 {
@@ -56,14 +61,89 @@ private:
         return rotr(x, 17) ^ rotr(x, 19) ^ (x >> 10);
     }
     
+#ifdef USE_SHA_NI
+    static bool detect_sha_ni() {
+        unsigned int eax, ebx, ecx, edx;
+        
+        // SSE4.1: CPUID.1:ECX[19], SHA: CPUID.(7,0):EBX[29]
+        if (!__get_cpuid(1, &eax, &ebx, &ecx, &edx) || !(ecx & (1u << 19))) {
+            return false;
+        }
+        if (!__get_cpuid_count(7, 0, &eax, &ebx, &ecx, &edx)) {
+            return false;
+        }
+        return (ebx & (1u << 29)) != 0;
+    }
+    
+    static const bool has_sha_ni;
+    
+    // Process one block with the SHA extensions (4 rounds per iteration).
+    // Kept out of line: the SHA instructions only have legacy SSE
+    // encodings, and inlining them into AVX-512 code (-march=native)
+    // made hashing over 100x slower.
+    __attribute__((target("sha,sse4.1"), noinline))
+    static void process_block_sha_ni(uint32_t* state, const uint8_t* block) {
+        const __m128i byteswap = _mm_set_epi64x(0x0c0d0e0f08090a0bULL, 0x0405060700010203ULL);
+        __m128i state0, state1, tmp, msg, w[4];
+        
+        // Reorder state from ABCD/EFGH into the ABEF/CDGH layout
+        tmp = _mm_shuffle_epi32(_mm_loadu_si128((const __m128i*)&state[0]), 0xB1);
+        state1 = _mm_shuffle_epi32(_mm_loadu_si128((const __m128i*)&state[4]), 0x1B);
+        state0 = _mm_alignr_epi8(tmp, state1, 8);
+        state1 = _mm_blend_epi16(state1, tmp, 0xF0);
+        
+        const __m128i abef_save = state0;
+        const __m128i cdgh_save = state1;
+        
+        for (int i = 0; i < 16; i++) {
+            __m128i wi;
+            if (i < 4) {
+                wi = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i*)(block + i * 16)), byteswap);
+            } else {
+                tmp = _mm_sha256msg1_epu32(w[i & 3], w[(i + 1) & 3]);
+                tmp = _mm_add_epi32(tmp, _mm_alignr_epi8(w[(i + 3) & 3], w[(i + 2) & 3], 4));
+                wi = _mm_sha256msg2_epu32(tmp, w[(i + 3) & 3]);
+            }
+            w[i & 3] = wi;
+            
+            msg = _mm_add_epi32(wi, _mm_loadu_si128((const __m128i*)&K[i * 4]));
+            state1 = _mm_sha256rnds2_epu32(state1, state0, msg);
+            msg = _mm_shuffle_epi32(msg, 0x0E);
+            state0 = _mm_sha256rnds2_epu32(state0, state1, msg);
+        }
+        
+        state0 = _mm_add_epi32(state0, abef_save);
+        state1 = _mm_add_epi32(state1, cdgh_save);
+        
+        // Back to ABCD/EFGH
+        tmp = _mm_shuffle_epi32(state0, 0x1B);
+        state1 = _mm_shuffle_epi32(state1, 0xB1);
+        state0 = _mm_blend_epi16(tmp, state1, 0xF0);
+        state1 = _mm_alignr_epi8(state1, tmp, 8);
+        
+        _mm_storeu_si128((__m128i*)&state[0], state0);
+        _mm_storeu_si128((__m128i*)&state[4], state1);
+    }
+#endif
+    
     void process_block() {
+        process_block(buffer);
+    }
+    
+    void process_block(const uint8_t* block) {
+#ifdef USE_SHA_NI
+        if (has_sha_ni) {
+            process_block_sha_ni(h, block);
+            return;
+        }
+#endif
         uint32_t w[64];
         uint32_t a, b, c, d, e, f, g, h_temp;
         
         // Prepare message schedule
         for (int i = 0; i < 16; i++) {
-            w[i] = (buffer[i * 4] << 24) | (buffer[i * 4 + 1] << 16) |
-                   (buffer[i * 4 + 2] << 8) | buffer[i * 4 + 3];
+            w[i] = (block[i * 4] << 24) | (block[i * 4 + 1] << 16) |
+                   (block[i * 4 + 2] << 8) | block[i * 4 + 3];
         }
         
         for (int i = 16; i < 64; i++) {
@@ -108,6 +188,13 @@ public:
     void update(const uint8_t* data, size_t len) {
         total_len += len;
         
+        // Hash whole blocks straight from the input when nothing is buffered
+        while (buffer_len == 0 && len >= 64) {
+            process_block(data);
+            data += 64;
+            len -= 64;
+        }
+        
         while (len > 0) {
             size_t copy_len = std::min(len, 64 - buffer_len);
             memcpy(buffer + buffer_len, data, copy_len);
@@ -165,6 +252,10 @@ const uint32_t SHA256::K[64] = {
     0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
 };
 
+#ifdef USE_SHA_NI
+const bool SHA256::has_sha_ni = SHA256::detect_sha_ni();
+#endif
+
 const uint32_t SHA256::H0[8] = {
     0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
     0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
@@ -242,6 +333,8 @@ public:
     }
 };
 
+extern "C" {
+
 // Fast hash functions
 EXPORT void fast_sha256(const uint8_t* data, size_t len, uint8_t* hash) {
     SHA256 sha;
@@ -249,6 +342,17 @@ EXPORT void fast_sha256(const uint8_t* data, size_t len, uint8_t* hash) {
     sha.finalize(hash);
 }
 
+// Hash n messages packed back to back in one buffer; message i spans
+// data[offsets[i]..offsets[i + 1]) and its digest goes to hashes + 32 * i
+EXPORT void fast_sha256_many(const uint8_t* data, const uint64_t* offsets, size_t n,
+                             uint8_t* hashes) {
+    for (size_t i = 0; i < n; i++) {
+        SHA256 sha;
+        sha.update(data + offsets[i], (size_t)(offsets[i + 1] - offsets[i]));
+        sha.finalize(hashes + 32 * i);
+    }
+}
+
 EXPORT void fast_hmac_sha256(const uint8_t* key, size_t key_len,
                             const uint8_t* data, size_t data_len,
                             uint8_t* hmac) {
@@ -352,39 +456,51 @@ EXPORT int fast_verify(const uint8_t* public_key, const uint8_t* message, size_t
     return 1; // Verification passed
 }
 
+// One PBKDF2-HMAC-SHA256 output block T_i (block_index starts at 1).
+// Blocks are independent, so callers can compute them in parallel.
+EXPORT void fast_pbkdf2_block(const uint8_t* password, size_t pwd_len,
+                             const uint8_t* salt, size_t salt_len,
+                             uint32_t iterations, uint32_t block_index, uint8_t* out32) {
+    uint8_t u[32];
+    
+    // PRF = HMAC-SHA256
+    uint8_t salt_block[salt_len + 4];
+    memcpy(salt_block, salt, salt_len);
+    
+    // Block number (big-endian)
+    salt_block[salt_len] = (block_index >> 24) & 0xFF;
+    salt_block[salt_len + 1] = (block_index >> 16) & 0xFF;
+    salt_block[salt_len + 2] = (block_index >> 8) & 0xFF;
+    salt_block[salt_len + 3] = block_index & 0xFF;
+    
+    // First iteration
+    fast_hmac_sha256(password, pwd_len, salt_block, salt_len + 4, u);
+    memcpy(out32, u, 32);
+    
+    // Remaining iterations
+    for (uint32_t j = 1; j < iterations; j++) {
+        fast_hmac_sha256(password, pwd_len, u, 32, u);
+        for (int k = 0; k < 32; k++) {
+            out32[k] ^= u[k];
+        }
+    }
+}
+
 // Fast PBKDF2 implementation
 EXPORT void fast_pbkdf2(const uint8_t* password, size_t pwd_len,
                        const uint8_t* salt, size_t salt_len,
                        uint32_t iterations, uint8_t* output, size_t out_len) {
-    uint8_t u[32], t[32];
+    uint8_t t[32];
     
     for (size_t i = 0; i < out_len; i += 32) {
-        // PRF = HMAC-SHA256
-        uint8_t salt_block[salt_len + 4];
-        memcpy(salt_block, salt, salt_len);
-        
-        // Block number (big-endian)
         uint32_t block_num = (i / 32) + 1;
-        salt_block[salt_len] = (block_num >> 24) & 0xFF;
-        salt_block[salt_len + 1] = (block_num >> 16) & 0xFF;
-        salt_block[salt_len + 2] = (block_num >> 8) & 0xFF;
-        salt_block[salt_len + 3] = block_num & 0xFF;
-        
-        // First iteration
-        fast_hmac_sha256(password, pwd_len, salt_block, salt_len + 4, u);
-        memcpy(t, u, 32);
         
-        // Remaining iterations
-        for (uint32_t j = 1; j < iterations; j++) {
-            fast_hmac_sha256(password, pwd_len, u, 32, u);
-            for (int k = 0; k < 32; k++) {
-                t[k] ^= u[k];
-            }
+        if (out_len - i >= 32) {
+            fast_pbkdf2_block(password, pwd_len, salt, salt_len, iterations, block_num, output + i);
+        } else {
+            fast_pbkdf2_block(password, pwd_len, salt, salt_len, iterations, block_num, t);
+            memcpy(output + i, t, out_len - i);
         }
-        
-        // Copy to output
-        size_t copy_len = std::min((size_t)32, out_len - i);
-        memcpy(output + i, t, copy_len);
     }
 }
 
@@ -414,7 +530,28 @@ EXPORT double benchmark_hash_performance(size_t data_size, uint32_t iterations)
     return duration.count() / 1000000.0; // Return seconds
 }
 
+// Hash caller-supplied data `iterations` times entirely in native code.
+// Compared with the same loop driven from Python this isolates the cost
+// of crossing the FFI on every call.
+EXPORT double benchmark_hash_loop(const uint8_t* data, size_t data_len, uint32_t iterations) {
+    uint8_t hash[32];
+    volatile uint8_t sink = 0;
+
+    auto start = std::chrono::steady_clock::now();
+
+    for (uint32_t i = 0; i < iterations; i++) {
+        fast_sha256(data, data_len, hash);
+        sink = sink ^ hash[0];  // Keep the loop from being optimized away
+    }
+
+    auto end = std::chrono::steady_clock::now();
+    return std::chrono::duration<double>(end - start).count();
+}
+
 // Library initialization
+// The library has no mutable global state and takes no locks: every
+// function is re-entrant and may run on several threads at once (the
+// Python wrapper calls it with the GIL released). Keep it that way.
 EXPORT int hash_algorithms_init() {
     return 0;
 }
@@ -9,9 +9,20 @@ import os
 import sys
 import ctypes
 import platform
-from typing import Optional, Tuple, Union
+import threading
+import time
+import weakref
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 
+# Bytes-like values accepted by the zero-copy wrappers
+# Anything exporting a C-contiguous buffer: bytes, bytearray, memoryview,
+# mmap, array.array, numpy arrays...
+BytesLike = Union[bytes, bytearray, memoryview]
+
 # Platform detection
 PLATFORM_MAP = {
     'Windows': 'windows',
@@ -25,12 +36,256 @@ LIBRARY_EXTENSIONS = {
     'macos': '.dylib'
 }
 
+# ISA variants produced by `build_native.py --fat`, best first, with the
+# /proc/cpuinfo flags each one requires (used when the CPU cannot be
+# probed through crypto_core_cpu_level)
+_X86_64_V2 = {'cx16', 'lahf_lm', 'popcnt', 'sse4_1', 'sse4_2', 'ssse3'}
+_X86_64_V3 = _X86_64_V2 | {'avx', 'avx2', 'bmi1', 'bmi2', 'f16c', 'fma', 'abm', 'movbe', 'xsave'}
+_X86_64_V4 = _X86_64_V3 | {'avx512f', 'avx512bw', 'avx512cd', 'avx512dq', 'avx512vl'}
+
+ISA_VARIANTS = {
+    'x86_64': [
+        ('avx512', _X86_64_V4 | {'aes', 'pclmulqdq', 'vaes', 'vpclmulqdq', 'sha_ni'}),
+        ('avx2', _X86_64_V3 | {'aes', 'pclmulqdq'}),
+        ('generic', _X86_64_V2),
+    ],
+    'aarch64': [
+        ('crypto', {'aes', 'pmull', 'sha1', 'sha2', 'sha3'}),
+        ('generic', set()),
+    ],
+}
+
+def _get_cpu_flags() -> Optional[set]:
+    """Get CPU feature flags, or None if they cannot be determined."""
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            for line in cpuinfo:
+                key, _, value = line.partition(':')
+                if key.strip() in ('flags', 'Features'):
+                    return set(value.split())
+    except OSError:
+        pass
+    return None
+
+@lru_cache(maxsize=None)
+def _get_cpu_level() -> Optional[int]:
+    """
+    Get crypto_core_cpu_level() from the generic variant library.
+    
+    The function checks CPUID (x86) or the OS feature flags (ARM) and
+    returns how many variants above 'generic' the CPU runs, or -1 if it
+    does not even meet the baseline. Returns None without a generic
+    library to probe with.
+    """
+    path = (_find_libs_path() / _PLATFORM /
+            f"libcrypto_core.generic{LIBRARY_EXTENSIONS[_PLATFORM]}")
+    if not path.exists():
+        return None
+    
+    try:
+        probe = ctypes.CDLL(str(path)).crypto_core_cpu_level
+    except (OSError, AttributeError):
+        return None
+    probe.argtypes = []
+    probe.restype = ctypes.c_int
+    return probe()
+
+def _select_isa_variants() -> list:
+    """
+    Get the ISA variant names usable on this CPU, best first.
+    
+    FASTCRYPTER_ISA forces a specific variant ('none' for the plain
+    library). The CPU is probed through
+    crypto_core_cpu_level() in the generic library, falling back to the
+    /proc/cpuinfo flags; when neither is available only the baseline
+    'generic' variant is used.
+    """
+    forced = os.environ.get('FASTCRYPTER_ISA')
+    if forced:
+        return [] if forced == 'none' else [forced]
+    
+    machine = platform.machine().lower()
+    machine = {'amd64': 'x86_64', 'arm64': 'aarch64'}.get(machine, machine)
+    variants = ISA_VARIANTS.get(machine, [])
+    
+    cpu_level = _get_cpu_level() if variants else None
+    if cpu_level is not None:
+        return [name for name, _ in variants[len(variants) - 1 - cpu_level:]]
+    
+    cpu_flags = _get_cpu_flags()
+    if cpu_flags is None:
+        return [name for name, _ in variants if name == 'generic']
+    
+    return [name for name, required in variants if required <= cpu_flags]
+
+
+# Platform probes are process-wide, so they run once rather than for
+# every NativeLibraryManager
+_PLATFORM = PLATFORM_MAP.get(platform.system(), 'linux')
+
+
+@lru_cache(maxsize=None)
+def _find_libs_path() -> Path:
+    """Find the native libraries directory."""
+    # Try different possible locations
+    current_dir = Path(__file__).parent
+    possible_paths = [
+        current_dir / 'libs',
+        current_dir.parent / 'libs',
+        current_dir.parent.parent / 'libs',
+    ]
+    
+    for path in possible_paths:
+        if path.exists():
+            return path
+    
+    # Create default path
+    default_path = current_dir / 'libs'
+    default_path.mkdir(exist_ok=True)
+    return default_path
+
+
+@lru_cache(maxsize=None)
+def _resolve_library_path(lib_name: str) -> Tuple[str, Optional[str]]:
+    """Find a library's path and ISA variant (None for the plain build)."""
+    platform_dir = _find_libs_path() / _PLATFORM
+    extension = LIBRARY_EXTENSIONS[_PLATFORM]
+    
+    for variant in _select_isa_variants():
+        variant_path = platform_dir / f"lib{lib_name}.{variant}{extension}"
+        if variant_path.exists():
+            return str(variant_path), variant
+    
+    return str(platform_dir / f"lib{lib_name}{extension}"), None
+
+
+# Native compression modes: name -> (compress method, decompress method)
+COMPRESSION_MODES = {
+    'rle': ('fast_compress_rle', 'fast_decompress_rle'),
+    'ewah': ('fast_compress_ewah', 'fast_decompress_ewah'),
+}
+
+
 class NativeLibraryError(Exception):
     """Exception raised when native library operations fail."""
     pass
 
+# Outputs up to this size are written to a per-thread scratch buffer
+_SCRATCH_LIMIT = 64 * 1024
+_scratch = threading.local()
+
+# secure_random_bytes serves requests below _RANDOM_DIRECT_LIMIT from a
+# per-thread pool refilled by the native RNG, and larger ones straight
+# from os.urandom
+_RANDOM_POOL_SIZE = 64 * 1024
+_RANDOM_DIRECT_LIMIT = 4096
+_random_pool = threading.local()
+
+# Bumped in forked children so they never reuse the parent's pool bytes
+_fork_generation = 0
+
+def _after_fork_in_child():
+    global _fork_generation
+    _fork_generation += 1
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+@lru_cache(maxsize=128)
+def _u8_array(length: int):
+    """Get the (cached) ctypes array type c_uint8 * length."""
+    return ctypes.c_uint8 * length
+
+def _output_buffer(length: int):
+    """
+    Get a ctypes buffer of at least `length` bytes for native output.
+    
+    Small requests reuse a per-thread scratch array (capacity rounded up
+    to a power of two); the caller must copy the result out with
+    _output_bytes() before the next call on the same thread.
+    """
+    if length > _SCRATCH_LIMIT:
+        return _u8_array(length)()
+    
+    buffer = getattr(_scratch, 'buffer', None)
+    if buffer is None or len(buffer) < length:
+        buffer = _u8_array(1 << max(length - 1, 0).bit_length())()
+        _scratch.buffer = buffer
+        _scratch.view = memoryview(buffer)
+    return buffer
+
+def _output_bytes(buffer, length: int) -> bytes:
+    """Copy the first `length` bytes of an output buffer into bytes."""
+    if buffer is getattr(_scratch, 'buffer', None):
+        return _scratch.view[:length].tobytes()
+    return memoryview(buffer)[:length].tobytes()
+
+def _output_text(buffer, length: int) -> str:
+    """
+    Decode the first `length` bytes of an output buffer as text.
+    
+    Decodes straight from the buffer without an intermediate bytes copy.
+    Output is normally ASCII (the fastest codec); anything else falls back
+    to lenient UTF-8.
+    """
+    if buffer is getattr(_scratch, 'buffer', None):
+        view = _scratch.view[:length]
+    else:
+        view = memoryview(buffer).cast('B')[:length]
+    try:
+        return str(view, 'ascii')
+    except UnicodeDecodeError:
+        return str(view, 'utf-8', 'ignore')
+
+def _secret_bytes(buffer, length: int) -> bytes:
+    """
+    Like _output_bytes, then zero the buffer.
+    
+    Used for key material so it does not linger in the reused scratch
+    buffer (or in freed memory) after the call.
+    """
+    result = _output_bytes(buffer, length)
+    ctypes.memset(buffer, 0, length)
+    return result
+
+def _readable_buffer(data: BytesLike):
+    """
+    Get a c_void_p-compatible argument for read-only input.
+    
+    bytes are passed as-is: for a c_void_p argument ctypes hands C the
+    object's internal buffer, the same pointer PyBytes_AsString returns,
+    without the extra foreign call (~0.2 us) of calling that through
+    ctypes.pythonapi. Writable buffers (bytearray, writable
+    memoryview/mmap/numpy arrays) are wrapped in place. Only read-only
+    non-bytes buffers and non-contiguous views are copied. len() of the
+    result is the size in bytes. The data must stay alive and unchanged
+    for the native call.
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, bytearray):
+        return (ctypes.c_char * len(data)).from_buffer(data)
+    
+    view = memoryview(data)
+    if view.readonly or not view.c_contiguous:
+        return view.tobytes()
+    view = view.cast('B')
+    return (ctypes.c_char * len(view)).from_buffer(view)
+
+def _writable_buffer(data: Union[bytearray, memoryview]):
+    """Get a c_void_p-compatible argument for a writable buffer, without copying."""
+    try:
+        return (ctypes.c_char * len(data)).from_buffer(data)
+    except TypeError:
+        raise TypeError("Output buffer must be writable (e.g. a bytearray)") from None
+
 class CryptoCoreLib:
-    """Wrapper for crypto_core native library."""
+    """
+    Wrapper for crypto_core native library.
+    
+    Like HashAlgorithmsLib, calls release the GIL (ctypes.CDLL), read
+    their inputs in place and the functions are re-entrant.
+    """
     
     def __init__(self, lib_path: str):
         """Initialize the crypto core library."""
@@ -42,6 +297,10 @@ class CryptoCoreLib:
             init_result = self.lib.crypto_core_init()
             if init_result != 0:
                 raise NativeLibraryError(f"Failed to initialize crypto_core library: {init_result}")
+            
+            # Only the cleanup function is captured, so the wrapper itself
+            # can be collected normally; finalize also runs at exit
+            weakref.finalize(self, self.lib.crypto_core_cleanup)
                 
         except OSError as e:
             raise NativeLibraryError(f"Failed to load crypto_core library: {e}")
@@ -49,10 +308,17 @@ class CryptoCoreLib:
     def _setup_function_signatures(self):
         """Setup function signatures for type safety."""
         
+        # fast_xor(input, output, data_len, key, key_len)
+        self.lib.fast_xor.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
+        ]
+        self.lib.fast_xor.restype = None
+        
         # fast_xor_inplace(data, data_len, key, key_len)
         self.lib.fast_xor_inplace.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
         ]
         self.lib.fast_xor_inplace.restype = None
         
@@ -61,108 +327,351 @@ class CryptoCoreLib:
         self.lib.secure_memclear.restype = None
         
         # calculate_entropy(data, len) -> double
-        self.lib.calculate_entropy.argtypes = [ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t]
+        self.lib.calculate_entropy.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
         self.lib.calculate_entropy.restype = ctypes.c_double
         
         # secure_random_bytes(buffer, len) -> int
-        self.lib.secure_random_bytes.argtypes = [ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t]
+        self.lib.secure_random_bytes.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
         self.lib.secure_random_bytes.restype = ctypes.c_int
         
         # fast_key_derive(password, pwd_len, salt, salt_len, iterations, output, out_len)
         self.lib.fast_key_derive.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
             ctypes.c_uint32,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t
+            ctypes.c_void_p, ctypes.c_size_t
         ]
         self.lib.fast_key_derive.restype = None
         
         # base_convert_encode(input, input_len, output, output_max, charset, base) -> size_t
         self.lib.base_convert_encode.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
             ctypes.c_char_p, ctypes.c_size_t
         ]
         self.lib.base_convert_encode.restype = ctypes.c_size_t
         
         # fast_compress_rle(input, input_len, output, output_max) -> size_t
         self.lib.fast_compress_rle.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
         ]
         self.lib.fast_compress_rle.restype = ctypes.c_size_t
         
         # fast_decompress_rle(input, input_len, output, output_max) -> size_t
         self.lib.fast_decompress_rle.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
         ]
         self.lib.fast_decompress_rle.restype = ctypes.c_size_t
+        
+        # fast_rle_decoded_size(input, input_len) -> size_t
+        self.lib.fast_rle_decoded_size.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        self.lib.fast_rle_decoded_size.restype = ctypes.c_size_t
+        
+        # fast_compress_rle_swizzled(input, input_len, stride, output, output_max) -> size_t
+        self.lib.fast_compress_rle_swizzled.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
+        ]
+        self.lib.fast_compress_rle_swizzled.restype = ctypes.c_size_t
+        
+        # fast_rle_swizzled_decoded_size(input, input_len) -> size_t
+        self.lib.fast_rle_swizzled_decoded_size.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        self.lib.fast_rle_swizzled_decoded_size.restype = ctypes.c_size_t
+        
+        # fast_decompress_rle_swizzled(input, input_len, output, output_max) -> size_t
+        self.lib.fast_decompress_rle_swizzled.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
+        ]
+        self.lib.fast_decompress_rle_swizzled.restype = ctypes.c_size_t
+        
+        # fast_compress_ewah(input, input_len, output, output_max) -> size_t
+        self.lib.fast_compress_ewah.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
+        ]
+        self.lib.fast_compress_ewah.restype = ctypes.c_size_t
+        
+        # fast_decompress_ewah(input, input_len, output, output_max) -> size_t
+        self.lib.fast_decompress_ewah.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
+        ]
+        self.lib.fast_decompress_ewah.restype = ctypes.c_size_t
+        
+        # fast_aes_ctr(key, key_len, iv, input, output, len) -> int
+        self.lib.fast_aes_ctr.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t
+        ]
+        self.lib.fast_aes_ctr.restype = ctypes.c_int
+        
+        # fast_aes_hw_available() -> int
+        self.lib.fast_aes_hw_available.argtypes = []
+        self.lib.fast_aes_hw_available.restype = ctypes.c_int
+        
+        # crypto_pipeline_encrypted_size_max(input_len) -> size_t
+        self.lib.crypto_pipeline_encrypted_size_max.argtypes = [ctypes.c_size_t]
+        self.lib.crypto_pipeline_encrypted_size_max.restype = ctypes.c_size_t
+        
+        # crypto_pipeline_encrypt(input, input_len, key, key_len, iv, output, output_max, mode) -> size_t
+        self.lib.crypto_pipeline_encrypt.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int
+        ]
+        self.lib.crypto_pipeline_encrypt.restype = ctypes.c_size_t
+        
+        # crypto_pipeline_decrypted_size(input, input_len, key, key_len, iv) -> size_t
+        self.lib.crypto_pipeline_decrypted_size.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p
+        ]
+        self.lib.crypto_pipeline_decrypted_size.restype = ctypes.c_size_t
+        
+        # crypto_pipeline_decrypt(input, input_len, key, key_len, iv, output, output_max) -> size_t
+        self.lib.crypto_pipeline_decrypt.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.c_size_t
+        ]
+        self.lib.crypto_pipeline_decrypt.restype = ctypes.c_size_t
     
     def fast_xor(self, data: bytes, key: bytes) -> bytes:
         """Perform fast XOR operation."""
         if not data or not key:
             return data
         
-        # Create mutable copy
-        result = bytearray(data)
-        data_ptr = (ctypes.c_uint8 * len(result)).from_buffer(result)
-        key_ptr = (ctypes.c_uint8 * len(key)).from_buffer_copy(key)
-        
-        self.lib.fast_xor_inplace(data_ptr, len(result), key_ptr, len(key))
+        result = bytearray(len(data))
+        self.fast_xor_into(result, data, key)
         return bytes(result)
     
-    def calculate_entropy(self, data: bytes) -> float:
-        """Calculate Shannon entropy of data."""
+    def fast_xor_into(self, out: Union[bytearray, memoryview], data: BytesLike,
+                      key: BytesLike) -> Union[bytearray, memoryview]:
+        """
+        XOR data with a repeating key into a preallocated buffer.
+        
+        Neither operand is copied, so streaming callers can reuse one output
+        buffer across calls. out may be the same bytearray as data.
+        
+        Args:
+            out: Writable buffer of at least len(data) bytes.
+            data: Input data.
+            key: XOR key.
+            
+        Returns:
+            The out buffer.
+        """
+        if len(out) < len(data):
+            raise ValueError("Output buffer is smaller than the input data")
+        if not data or not key:
+            out[:len(data)] = data
+            return out
+        
+        data_buffer = _readable_buffer(data)
+        key_buffer = _readable_buffer(key)
+        self.lib.fast_xor(data_buffer, _writable_buffer(out), len(data_buffer),
+                          key_buffer, len(key_buffer))
+        return out
+    
+    def aes_ctr(self, key: bytes, iv: bytes, data: BytesLike) -> bytes:
+        """
+        Encrypt or decrypt data with AES-CTR.
+        
+        Uses AES-NI when the CPU supports it (see aes_hardware_available)
+        and portable C otherwise. The output matches the cryptography
+        package's AES CTR mode: the IV is the initial 128-bit big-endian
+        counter block. CTR provides no integrity; authenticate the result
+        separately.
+        
+        Args:
+            key: 16, 24 or 32-byte AES key.
+            iv: 16-byte initial counter block; never reuse one with a key.
+            data: Plaintext or ciphertext.
+        """
+        if len(key) not in (16, 24, 32):
+            raise ValueError("AES key must be 16, 24 or 32 bytes")
+        if len(iv) != 16:
+            raise ValueError("AES-CTR IV must be 16 bytes")
         if not data:
+            return b''
+        
+        data_buffer = _readable_buffer(data)
+        result = bytearray(len(data_buffer))
+        if self.lib.fast_aes_ctr(_readable_buffer(key), len(key), _readable_buffer(iv),
+                                 data_buffer, _writable_buffer(result), len(result)) != 0:
+            raise NativeLibraryError("AES-CTR failed")
+        return bytes(result)
+    
+    def pipeline_encrypt(self, data: BytesLike, key: bytes, iv: bytes, compress: bool = True) -> bytes:
+        """
+        RLE-compress and AES-CTR encrypt data in one native pass.
+        
+        Data is processed in 4 KiB blocks that stay in cache between the
+        two stages, instead of materializing the whole compressed stream
+        and then encrypting it. Like aes_ctr this provides no integrity:
+        authenticate the result (e.g. HMAC) before passing it to
+        pipeline_decrypt.
+        
+        Args:
+            data: Data to encrypt.
+            key: 16, 24 or 32-byte AES key.
+            iv: 16-byte initial counter block; never reuse one with a key.
+            compress: RLE-compress blocks where that makes them smaller.
+        """
+        if len(key) not in (16, 24, 32):
+            raise ValueError("AES key must be 16, 24 or 32 bytes")
+        if len(iv) != 16:
+            raise ValueError("AES-CTR IV must be 16 bytes")
+        
+        data_buffer = _readable_buffer(data)
+        output_max = self.lib.crypto_pipeline_encrypted_size_max(len(data_buffer))
+        output = _output_buffer(output_max)
+        
+        result_len = self.lib.crypto_pipeline_encrypt(
+            data_buffer, len(data_buffer),
+            _readable_buffer(key), len(key), _readable_buffer(iv),
+            output, output_max, 1 if compress else 0
+        )
+        if result_len == 0:
+            raise NativeLibraryError("Pipeline encryption failed")
+        
+        return _output_bytes(output, result_len)
+    
+    def pipeline_decrypt(self, data: BytesLike, key: bytes, iv: bytes) -> bytes:
+        """Reverse pipeline_encrypt (decrypt and decompress in one pass)."""
+        if len(key) not in (16, 24, 32):
+            raise ValueError("AES key must be 16, 24 or 32 bytes")
+        if len(iv) != 16:
+            raise ValueError("AES-CTR IV must be 16 bytes")
+        
+        data_buffer = _readable_buffer(data)
+        key_buffer = _readable_buffer(key)
+        iv_buffer = _readable_buffer(iv)
+        invalid = ctypes.c_size_t(-1).value
+        
+        output_max = self.lib.crypto_pipeline_decrypted_size(
+            data_buffer, len(data_buffer), key_buffer, len(key), iv_buffer)
+        # A wrong key yields a garbage length; no valid stream is smaller than its content
+        if output_max == invalid or output_max > len(data_buffer) * 255:
+            raise NativeLibraryError("Pipeline decryption failed")
+        output = _output_buffer(output_max)
+        
+        result_len = self.lib.crypto_pipeline_decrypt(
+            data_buffer, len(data_buffer), key_buffer, len(key), iv_buffer,
+            output, output_max
+        )
+        if result_len == invalid:
+            raise NativeLibraryError("Pipeline decryption failed")
+        
+        return _output_bytes(output, result_len)
+    
+    def aes_hardware_available(self) -> bool:
+        """Check whether aes_ctr runs on AES-NI on this CPU."""
+        return bool(self.lib.fast_aes_hw_available())
+    
+    def secure_memclear(self, buffer: Union[bytearray, memoryview]) -> None:
+        """Zero a writable buffer (e.g. a bytearray holding a key) in place."""
+        buffer = _writable_buffer(buffer)
+        self.lib.secure_memclear(buffer, len(buffer))
+    
+    def calculate_entropy(self, data: BytesLike) -> float:
+        """Calculate Shannon entropy of data (read in place, see _readable_buffer)."""
+        data_buffer = _readable_buffer(data)
+        if not data_buffer:
             return 0.0
         
-        data_ptr = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
-        return self.lib.calculate_entropy(data_ptr, len(data))
+        return self.lib.calculate_entropy(data_buffer, len(data_buffer))
     
     def secure_random_bytes(self, length: int) -> bytes:
-        """Generate cryptographically secure random bytes."""
+        """
+        Generate cryptographically secure random bytes.
+        
+        Small requests are sliced from a per-thread 64 KiB pool filled by
+        the native RNG, so they cost no system call; served bytes are
+        wiped from the pool and the pool is discarded in forked children.
+        Requests of 4 KiB or more go straight to os.urandom.
+        """
         if length <= 0:
             return b''
+        if length >= _RANDOM_DIRECT_LIMIT:
+            return os.urandom(length)
         
-        buffer = (ctypes.c_uint8 * length)()
-        result = self.lib.secure_random_bytes(buffer, length)
+        pool = _random_pool
+        if getattr(pool, 'generation', None) != _fork_generation:
+            pool.buffer = _u8_array(_RANDOM_POOL_SIZE)()
+            pool.address = ctypes.addressof(pool.buffer)
+            pool.view = memoryview(pool.buffer)
+            pool.position = _RANDOM_POOL_SIZE
+            pool.generation = _fork_generation
         
-        if result != 0:
-            raise NativeLibraryError("Failed to generate secure random bytes")
+        position = pool.position
+        if position + length > _RANDOM_POOL_SIZE:
+            if self.lib.secure_random_bytes(pool.buffer, _RANDOM_POOL_SIZE) != 0:
+                raise NativeLibraryError("Failed to generate secure random bytes")
+            position = 0
         
-        return bytes(buffer)
+        result = pool.view[position:position + length].tobytes()
+        ctypes.memset(pool.address + position, 0, length)
+        pool.position = position + length
+        return result
+    
+    def secure_random_bytes_into(self, out: Union[bytearray, memoryview]) -> int:
+        """Fill a writable buffer with secure random bytes; returns len(out)."""
+        out_buffer = _writable_buffer(out)
+        if len(out_buffer) and self.lib.secure_random_bytes(out_buffer, len(out_buffer)) != 0:
+            raise NativeLibraryError("Failed to generate secure random bytes")
+        return len(out_buffer)
     
     def fast_key_derive(self, password: bytes, salt: bytes, iterations: int, output_length: int) -> bytes:
         """Fast key derivation function."""
         if not password or not salt or iterations <= 0 or output_length <= 0:
             raise ValueError("Invalid parameters for key derivation")
         
-        password_ptr = (ctypes.c_uint8 * len(password)).from_buffer_copy(password)
-        salt_ptr = (ctypes.c_uint8 * len(salt)).from_buffer_copy(salt)
-        output = (ctypes.c_uint8 * output_length)()
+        password_ptr = _readable_buffer(password)
+        salt_ptr = _readable_buffer(salt)
+        output = _output_buffer(output_length)
         
         self.lib.fast_key_derive(
-            password_ptr, len(password),
-            salt_ptr, len(salt),
+            password_ptr, len(password_ptr),
+            salt_ptr, len(salt_ptr),
             iterations,
             output, output_length
         )
         
-        return bytes(output)
+        return _secret_bytes(output, output_length)
+    
+    def fast_key_derive_into(self, password: BytesLike, salt: BytesLike, iterations: int,
+                             out: Union[bytearray, memoryview]) -> int:
+        """Derive len(out) key bytes into a writable buffer; returns len(out)."""
+        out_buffer = _writable_buffer(out)
+        if not password or not salt or iterations <= 0 or not out_buffer:
+            raise ValueError("Invalid parameters for key derivation")
+        
+        password_ptr = _readable_buffer(password)
+        salt_ptr = _readable_buffer(salt)
+        self.lib.fast_key_derive(
+            password_ptr, len(password_ptr),
+            salt_ptr, len(salt_ptr),
+            iterations,
+            out_buffer, len(out_buffer)
+        )
+        return len(out_buffer)
     
     def base_convert_encode(self, data: bytes, charset: str) -> str:
         """Convert binary data to custom character set."""
         if not data or not charset:
             return ""
         
-        data_ptr = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
-        output_max = len(data) * 2 + 10  # Conservative estimate
-        output = (ctypes.c_uint8 * output_max)()
+        data_ptr = _readable_buffer(data)
+        output_max = len(data_ptr) * 2 + 10  # Conservative estimate
+        output = _output_buffer(output_max)
         charset_bytes = charset.encode('utf-8')
         
         result_len = self.lib.base_convert_encode(
-            data_ptr, len(data),
+            data_ptr, len(data_ptr),
             output, output_max,
             charset_bytes, len(charset)
         )
@@ -170,50 +679,156 @@ class CryptoCoreLib:
         if result_len == 0:
             return ""
         
-        return bytes(output[:result_len]).decode('utf-8', errors='ignore')
+        return _output_text(output, result_len)
     
-    def fast_compress_rle(self, data: bytes) -> bytes:
-        """Fast RLE compression."""
+    def fast_compress_rle(self, data: bytes, stride: int = 1) -> bytes:
+        """
+        Fast RLE compression.
+        
+        Args:
+            data: Data to compress.
+            stride: Number of interleaved components per element (e.g. 4 for
+                RGBA pixels). With stride > 1 each component is compressed as
+                a separate stream, which finds runs in structured data that a
+                plain byte stream does not have. Use the same stride to
+                decompress.
+        """
         if not data:
             return b''
+        if not 1 <= stride <= 255:
+            raise ValueError("RLE stride must be between 1 and 255")
         
-        data_ptr = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
-        output_max = len(data) + len(data) // 2  # Conservative estimate
-        output = (ctypes.c_uint8 * output_max)()
-        
-        result_len = self.lib.fast_compress_rle(data_ptr, len(data), output, output_max)
+        data_ptr = _readable_buffer(data)
+        if stride == 1:
+            output_max = len(data_ptr) * 3  # Worst case: every byte is a 0xFF marker
+            output = _output_buffer(output_max)
+            result_len = self.lib.fast_compress_rle(data_ptr, len(data_ptr), output, output_max)
+        else:
+            output_max = len(data_ptr) * 3 + 9 + 4 * stride
+            output = _output_buffer(output_max)
+            result_len = self.lib.fast_compress_rle_swizzled(data_ptr, len(data_ptr), stride,
+                                                             output, output_max)
         
         if result_len == 0:
             return data  # Return original if compression failed
         
-        return bytes(output[:result_len])
+        return _output_bytes(output, result_len)
+    
+    def fast_compress_rle_into(self, data: BytesLike, out: Union[bytearray, memoryview]) -> int:
+        """
+        RLE-compress data into a writable buffer.
+        
+        Returns:
+            int: Number of bytes written. 3 * len(data) bytes always suffice.
+            
+        Raises:
+            ValueError: If out is too small for the compressed data.
+        """
+        data_ptr = _readable_buffer(data)
+        if not data_ptr:
+            return 0
+        
+        out_buffer = _writable_buffer(out)
+        result_len = self.lib.fast_compress_rle(data_ptr, len(data_ptr), out_buffer, len(out_buffer))
+        if result_len == 0:
+            raise ValueError("Output buffer is too small for the compressed data")
+        return result_len
     
-    def fast_decompress_rle(self, data: bytes) -> bytes:
-        """Fast RLE decompression."""
+    def fast_decompress_rle(self, data: bytes, stride: int = 1) -> bytes:
+        """Fast RLE decompression of data produced by fast_compress_rle."""
         if not data:
             return b''
         
-        data_ptr = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
-        output_max = len(data) * 4  # Conservative estimate
-        output = (ctypes.c_uint8 * output_max)()
+        data_ptr = _readable_buffer(data)
+        if stride == 1:
+            output_max = self.lib.fast_rle_decoded_size(data_ptr, len(data_ptr))
+            decompress = self.lib.fast_decompress_rle
+        else:
+            output_max = self.lib.fast_rle_swizzled_decoded_size(data_ptr, len(data_ptr))
+            decompress = self.lib.fast_decompress_rle_swizzled
+        output = _output_buffer(output_max)
         
-        result_len = self.lib.fast_decompress_rle(data_ptr, len(data), output, output_max)
+        result_len = decompress(data_ptr, len(data_ptr), output, output_max)
         
         if result_len == 0:
             raise NativeLibraryError("RLE decompression failed")
         
-        return bytes(output[:result_len])
+        return _output_bytes(output, result_len)
+    
+    def fast_compress_ewah(self, data: bytes) -> bytes:
+        """
+        EWAH (word-aligned hybrid) compression.
+        
+        Compresses runs of 0x00000000/0xFFFFFFFF words and copies everything
+        else verbatim, so unlike RLE it never grows incompressible input by
+        more than one word per 32767 words plus an 8-byte header.
+        """
+        if not data:
+            return b''
+        
+        data_ptr = _readable_buffer(data)
+        words = (len(data_ptr) + 3) // 4
+        output_max = 8 + words * 4 + (words // 0x7FFF + 1) * 4
+        output = _output_buffer(output_max)
+        
+        result_len = self.lib.fast_compress_ewah(data_ptr, len(data_ptr), output, output_max)
+        
+        if result_len == 0:
+            raise NativeLibraryError("EWAH compression failed")
+        
+        return _output_bytes(output, result_len)
+    
+    def fast_decompress_ewah(self, data: bytes) -> bytes:
+        """EWAH decompression of data produced by fast_compress_ewah."""
+        if not data:
+            return b''
+        if len(data) < 8:
+            raise NativeLibraryError("EWAH decompression failed")
+        
+        data_ptr = _readable_buffer(data)
+        output_max = int.from_bytes(data[:8], 'little')
+        output = _output_buffer(output_max)
+        
+        result_len = self.lib.fast_decompress_ewah(data_ptr, len(data_ptr), output, output_max)
+        
+        if result_len == 0:
+            raise NativeLibraryError("EWAH decompression failed")
+        
+        return _output_bytes(output, result_len)
     
-    def __del__(self):
-        """Cleanup library resources."""
-        if hasattr(self, 'lib'):
-            try:
-                self.lib.crypto_core_cleanup()
-            except:
-                pass
+    def fast_compress(self, data: bytes, mode: str = 'rle') -> bytes:
+        """
+        Compress with the native codec selected by mode.
+        
+        Args:
+            data: Data to compress.
+            mode: 'rle' for byte runs or 'ewah' for word-aligned runs with
+                bounded expansion (better suited to key material and other
+                mostly incompressible data).
+        """
+        if mode not in COMPRESSION_MODES:
+            raise ValueError(f"Unknown native compression mode: {mode}")
+        return getattr(self, COMPRESSION_MODES[mode][0])(data)
+    
+    def fast_decompress(self, data: bytes, mode: str = 'rle') -> bytes:
+        """Decompress data produced by fast_compress with the same mode."""
+        if mode not in COMPRESSION_MODES:
+            raise ValueError(f"Unknown native compression mode: {mode}")
+        return getattr(self, COMPRESSION_MODES[mode][1])(data)
 
 class HashAlgorithmsLib:
-    """Wrapper for hash_algorithms native library."""
+    """
+    Wrapper for hash_algorithms native library.
+    
+    The library is loaded with ctypes.CDLL, which releases the GIL for the
+    duration of every foreign call, and keeps no mutable global state, so
+    long calls such as fast_pbkdf2 can run concurrently from several
+    Python threads.
+    
+    Inputs may be any C-contiguous buffer (bytes, bytearray, memoryview,
+    mmap, numpy arrays) and are read in place rather than copied into
+    ctypes arrays; see _readable_buffer.
+    """
     
     def __init__(self, lib_path: str):
         """Initialize the hash algorithms library."""
@@ -225,6 +840,10 @@ class HashAlgorithmsLib:
             init_result = self.lib.hash_algorithms_init()
             if init_result != 0:
                 raise NativeLibraryError(f"Failed to initialize hash_algorithms library: {init_result}")
+            
+            # Only the cleanup function is captured, so the wrapper itself
+            # can be collected normally; finalize also runs at exit
+            weakref.finalize(self, self.lib.hash_algorithms_cleanup)
                 
         except OSError as e:
             raise NativeLibraryError(f"Failed to load hash_algorithms library: {e}")
@@ -234,200 +853,503 @@ class HashAlgorithmsLib:
         
         # fast_sha256(data, len, hash)
         self.lib.fast_sha256.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8)
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p
         ]
         self.lib.fast_sha256.restype = None
         
+        # fast_sha256_many(data, offsets, n, hashes)
+        self.lib.fast_sha256_many.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p
+        ]
+        self.lib.fast_sha256_many.restype = None
+        
         # fast_hmac_sha256(key, key_len, data, data_len, hmac)
         self.lib.fast_hmac_sha256.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8)
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p
         ]
         self.lib.fast_hmac_sha256.restype = None
         
         # generate_keypair(private_key, public_key)
         self.lib.generate_keypair.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8),
-            ctypes.POINTER(ctypes.c_uint8)
+            ctypes.c_void_p,
+            ctypes.c_void_p
         ]
         self.lib.generate_keypair.restype = None
         
         # fast_sign(private_key, message, msg_len, signature)
         self.lib.fast_sign.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8),
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8)
+            ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p
         ]
         self.lib.fast_sign.restype = None
         
         # fast_verify(public_key, message, msg_len, signature) -> int
         self.lib.fast_verify.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8),
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8)
+            ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p
         ]
         self.lib.fast_verify.restype = ctypes.c_int
         
         # fast_pbkdf2(password, pwd_len, salt, salt_len, iterations, output, out_len)
         self.lib.fast_pbkdf2.argtypes = [
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
             ctypes.c_uint32,
-            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t
+            ctypes.c_void_p, ctypes.c_size_t
         ]
         self.lib.fast_pbkdf2.restype = None
         
+        # fast_pbkdf2_block(password, pwd_len, salt, salt_len, iterations, block_index, out32)
+        self.lib.fast_pbkdf2_block.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.c_uint32, ctypes.c_uint32,
+            ctypes.c_void_p
+        ]
+        self.lib.fast_pbkdf2_block.restype = None
+        
         # benchmark_hash_performance(data_size, iterations) -> double
         self.lib.benchmark_hash_performance.argtypes = [ctypes.c_size_t, ctypes.c_uint32]
         self.lib.benchmark_hash_performance.restype = ctypes.c_double
+        
+        # benchmark_hash_loop(data, data_len, iterations) -> double
+        self.lib.benchmark_hash_loop.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint32]
+        self.lib.benchmark_hash_loop.restype = ctypes.c_double
     
-    def fast_sha256(self, data: bytes) -> bytes:
+    def fast_sha256(self, data: BytesLike) -> bytes:
         """Fast SHA-256 hash."""
         if not data:
             return b'\x00' * 32
         
-        data_ptr = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
-        hash_output = (ctypes.c_uint8 * 32)()
+        data_ptr = _readable_buffer(data)
+        hash_output = _output_buffer(32)
+        
+        self.lib.fast_sha256(data_ptr, len(data_ptr), hash_output)
+        return _output_bytes(hash_output, 32)
+    
+    def fast_sha256_into(self, data: BytesLike, out: Union[bytearray, memoryview]) -> int:
+        """
+        SHA-256 into a preallocated buffer.
+        
+        Loops hashing many values can allocate one 32-byte bytearray and
+        pass it on every call. Unlike fast_sha256, empty input gets its
+        real digest.
+        
+        Args:
+            data: Data to hash.
+            out: Writable buffer of at least 32 bytes.
+            
+        Returns:
+            int: Number of bytes written (32).
+        """
+        if len(out) < 32:
+            raise ValueError("Output buffer must be at least 32 bytes")
         
-        self.lib.fast_sha256(data_ptr, len(data), hash_output)
-        return bytes(hash_output)
+        data_ptr = _readable_buffer(data)
+        self.lib.fast_sha256(data_ptr, len(data_ptr), _writable_buffer(out))
+        return 32
     
-    def fast_hmac_sha256(self, key: bytes, data: bytes) -> bytes:
+    def fast_sha256_many(self, messages: Iterable[bytes]) -> List[bytes]:
+        """
+        SHA-256 of many messages with a single native call.
+        
+        The messages are packed into one buffer with an offsets table, so
+        the ctypes call overhead is paid once per batch instead of once
+        per message. Unlike fast_sha256, empty messages get their real
+        digest.
+        
+        Args:
+            messages: Messages to hash.
+            
+        Returns:
+            List[bytes]: 32-byte digests, in input order.
+        """
+        messages = list(messages)
+        count = len(messages)
+        if count == 0:
+            return []
+        
+        offsets = array('Q', [0])
+        total = 0
+        for message in messages:
+            total += len(message)
+            offsets.append(total)
+        
+        data = b''.join(messages)
+        hashes = _output_buffer(32 * count)
+        
+        # data is a fresh bytes object; ctypes passes its buffer directly
+        self.lib.fast_sha256_many(data, offsets.buffer_info()[0], count, hashes)
+        
+        digests = _output_bytes(hashes, 32 * count)
+        return [digests[i:i + 32] for i in range(0, 32 * count, 32)]
+    
+    def fast_hmac_sha256(self, key: BytesLike, data: BytesLike) -> bytes:
         """Fast HMAC-SHA256."""
         if not key or not data:
             return b'\x00' * 32
         
-        key_ptr = (ctypes.c_uint8 * len(key)).from_buffer_copy(key)
-        data_ptr = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
-        hmac_output = (ctypes.c_uint8 * 32)()
+        key_ptr = _readable_buffer(key)
+        data_ptr = _readable_buffer(data)
+        hmac_output = _output_buffer(32)
+        
+        self.lib.fast_hmac_sha256(key_ptr, len(key_ptr), data_ptr, len(data_ptr), hmac_output)
+        return _secret_bytes(hmac_output, 32)
+    
+    def fast_hmac_sha256_into(self, key: BytesLike, data: BytesLike,
+                              out: Union[bytearray, memoryview]) -> int:
+        """HMAC-SHA256 into a writable buffer of at least 32 bytes; returns 32."""
+        if len(out) < 32:
+            raise ValueError("Output buffer must be at least 32 bytes")
         
-        self.lib.fast_hmac_sha256(key_ptr, len(key), data_ptr, len(data), hmac_output)
-        return bytes(hmac_output)
+        key_ptr = _readable_buffer(key)
+        data_ptr = _readable_buffer(data)
+        self.lib.fast_hmac_sha256(key_ptr, len(key_ptr), data_ptr, len(data_ptr),
+                                  _writable_buffer(out))
+        return 32
     
     def generate_keypair(self) -> Tuple[bytes, bytes]:
         """Generate ECC keypair."""
-        private_key = (ctypes.c_uint8 * 32)()
-        public_key = (ctypes.c_uint8 * 64)()
+        private_key = _u8_array(32)()
+        public_key = _u8_array(64)()
         
         self.lib.generate_keypair(private_key, public_key)
-        return bytes(private_key), bytes(public_key)
+        return _secret_bytes(private_key, 32), bytes(public_key)
     
-    def fast_sign(self, private_key: bytes, message: bytes) -> bytes:
+    def key_arena(self, slots: int) -> 'KeyArena':
+        """Allocate a KeyArena of `slots` keypair/signature slots."""
+        return KeyArena(self.lib, slots)
+    
+    def fast_sign(self, private_key: BytesLike, message: BytesLike) -> bytes:
         """Fast digital signature."""
         if len(private_key) != 32:
             raise ValueError("Private key must be 32 bytes")
         
-        private_key_ptr = (ctypes.c_uint8 * 32).from_buffer_copy(private_key)
-        message_ptr = (ctypes.c_uint8 * len(message)).from_buffer_copy(message)
-        signature = (ctypes.c_uint8 * 64)()
+        private_key_ptr = _readable_buffer(private_key)
+        message_ptr = _readable_buffer(message)
+        signature = _output_buffer(64)
         
-        self.lib.fast_sign(private_key_ptr, message_ptr, len(message), signature)
-        return bytes(signature)
+        self.lib.fast_sign(private_key_ptr, message_ptr, len(message_ptr), signature)
+        return _output_bytes(signature, 64)
     
-    def fast_verify(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+    def fast_verify(self, public_key: BytesLike, message: BytesLike, signature: BytesLike) -> bool:
         """Fast signature verification."""
         if len(public_key) != 64 or len(signature) != 64:
             return False
         
-        public_key_ptr = (ctypes.c_uint8 * 64).from_buffer_copy(public_key)
-        message_ptr = (ctypes.c_uint8 * len(message)).from_buffer_copy(message)
-        signature_ptr = (ctypes.c_uint8 * 64).from_buffer_copy(signature)
+        public_key_ptr = _readable_buffer(public_key)
+        message_ptr = _readable_buffer(message)
+        signature_ptr = _readable_buffer(signature)
         
-        result = self.lib.fast_verify(public_key_ptr, message_ptr, len(message), signature_ptr)
+        result = self.lib.fast_verify(public_key_ptr, message_ptr, len(message_ptr), signature_ptr)
         return result == 1
     
     def fast_pbkdf2(self, password: bytes, salt: bytes, iterations: int, output_length: int) -> bytes:
-        """Fast PBKDF2 key derivation."""
+        """
+        Fast PBKDF2-HMAC-SHA256 key derivation.
+        
+        The GIL is released while the native code runs, so other threads
+        keep running and separate derivations can proceed in parallel.
+        """
         if not password or not salt or iterations <= 0 or output_length <= 0:
             raise ValueError("Invalid parameters for PBKDF2")
         
-        password_ptr = (ctypes.c_uint8 * len(password)).from_buffer_copy(password)
-        salt_ptr = (ctypes.c_uint8 * len(salt)).from_buffer_copy(salt)
-        output = (ctypes.c_uint8 * output_length)()
+        password_ptr = _readable_buffer(password)
+        salt_ptr = _readable_buffer(salt)
+        output = _output_buffer(output_length)
         
         self.lib.fast_pbkdf2(
-            password_ptr, len(password),
-            salt_ptr, len(salt),
+            password_ptr, len(password_ptr),
+            salt_ptr, len(salt_ptr),
             iterations,
             output, output_length
         )
         
-        return bytes(output)
+        return _secret_bytes(output, output_length)
+    
+    def fast_pbkdf2_parallel(self, password: BytesLike, salt: BytesLike, iterations: int,
+                             output_length: int, max_workers: Optional[int] = None) -> bytes:
+        """
+        PBKDF2-HMAC-SHA256 with the 32-byte output blocks computed in parallel.
+        
+        Each block is an independent chain of `iterations` HMACs, so keys
+        longer than 32 bytes scale with cores up to one thread per block.
+        The result is identical to fast_pbkdf2.
+        
+        Args:
+            password: Password bytes.
+            salt: Salt bytes.
+            iterations: PBKDF2 iteration count.
+            output_length: Key length in bytes.
+            max_workers: Thread limit (default: CPU count).
+            
+        Returns:
+            bytes: Derived key.
+        """
+        if not password or not salt or iterations <= 0 or output_length <= 0:
+            raise ValueError("Invalid parameters for PBKDF2")
+        
+        blocks = (output_length + 31) // 32
+        workers = min(blocks, max_workers or os.cpu_count() or 1)
+        if workers == 1:
+            return self.fast_pbkdf2(password, salt, iterations, output_length)
+        
+        password_ptr = _readable_buffer(password)
+        salt_ptr = _readable_buffer(salt)
+        output = _u8_array(blocks * 32)()
+        
+        def derive_block(index: int) -> None:
+            self.lib.fast_pbkdf2_block(
+                password_ptr, len(password_ptr),
+                salt_ptr, len(salt_ptr),
+                iterations, index + 1,
+                ctypes.byref(output, index * 32)
+            )
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(derive_block, range(blocks)))
+        
+        # Wipe the whole buffer, including the unused tail of the last block
+        result = _output_bytes(output, output_length)
+        ctypes.memset(output, 0, blocks * 32)
+        return result
+    
+    def fast_pbkdf2_into(self, password: BytesLike, salt: BytesLike, iterations: int,
+                         out: Union[bytearray, memoryview]) -> int:
+        """PBKDF2-HMAC-SHA256 of len(out) bytes into a writable buffer; returns len(out)."""
+        out_buffer = _writable_buffer(out)
+        if not password or not salt or iterations <= 0 or not out_buffer:
+            raise ValueError("Invalid parameters for PBKDF2")
+        
+        password_ptr = _readable_buffer(password)
+        salt_ptr = _readable_buffer(salt)
+        self.lib.fast_pbkdf2(
+            password_ptr, len(password_ptr),
+            salt_ptr, len(salt_ptr),
+            iterations,
+            out_buffer, len(out_buffer)
+        )
+        return len(out_buffer)
     
     def benchmark_hash_performance(self, data_size: int = 1024, iterations: int = 1000) -> float:
-        """Benchmark hash performance."""
+        """Benchmark hash performance (runs without holding the GIL)."""
         return self.lib.benchmark_hash_performance(data_size, iterations)
     
-    def __del__(self):
-        """Cleanup library resources."""
-        if hasattr(self, 'lib'):
-            try:
-                self.lib.hash_algorithms_cleanup()
-            except:
-                pass
+    def benchmark_hash_loop(self, data: BytesLike, iterations: int = 1000,
+                            threads: Optional[int] = None) -> Dict[str, float]:
+        """
+        Compare a native SHA-256 loop with the same loop driven from Python.
+        
+        The native loop runs entirely in C. The Python-driven loops call
+        fast_sha256_into once per iteration, first on one thread and then
+        spread over a thread pool (the GIL is released during each call).
+        The difference between the native and single-threaded timings is
+        the per-call marshaling cost.
+        
+        Args:
+            data: Data to hash on every iteration.
+            iterations: Number of hashes per measurement.
+            threads: Worker threads for the parallel run (default: CPU count).
+            
+        Returns:
+            Dict[str, float]: Seconds for 'native', 'python' and 'threaded',
+            plus 'call_overhead', the extra seconds per Python-driven call.
+        """
+        if iterations <= 0:
+            raise ValueError("iterations must be positive")
+        threads = threads or os.cpu_count() or 1
+        
+        data_ptr = _readable_buffer(data)
+        native = self.lib.benchmark_hash_loop(data_ptr, len(data_ptr), iterations)
+        
+        out = bytearray(32)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            self.fast_sha256_into(data_ptr, out)
+        python = time.perf_counter() - start
+        
+        def hash_slice(count: int) -> None:
+            slice_out = bytearray(32)
+            for _ in range(count):
+                self.fast_sha256_into(data_ptr, slice_out)
+        
+        counts = [iterations // threads + (i < iterations % threads) for i in range(threads)]
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            list(executor.map(hash_slice, counts))
+            threaded = time.perf_counter() - start
+        
+        return {
+            'native': native,
+            'python': python,
+            'threaded': threaded,
+            'call_overhead': max(python - native, 0.0) / iterations,
+        }
+
+class KeyArena:
+    """
+    Preallocated slots for ECC keypairs and signatures.
+    
+    Each slot holds a 32-byte private key, a 64-byte public key and a
+    64-byte signature in one contiguous ctypes array. Scan loops that
+    generate, sign and verify many keys reuse the slots instead of
+    allocating small buffers on every call. Create one with
+    HashAlgorithmsLib.key_arena().
+    """
+    
+    PRIVATE_OFFSET = 0
+    PUBLIC_OFFSET = 32
+    SIGNATURE_OFFSET = 96
+    SLOT_SIZE = 160
+    
+    def __init__(self, lib: ctypes.CDLL, slots: int):
+        """Allocate `slots` zeroed slots."""
+        if slots <= 0:
+            raise ValueError("Key arena needs at least one slot")
+        
+        self.lib = lib
+        self.slots = slots
+        self._arena = _u8_array(slots * self.SLOT_SIZE)()
+        self._base = ctypes.addressof(self._arena)
+        self._view = memoryview(self._arena).cast('B')
+    
+    def _slot_address(self, slot: int) -> int:
+        """Get the address of a slot, checking its index."""
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"Key arena slot out of range: {slot}")
+        return self._base + slot * self.SLOT_SIZE
+    
+    def _field(self, slot: int, offset: int, size: int) -> memoryview:
+        """Get a view of one field of a slot."""
+        start = (self._slot_address(slot) - self._base) + offset
+        return self._view[start:start + size]
+    
+    def generate_keypair_into(self, slot: int) -> None:
+        """Generate a keypair into a slot."""
+        address = self._slot_address(slot)
+        self.lib.generate_keypair(address + self.PRIVATE_OFFSET, address + self.PUBLIC_OFFSET)
+    
+    def sign_into(self, slot: int, message: BytesLike) -> None:
+        """Sign a message with the slot's private key into its signature field."""
+        address = self._slot_address(slot)
+        message_ptr = _readable_buffer(message)
+        self.lib.fast_sign(address + self.PRIVATE_OFFSET, message_ptr, len(message_ptr),
+                           address + self.SIGNATURE_OFFSET)
+    
+    def verify_slot(self, slot: int, message: BytesLike) -> bool:
+        """Verify the slot's signature of a message against its public key."""
+        address = self._slot_address(slot)
+        message_ptr = _readable_buffer(message)
+        result = self.lib.fast_verify(address + self.PUBLIC_OFFSET, message_ptr,
+                                      len(message_ptr), address + self.SIGNATURE_OFFSET)
+        return result == 1
+    
+    def private_key(self, slot: int) -> memoryview:
+        """View of a slot's private key (valid until the slot is reused)."""
+        return self._field(slot, self.PRIVATE_OFFSET, 32)
+    
+    def public_key(self, slot: int) -> memoryview:
+        """View of a slot's public key (valid until the slot is reused)."""
+        return self._field(slot, self.PUBLIC_OFFSET, 64)
+    
+    def signature(self, slot: int) -> memoryview:
+        """View of a slot's signature (valid until the slot is reused)."""
+        return self._field(slot, self.SIGNATURE_OFFSET, 64)
+    
+    def clear(self) -> None:
+        """Zero every slot, wiping the private keys."""
+        ctypes.memset(self._arena, 0, self.slots * self.SLOT_SIZE)
 
 class NativeLibraryManager:
-    """Manager for loading and using native libraries."""
+    """
+    Manager for loading and using native libraries.
+    
+    Each library is loaded (dlopen + init) on first access to its
+    attribute, so callers that only need one library never load the other.
+    """
+    
+    # Library name -> wrapper class
+    LIBRARIES = {
+        'crypto_core': CryptoCoreLib,
+        'hash_algorithms': HashAlgorithmsLib,
+    }
     
     def __init__(self):
         """Initialize the native library manager."""
-        self.crypto_core: Optional[CryptoCoreLib] = None
-        self.hash_algorithms: Optional[HashAlgorithmsLib] = None
+        # Library name -> wrapper, or None if loading failed
+        self._libraries = {}
+        self._library_paths = {}
+        self._load_lock = threading.Lock()
+        self._isa_variants = {}
         self._libs_path = self._find_libs_path()
         self._platform = self._detect_platform()
-        
+    
+    @property
+    def crypto_core(self) -> Optional[CryptoCoreLib]:
+        """crypto_core wrapper, loaded on first access (None if unavailable)."""
+        if 'crypto_core' not in self._libraries:
+            self.load_crypto_core()
+        return self._libraries['crypto_core']
+    
+    @property
+    def hash_algorithms(self) -> Optional[HashAlgorithmsLib]:
+        """hash_algorithms wrapper, loaded on first access (None if unavailable)."""
+        if 'hash_algorithms' not in self._libraries:
+            self.load_hash_algorithms()
+        return self._libraries['hash_algorithms']
+    
     def _detect_platform(self) -> str:
         """Detect current platform."""
-        system = platform.system()
-        return PLATFORM_MAP.get(system, 'linux')
+        return _PLATFORM
     
     def _find_libs_path(self) -> Path:
         """Find the native libraries directory."""
-        # Try different possible locations
-        current_dir = Path(__file__).parent
-        possible_paths = [
-            current_dir / 'libs',
-            current_dir.parent / 'libs',
-            current_dir.parent.parent / 'libs',
-        ]
-        
-        for path in possible_paths:
-            if path.exists():
-                return path
-        
-        # Create default path
-        default_path = current_dir / 'libs'
-        default_path.mkdir(exist_ok=True)
-        return default_path
+        return _find_libs_path()
     
     def _get_library_path(self, lib_name: str) -> str:
-        """Get full path to a native library."""
-        platform_dir = self._libs_path / self._platform
-        extension = LIBRARY_EXTENSIONS[self._platform]
-        lib_filename = f"lib{lib_name}{extension}"
-        return str(platform_dir / lib_filename)
+        """
+        Get full path to a native library.
+        
+        Prefers the best ISA variant (lib<name>.<variant>.<ext>) supported
+        by the running CPU and falls back to the plain host-built library.
+        The result is cached per library.
+        """
+        if lib_name not in self._library_paths:
+            self._library_paths[lib_name] = self._resolve_library_path(lib_name)
+        return self._library_paths[lib_name]
+    
+    def _resolve_library_path(self, lib_name: str) -> str:
+        """Search the libs directory for a library (see _get_library_path)."""
+        path, variant = _resolve_library_path(lib_name)
+        if variant is not None:
+            self._isa_variants[lib_name] = variant
+        return path
+    
+    def _load(self, lib_name: str) -> bool:
+        """Load a library once; later calls return the cached outcome."""
+        with self._load_lock:
+            if lib_name not in self._libraries:
+                try:
+                    lib_path = self._get_library_path(lib_name)
+                    self._libraries[lib_name] = self.LIBRARIES[lib_name](lib_path)
+                except Exception as e:
+                    print(f"Warning: Could not load {lib_name} library: {e}")
+                    self._libraries[lib_name] = None
+            return self._libraries[lib_name] is not None
     
     def load_crypto_core(self) -> bool:
         """Load crypto_core library."""
-        try:
-            lib_path = self._get_library_path('crypto_core')
-            self.crypto_core = CryptoCoreLib(lib_path)
-            return True
-        except Exception as e:
-            print(f"Warning: Could not load crypto_core library: {e}")
-            return False
+        return self._load('crypto_core')
     
     def load_hash_algorithms(self) -> bool:
         """Load hash_algorithms library."""
-        try:
-            lib_path = self._get_library_path('hash_algorithms')
-            self.hash_algorithms = HashAlgorithmsLib(lib_path)
-            return True
-        except Exception as e:
-            print(f"Warning: Could not load hash_algorithms library: {e}")
-            return False
+        return self._load('hash_algorithms')
     
     def load_all(self) -> dict:
         """Load all available libraries."""
@@ -447,15 +1369,14 @@ class NativeLibraryManager:
     
     def get_info(self) -> dict:
         """Get information about loaded libraries."""
+        available = [name for name in self.LIBRARIES if self.is_available(name)]
         return {
             'platform': self._platform,
             'libs_path': str(self._libs_path),
-            'crypto_core_loaded': self.crypto_core is not None,
-            'hash_algorithms_loaded': self.hash_algorithms is not None,
-            'available_libraries': [
-                name for name in ['crypto_core', 'hash_algorithms']
-                if self.is_available(name)
-            ]
+            'crypto_core_loaded': 'crypto_core' in available,
+            'hash_algorithms_loaded': 'hash_algorithms' in available,
+            'isa_variants': dict(self._isa_variants),
+            'available_libraries': available
         }
 
 # Global instance
@@ -466,7 +1387,6 @@ def get_native_manager() -> NativeLibraryManager:
     global _native_manager
     if _native_manager is None:
         _native_manager = NativeLibraryManager()
-        _native_manager.load_all()
     return _native_manager
 
 # Convenience functions
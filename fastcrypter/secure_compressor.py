@@ -5,12 +5,18 @@ This module provides a simple, secure interface that combines compression
 and encryption in a single operation for maximum security and efficiency.
 """
 
-from typing import Union, Optional, Dict, Any
+import math
+import secrets
+import string
+from collections import Counter, abc
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Union, Optional, Dict, Any, Callable, Iterable, Iterator, Mapping, Tuple, BinaryIO
 from .core.compressor import Compressor, CompressionAlgorithmType, CompressionLevel
 from .core.encryptor import Encryptor, EncryptionAlgorithmType
 from .core.key_manager import KeyManager
 from .core.custom_encoder import CustomEncoder
-from .exceptions import EncrypterError, ValidationError, ErrorCodes
+from .exceptions import EncrypterError, EncryptionError, ValidationError, ErrorCodes
 
 # Try to import C/C++ extensions for speed
 try:
@@ -25,6 +31,157 @@ try:
 except ImportError:
     FAST_COMPRESSION_AVAILABLE = False
 
+# Character classes used by the password strength checks
+_ASCII_UPPERCASE = frozenset(string.ascii_uppercase)
+_ASCII_LOWERCASE = frozenset(string.ascii_lowercase)
+_ASCII_DIGITS = frozenset(string.digits)
+_ASCII_ALNUM = frozenset(string.ascii_letters + string.digits)
+
+# Rough compression ratio estimates used by estimate_output_size
+_COMPRESSION_RATIO_ESTIMATES = MappingProxyType({
+    CompressionAlgorithmType.ZLIB: 0.6,
+    CompressionAlgorithmType.LZMA: 0.4,
+    CompressionAlgorithmType.BROTLI: 0.5,
+})
+_DEFAULT_COMPRESSION_RATIO = 0.6
+_COMPRESSION_HEADER_SIZE = 8
+_ENCRYPTION_OVERHEAD = 64  # Conservative estimate (header, salt, IV, tag)
+_CUSTOM_ENCODING_EXPANSION = 1.4
+
+# Inputs that are skipped by compression: anything shorter than
+# min_compress_size, or whose sampled entropy exceeds this many bits per
+# byte (already compressed or encrypted payloads)
+_DEFAULT_MIN_COMPRESS_SIZE = 64
+_INCOMPRESSIBLE_ENTROPY = 7.5
+_ENTROPY_SAMPLE_SIZE = 4096
+
+# Streaming format:
+#   4 bytes magic, 1 byte version, 1 byte compression algorithm ID,
+#   1 byte salt size, 1 byte IV size, salt, IV, AES-256-GCM ciphertext of
+#   the compressed stream, 16 byte tag. Everything before the ciphertext
+#   is authenticated as associated data.
+_STREAM_MAGIC = b'FCST'
+_STREAM_VERSION = 1
+_STREAM_SALT_SIZE = 16
+_STREAM_IV_SIZE = 12
+_STREAM_TAG_SIZE = 16
+
+
+def _iter_chunks(source: Union[Iterable[Union[str, bytes]], BinaryIO],
+                 chunk_size: int) -> Iterator[bytes]:
+    """Iterate over a binary file object or an iterable of chunks as bytes."""
+    if hasattr(source, 'read'):
+        return iter(lambda: source.read(chunk_size), b'')
+    return (chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in source)
+
+
+def _sample_entropy(data: bytes) -> float:
+    """Get the Shannon entropy (bits per byte) of a prefix of the data."""
+    sample = data[:_ENTROPY_SAMPLE_SIZE]
+    
+    try:
+        from .native.native_loader import get_crypto_core
+        crypto_core = get_crypto_core()
+    except ImportError:
+        crypto_core = None
+    
+    if crypto_core is not None:
+        return crypto_core.calculate_entropy(sample)
+    
+    length = len(sample)
+    return -sum(count / length * math.log2(count / length)
+                for count in Counter(sample).values())
+
+
+def _encoded_size(data: Union[str, bytes]) -> int:
+    """Get the UTF-8 encoded size of data without encoding ASCII strings."""
+    if isinstance(data, str):
+        # str.isascii() is O(1) on CPython; ASCII text encodes 1:1
+        return len(data) if data.isascii() else len(data.encode('utf-8'))
+    return len(data)
+
+
+@lru_cache(maxsize=1024)
+def _estimate_sizes(input_size: int, algorithm: CompressionAlgorithmType,
+                    custom_encoding: bool) -> Tuple[float, int, int, int]:
+    """Get (ratio, compressed, encrypted, final) size estimates."""
+    comp_ratio = _COMPRESSION_RATIO_ESTIMATES.get(algorithm, _DEFAULT_COMPRESSION_RATIO)
+    compressed_size = int(input_size * comp_ratio) + _COMPRESSION_HEADER_SIZE
+    encrypted_size = compressed_size + _ENCRYPTION_OVERHEAD
+    
+    if custom_encoding:
+        # Base conversion typically increases size
+        final_size = int(encrypted_size * _CUSTOM_ENCODING_EXPANSION)
+    else:
+        final_size = encrypted_size
+    
+    return comp_ratio, compressed_size, encrypted_size, final_size
+
+
+class _LazyInfo(abc.Mapping):
+    """
+    Read-only mapping whose values are computed on first access.
+    
+    Values given as zero-argument callables are evaluated once when the
+    key is first read, so callers only pay for the entries they use.
+    """
+    
+    def __init__(self, entries: Dict[str, Any], lazy: Dict[str, Callable[[], Any]]):
+        self._values = dict(entries)
+        self._lazy = lazy
+        self._keys = list(entries) + [key for key in lazy if key not in entries]
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            self._values[key] = self._lazy[key]()
+        return self._values[key]
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._lazy
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def _classify_password(password: str) -> Dict[str, bool]:
+    """
+    Get the character classes present in a password in a single pass.
+    
+    ASCII characters are resolved with set lookups; only the (usually
+    few) distinct non-ASCII characters fall back to the str predicates.
+    This is as fast as four precompiled regex searches for short
+    passwords, about twice as fast for long ones, and keeps the Unicode
+    semantics of str.isupper() and friends.
+    """
+    chars = set(password)
+    has_upper = not _ASCII_UPPERCASE.isdisjoint(chars)
+    has_lower = not _ASCII_LOWERCASE.isdisjoint(chars)
+    has_digit = not _ASCII_DIGITS.isdisjoint(chars)
+    has_special = False
+    
+    for c in chars - _ASCII_ALNUM:
+        if c.isascii():
+            has_special = True
+        else:
+            has_upper = has_upper or c.isupper()
+            has_lower = has_lower or c.islower()
+            has_digit = has_digit or c.isdigit()
+            has_special = has_special or not c.isalnum()
+    
+    return {
+        'length_ok': len(password) >= 8,
+        'has_uppercase': has_upper,
+        'has_lowercase': has_lower,
+        'has_digits': has_digit,
+        'has_special_chars': has_special,
+    }
+
 
 class SecureCompressor:
     """
@@ -41,10 +198,14 @@ class SecureCompressor:
                  compression_level: Union[CompressionLevel, int] = CompressionLevel.BALANCED,
                  encryption_algorithm: Union[EncryptionAlgorithmType, str] = EncryptionAlgorithmType.AES_256_GCM,
                  auto_select_compression: bool = True,
-                 kdf_algorithm: str = 'pbkdf2',
+                 kdf_algorithm: str = 'argon2id',
                  kdf_iterations: int = 100000,
                  custom_charset: Optional[str] = None,
-                 use_fast_extensions: bool = True):
+                 use_fast_extensions: bool = True,
+                 kdf_time_cost: int = 2,
+                 kdf_memory_cost: int = 64 * 1024 * 1024,
+                 kdf_parallelism: int = 4,
+                 min_compress_size: int = _DEFAULT_MIN_COMPRESS_SIZE):
         """
         Initialize the SecureCompressor.
         
@@ -54,10 +215,17 @@ class SecureCompressor:
             compression_level: Compression level (1-9).
             encryption_algorithm: Encryption algorithm to use.
             auto_select_compression (bool): Auto-select best compression algorithm.
-            kdf_algorithm (str): Key derivation function algorithm.
-            kdf_iterations (int): Number of KDF iterations.
+            kdf_algorithm (str): Key derivation function of key_manager
+                ('argon2id', 'scrypt', 'argon2' or 'pbkdf2'). Message keys
+                come from the encryptor and do not use it.
+            kdf_iterations (int): Number of KDF iterations (PBKDF2).
             custom_charset (str, optional): Custom character set for encoding output.
             use_fast_extensions (bool): Use C/C++ extensions if available.
+            kdf_time_cost (int): Argon2id passes.
+            kdf_memory_cost (int): Argon2id memory in bytes.
+            kdf_parallelism (int): Argon2id lanes.
+            min_compress_size (int): Inputs shorter than this are stored
+                without compression.
             
         Raises:
             ValidationError: If parameters are invalid.
@@ -70,6 +238,7 @@ class SecureCompressor:
             )
         
         self.password = password
+        self.min_compress_size = min_compress_size
         self.use_fast_extensions = use_fast_extensions and (FAST_CRYPTO_AVAILABLE or FAST_COMPRESSION_AVAILABLE)
         
         # Initialize components
@@ -79,6 +248,16 @@ class SecureCompressor:
             auto_select=auto_select_compression
         )
         
+        # The fast codec gets its own header ID, so its output is decoded by
+        # self.compressor even where the extension is not installed
+        if self.use_fast_extensions and FAST_COMPRESSION_AVAILABLE:
+            self._fast_compressor = Compressor(algorithm=CompressionAlgorithmType.FAST)
+        else:
+            self._fast_compressor = None
+        
+        # Per-message keys are derived by the encryptor with a single HKDF
+        # over a random salt, so there is no expensive KDF work to cache
+        # between calls
         self.encryptor = Encryptor(
             algorithm=encryption_algorithm,
             derive_key=True
@@ -86,7 +265,10 @@ class SecureCompressor:
         
         self.key_manager = KeyManager(
             kdf_algorithm=kdf_algorithm,
-            iterations=kdf_iterations
+            iterations=kdf_iterations,
+            memory_cost=kdf_memory_cost,
+            parallelism=kdf_parallelism,
+            time_cost=kdf_time_cost
         )
         
         # Initialize custom encoder if charset provided
@@ -102,6 +284,10 @@ class SecureCompressor:
             'auto_select_compression': auto_select_compression,
             'kdf_algorithm': kdf_algorithm,
             'kdf_iterations': kdf_iterations,
+            'kdf_time_cost': kdf_time_cost,
+            'kdf_memory_cost': kdf_memory_cost,
+            'kdf_parallelism': kdf_parallelism,
+            'min_compress_size': min_compress_size,
             'custom_charset': custom_charset,
             'use_fast_extensions': self.use_fast_extensions,
         }
@@ -128,13 +314,12 @@ class SecureCompressor:
             ValidationError: If input data is invalid.
         """
         try:
+            # Encode once; every later stage works on bytes
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            
             # Step 1: Compress data (with fast extension if available)
-            if self.use_fast_extensions and FAST_COMPRESSION_AVAILABLE:
-                if isinstance(data, str):
-                    data = data.encode('utf-8')
-                compressed_data = fast_compression.fast_compress(data)
-            else:
-                compressed_data = self.compressor.compress(data)
+            compressed_data = self._compress(data)
             
             # Step 2: Encrypt compressed data
             encrypted_data = self.encryptor.encrypt(compressed_data, self.password)
@@ -186,16 +371,17 @@ class SecureCompressor:
             else:
                 encrypted_data = data
             
+            # Output of compress_and_encrypt_stream held in memory
+            if isinstance(encrypted_data, bytes) and encrypted_data[:4] == _STREAM_MAGIC:
+                output = bytearray()
+                self.decrypt_and_decompress_stream([encrypted_data], output.extend)
+                return bytes(output)
+            
             # Step 2: Decrypt data
             decrypted_data = self.encryptor.decrypt(encrypted_data, self.password)
             
-            # Step 3: Decompress decrypted data (with fast extension if available)
-            if self.use_fast_extensions and FAST_COMPRESSION_AVAILABLE:
-                decompressed_data = fast_compression.fast_decompress(decrypted_data)
-            else:
-                decompressed_data = self.compressor.decompress(decrypted_data)
-            
-            return decompressed_data
+            # Step 3: Decompress decrypted data
+            return self._decompress(decrypted_data)
             
         except Exception as e:
             raise EncrypterError(
@@ -203,6 +389,246 @@ class SecureCompressor:
                 details={"operation": "decrypt_and_decompress", "error": str(e)}
             )
     
+    def batch_compress_and_encrypt(self, items: Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+        """
+        Compress and encrypt many records, deriving the key only once.
+        
+        All records of a batch share one salt (and therefore one derived key)
+        while each gets a fresh random IV, so the per-record cost is just
+        compression and the cipher itself. Every record keeps the regular
+        format and can also be read with decrypt_and_decompress().
+        
+        Args:
+            items: Records to compress and encrypt (strings or bytes).
+            
+        Yields:
+            bytes: Encrypted compressed record, in input order.
+            
+        Raises:
+            EncrypterError: If compression or encryption fails.
+        """
+        salt = secrets.token_bytes(16)
+        key = None
+        
+        for data in items:
+            try:
+                if key is None:
+                    key = self.encryptor.derive_message_key(self.password, salt)
+                if isinstance(data, str):
+                    data = data.encode('utf-8')
+                encrypted_data = self.encryptor.encrypt_with_key(self._compress(data), key, salt)
+            except Exception as e:
+                raise EncrypterError(
+                    f"Secure compression failed: {str(e)}",
+                    details={"operation": "batch_compress_and_encrypt", "error": str(e)}
+                )
+            yield encrypted_data
+    
+    def batch_decrypt_and_decompress(self, items: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Decrypt and decompress many records, reusing derived keys.
+        
+        The key is only derived again when a record's salt differs from the
+        previous one, so a batch produced by batch_compress_and_encrypt()
+        costs a single key derivation.
+        
+        Args:
+            items: Encrypted compressed records.
+            
+        Yields:
+            bytes: Original record data, in input order.
+            
+        Raises:
+            EncrypterError: If decryption or decompression fails.
+        """
+        last_salt = None
+        key = None
+        
+        for data in items:
+            try:
+                salt = self.encryptor.get_message_salt(data)
+                if not salt:
+                    # Raw-key record, nothing to cache
+                    decrypted_data = self.encryptor.decrypt(data, self.password)
+                else:
+                    if salt != last_salt:
+                        key = self.encryptor.derive_message_key(self.password, salt)
+                        last_salt = salt
+                    decrypted_data = self.encryptor.decrypt_with_key(data, key)
+                decompressed_data = self._decompress(decrypted_data)
+            except Exception as e:
+                raise EncrypterError(
+                    f"Secure decompression failed: {str(e)}",
+                    details={"operation": "batch_decrypt_and_decompress", "error": str(e)}
+                )
+            yield decompressed_data
+    
+    def _compress(self, data: bytes) -> bytes:
+        """
+        Compress data (with fast extension if available).
+        
+        Small and high-entropy inputs are stored as-is, since compressing
+        them costs time and only makes them larger.
+        """
+        if (len(data) < self.min_compress_size or
+                _sample_entropy(data) > _INCOMPRESSIBLE_ENTROPY):
+            return self.compressor.store(data)
+        if self._fast_compressor is not None:
+            return self._fast_compressor.compress(data)
+        return self.compressor.compress(data)
+    
+    def _decompress(self, data: bytes) -> bytes:
+        """Decompress data, picking the codec from its header."""
+        return self.compressor.decompress(data)
+    
+    def compress_and_encrypt_stream(self, source: Union[Iterable[Union[str, bytes]], BinaryIO],
+                                    write: Callable[[bytes], Any]) -> int:
+        """
+        Compress and encrypt a stream without buffering it in memory.
+        
+        Chunks are fed through an incremental compressor straight into
+        AES-256-GCM, so memory use is bounded by the chunk size rather than
+        the input size. The output uses a streaming format that is read by
+        decrypt_and_decompress_stream; decrypt_and_decompress also accepts
+        it once it is in memory.
+        
+        Args:
+            source: Binary file object or iterable of str/bytes chunks.
+            write: Callable receiving each output chunk (e.g. ``file.write``).
+            
+        Returns:
+            int: Number of bytes written.
+            
+        Raises:
+            EncrypterError: If compression or encryption fails.
+            ValidationError: If the encryption algorithm is not AES-256-GCM.
+        """
+        try:
+            algo_id = Compressor.ALGORITHM_IDS[self.compressor.algorithm]
+            salt = secrets.token_bytes(_STREAM_SALT_SIZE)
+            iv = secrets.token_bytes(_STREAM_IV_SIZE)
+            header = (_STREAM_MAGIC +
+                      bytes([_STREAM_VERSION, algo_id, len(salt), len(iv)]) +
+                      salt + iv)
+            
+            compressor = self.compressor.compressobj()
+            encryptor = self.encryptor.create_stream_encryptor(self.password, salt, iv, header)
+            
+            write(header)
+            written = len(header)
+            
+            for chunk in _iter_chunks(source, self.compressor.chunk_size):
+                compressed = compressor.process(chunk)
+                if compressed:
+                    encrypted = encryptor.update(compressed)
+                    write(encrypted)
+                    written += len(encrypted)
+            
+            encrypted = encryptor.update(compressor.finish()) + encryptor.finalize()
+            write(encrypted)
+            write(encryptor.tag)
+            
+            return written + len(encrypted) + len(encryptor.tag)
+            
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise EncrypterError(
+                f"Secure stream compression failed: {str(e)}",
+                details={"operation": "compress_and_encrypt_stream", "error": str(e)}
+            )
+    
+    def decrypt_and_decompress_stream(self, source: Union[Iterable[bytes], BinaryIO],
+                                      write: Callable[[bytes], Any]) -> int:
+        """
+        Decrypt and decompress a stream created by compress_and_encrypt_stream.
+        
+        Output is written as it is produced and is only authenticated once
+        the final tag has been verified; if an exception is raised, anything
+        already written must be discarded.
+        
+        Args:
+            source: Binary file object or iterable of bytes chunks.
+            write: Callable receiving each output chunk (e.g. ``file.write``).
+            
+        Returns:
+            int: Number of bytes written.
+            
+        Raises:
+            EncrypterError: If the stream is malformed, tampered with, or
+                decryption/decompression fails.
+        """
+        try:
+            pending = bytearray()
+            decryptor = None
+            decompressor = None
+            written = 0
+            
+            for chunk in _iter_chunks(source, self.compressor.chunk_size):
+                pending += chunk
+                
+                if decryptor is None:
+                    if len(pending) < 8:
+                        continue
+                    if pending[:4] != _STREAM_MAGIC or pending[4] != _STREAM_VERSION:
+                        raise ValidationError(
+                            "Invalid stream header",
+                            ErrorCodes.INVALID_INPUT_FORMAT
+                        )
+                    header_size = 8 + pending[6] + pending[7]
+                    if len(pending) < header_size:
+                        continue
+                    
+                    header = bytes(pending[:header_size])
+                    algorithm = Compressor.algorithm_from_id(header[5])
+                    if algorithm is None:
+                        raise ValidationError(
+                            f"Unknown compression algorithm ID in stream: {header[5]}",
+                            ErrorCodes.UNSUPPORTED_COMPRESSION
+                        )
+                    salt = header[8:8 + header[6]]
+                    iv = header[8 + header[6]:header_size]
+                    
+                    decompressor = self.compressor.decompressobj(algorithm)
+                    decryptor = self.encryptor.create_stream_decryptor(self.password, salt, iv, header)
+                    del pending[:header_size]
+                
+                # Hold back the trailing tag until the stream ends
+                if len(pending) > _STREAM_TAG_SIZE:
+                    body = bytes(pending[:-_STREAM_TAG_SIZE])
+                    del pending[:-_STREAM_TAG_SIZE]
+                    decompressed = decompressor.process(decryptor.update(body))
+                    if decompressed:
+                        write(decompressed)
+                        written += len(decompressed)
+            
+            if decryptor is None or len(pending) != _STREAM_TAG_SIZE:
+                raise ValidationError(
+                    "Stream is truncated",
+                    ErrorCodes.INVALID_INPUT_SIZE
+                )
+            
+            try:
+                decryptor.finalize_with_tag(bytes(pending))
+            except Exception:
+                raise EncryptionError(
+                    "Stream authentication failed",
+                    ErrorCodes.AUTHENTICATION_FAILED
+                )
+            
+            decompressed = decompressor.finish()
+            if decompressed:
+                write(decompressed)
+                written += len(decompressed)
+            
+            return written
+            
+        except Exception as e:
+            raise EncrypterError(
+                f"Secure stream decompression failed: {str(e)}",
+                details={"operation": "decrypt_and_decompress_stream", "error": str(e)}
+            )
+    
     def compress_and_encrypt_to_custom(self, data: Union[str, bytes], 
                                      charset: str = "abcdef98Xvbvii") -> str:
         """
@@ -285,30 +711,27 @@ class SecureCompressor:
         decompressed_data = self.decrypt_and_decompress(data, input_format)
         return decompressed_data.decode(encoding)
     
-    def get_compression_ratio(self, original_data: Union[str, bytes], 
+    def get_compression_ratio(self, original_data: Union[str, bytes, int], 
                             compressed_encrypted_data: Union[bytes, str]) -> float:
         """
         Calculate the overall compression ratio (including encryption overhead).
         
         Args:
-            original_data: Original uncompressed data.
+            original_data: Original uncompressed data, or its size in bytes.
             compressed_encrypted_data: Final encrypted compressed data.
             
         Returns:
             float: Compression ratio (final_size / original_size).
         """
-        if isinstance(original_data, str):
-            original_data = original_data.encode('utf-8')
+        if isinstance(original_data, int):
+            original_size = original_data
+        else:
+            original_size = _encoded_size(original_data)
         
-        if len(original_data) == 0:
+        if original_size == 0:
             return 0.0
         
-        if isinstance(compressed_encrypted_data, str):
-            final_size = len(compressed_encrypted_data.encode('utf-8'))
-        else:
-            final_size = len(compressed_encrypted_data)
-        
-        return final_size / len(original_data)
+        return _encoded_size(compressed_encrypted_data) / original_size
     
     def estimate_output_size(self, input_size: int, output_format: str = 'binary') -> Dict[str, int]:
         """
@@ -322,26 +745,11 @@ class SecureCompressor:
             Dict[str, int]: Estimated sizes for different stages.
         """
         # Rough estimates based on typical compression ratios and encryption overhead
-        compression_ratios = {
-            CompressionAlgorithmType.ZLIB: 0.6,
-            CompressionAlgorithmType.LZMA: 0.4,
-            CompressionAlgorithmType.BROTLI: 0.5,
-        }
-        
-        # Get compression ratio estimate
-        comp_ratio = compression_ratios.get(self.compressor.algorithm, 0.6)
-        compressed_size = int(input_size * comp_ratio) + 8  # Add header overhead
-        
-        # Encryption adds overhead (headers, IV, tag, etc.)
-        encryption_overhead = 64  # Conservative estimate
-        encrypted_size = compressed_size + encryption_overhead
-        
-        # Custom encoding overhead
-        if output_format == 'custom' and self.custom_encoder:
-            # Base conversion typically increases size
-            custom_size = int(encrypted_size * 1.4)  # Rough estimate
-        else:
-            custom_size = encrypted_size
+        comp_ratio, compressed_size, encrypted_size, custom_size = _estimate_sizes(
+            input_size,
+            self.compressor.algorithm,
+            output_format == 'custom' and self.custom_encoder is not None
+        )
         
         return {
             'original_size': input_size,
@@ -393,26 +801,12 @@ class SecureCompressor:
         pwd = password or self.password
         
         # Basic strength checks
-        length_ok = len(pwd) >= 8
-        has_upper = any(c.isupper() for c in pwd)
-        has_lower = any(c.islower() for c in pwd)
-        has_digit = any(c.isdigit() for c in pwd)
-        has_special = any(not c.isalnum() for c in pwd)
+        checks = _classify_password(pwd)
         
         # Calculate strength score
-        score = 0
-        if length_ok:
-            score += 1
+        score = sum(checks.values())
         if len(pwd) >= 12:
             score += 1
-        if has_upper:
-            score += 1
-        if has_lower:
-            score += 1
-        if has_digit:
-            score += 1
-        if has_special:
-            score += 1
         
         # Determine strength level
         if score >= 5:
@@ -426,18 +820,16 @@ class SecureCompressor:
             'strength': strength,
             'score': score,
             'max_score': 6,
-            'checks': {
-                'length_ok': length_ok,
-                'has_uppercase': has_upper,
-                'has_lowercase': has_lower,
-                'has_digits': has_digit,
-                'has_special_chars': has_special,
-            },
-            'recommendations': self._get_password_recommendations(pwd)
+            'checks': checks,
+            'recommendations': self._get_password_recommendations(pwd, checks)
         }
     
-    def _get_password_recommendations(self, password: str) -> list:
+    def _get_password_recommendations(self, password: str,
+                                      checks: Optional[Dict[str, bool]] = None) -> list:
         """Get password improvement recommendations."""
+        if checks is None:
+            checks = _classify_password(password)
+        
         recommendations = []
         
         if len(password) < 8:
@@ -445,16 +837,16 @@ class SecureCompressor:
         elif len(password) < 12:
             recommendations.append("Consider using 12+ characters for better security")
         
-        if not any(c.isupper() for c in password):
+        if not checks['has_uppercase']:
             recommendations.append("Add uppercase letters")
         
-        if not any(c.islower() for c in password):
+        if not checks['has_lowercase']:
             recommendations.append("Add lowercase letters")
         
-        if not any(c.isdigit() for c in password):
+        if not checks['has_digits']:
             recommendations.append("Add numbers")
         
-        if not any(not c.isalnum() for c in password):
+        if not checks['has_special_chars']:
             recommendations.append("Add special characters (!@#$%^&*)")
         
         if not recommendations:
@@ -462,20 +854,19 @@ class SecureCompressor:
         
         return recommendations
     
-    def get_info(self) -> Dict[str, Any]:
+    def get_info(self) -> Mapping[str, Any]:
         """
         Get comprehensive information about the SecureCompressor configuration.
         
+        The component entries (compressor, encryptor, key manager, password
+        strength, custom encoder) are only computed when first read.
+        
         Returns:
-            Dict[str, Any]: Configuration and status information.
+            Mapping[str, Any]: Read-only configuration and status information.
         """
-        info = {
+        entries = {
             'version': '1.0.0',
             'configuration': self.config,
-            'compressor_info': self.compressor.get_info(),
-            'encryptor_info': self.encryptor.get_info(),
-            'key_manager_info': self.key_manager.get_info(),
-            'password_strength': self.validate_password_strength(),
             'fast_extensions': {
                 'crypto_available': FAST_CRYPTO_AVAILABLE,
                 'compression_available': FAST_COMPRESSION_AVAILABLE,
@@ -483,10 +874,17 @@ class SecureCompressor:
             }
         }
         
+        lazy = {
+            'compressor_info': self.compressor.get_info,
+            'encryptor_info': self.encryptor.get_info,
+            'key_manager_info': self.key_manager.get_info,
+            'password_strength': self.validate_password_strength,
+        }
+        
         if self.custom_encoder:
-            info['custom_encoder_info'] = self.custom_encoder.get_charset_info()
+            lazy['custom_encoder_info'] = self.custom_encoder.get_charset_info
         
-        return info
+        return _LazyInfo(entries, lazy)
     
     def benchmark_performance(self, data_size: int = 1024) -> Dict[str, Any]:
         """
@@ -539,7 +937,7 @@ class SecureCompressor:
                 'decrypt_time': custom_decrypt_time,
                 'total_time': custom_encrypt_time + custom_decrypt_time,
                 'throughput_mbps': (data_size / (1024 * 1024)) / (custom_encrypt_time + custom_decrypt_time),
-                'expansion_ratio': len(custom_encrypted.encode('utf-8')) / data_size,
+                'expansion_ratio': _encoded_size(custom_encrypted) / data_size,
                 'correctness': test_data == custom_decrypted
             }
         
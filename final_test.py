@@ -66,8 +66,8 @@ def test_custom_encoding():
         assert test_data == decoded, "Custom encoding integrity check failed!"
         
         # Verify only charset characters are used
-        for char in encoded:
-            assert char in charset, f"Invalid character '{char}' found in encoded output!"
+        invalid = set(encoded).difference(charset)
+        assert not invalid, f"Invalid characters {sorted(invalid)} found in encoded output!"
         
         print(f"Custom encoding test passed!")
         print(f"   Charset: {charset}")
@@ -0,0 +1,152 @@
+//! Rust versions of the fast_crypto loops, built as `fastcrypter._rust`.
+//!
+//! Same functions as the Cython `_xor` module (xor_bytes, shannon_entropy,
+//! secure_zero) plus cpu_features. The loops run without the GIL and XOR
+//! over large buffers is split across rayon threads. Set RUSTFLAGS (e.g.
+//! `-C target-cpu=x86-64-v3`) to build for a specific ISA tier.
+
+use std::collections::HashMap;
+use std::sync::atomic::{compiler_fence, Ordering};
+
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::{PyTypeError, PyValueError};
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use rayon::prelude::*;
+
+/// Below this many bytes threads cost more than they save
+const PARALLEL_MIN: usize = 1 << 20;
+/// Bytes per rayon task
+const CHUNK_SIZE: usize = 1 << 20;
+
+/// View a contiguous buffer as a byte slice.
+///
+/// The slice lives as long as the PyBuffer, which keeps the export (and
+/// so the memory) alive.
+fn as_slice(buffer: &PyBuffer<u8>) -> PyResult<&[u8]> {
+    if !buffer.is_c_contiguous() {
+        return Err(PyValueError::new_err("Buffer must be contiguous"));
+    }
+    if buffer.len_bytes() == 0 {
+        return Ok(&[]);
+    }
+    Ok(unsafe { std::slice::from_raw_parts(buffer.buf_ptr() as *const u8, buffer.len_bytes()) })
+}
+
+/// XOR `data` into `out` with the key starting at `offset` bytes into the stream.
+fn xor_chunk(out: &mut [u8], data: &[u8], key: &[u8], offset: usize) {
+    let key_stream = key.iter().cycle().skip(offset % key.len());
+    for ((o, d), k) in out.iter_mut().zip(data).zip(key_stream) {
+        *o = d ^ k;
+    }
+}
+
+fn xor_into(out: &mut [u8], data: &[u8], key: &[u8]) {
+    if data.len() < PARALLEL_MIN {
+        xor_chunk(out, data, key, 0);
+        return;
+    }
+    out.par_chunks_mut(CHUNK_SIZE)
+        .zip(data.par_chunks(CHUNK_SIZE))
+        .enumerate()
+        .for_each(|(index, (out, data))| xor_chunk(out, data, key, index * CHUNK_SIZE));
+}
+
+/// XOR data with a repeating key, returning new bytes.
+#[pyfunction]
+fn xor_bytes<'py>(
+    py: Python<'py>,
+    data: PyBuffer<u8>,
+    key: PyBuffer<u8>,
+) -> PyResult<Bound<'py, PyBytes>> {
+    let data = as_slice(&data)?;
+    let key = as_slice(&key)?;
+    if key.is_empty() {
+        return Err(PyValueError::new_err("Key must not be empty"));
+    }
+
+    PyBytes::new_bound_with(py, data.len(), |out| {
+        py.allow_threads(|| xor_into(out, data, key));
+        Ok(())
+    })
+}
+
+/// Shannon entropy of data in bits per byte.
+#[pyfunction]
+fn shannon_entropy(py: Python<'_>, data: PyBuffer<u8>) -> PyResult<f64> {
+    let data = as_slice(&data)?;
+    if data.is_empty() {
+        return Ok(0.0);
+    }
+
+    Ok(py.allow_threads(|| {
+        // Four interleaved histograms avoid stalls on repeated bytes
+        let mut counts = [[0usize; 256]; 4];
+        let mut blocks = data.chunks_exact(4);
+        for block in &mut blocks {
+            counts[0][block[0] as usize] += 1;
+            counts[1][block[1] as usize] += 1;
+            counts[2][block[2] as usize] += 1;
+            counts[3][block[3] as usize] += 1;
+        }
+        for &byte in blocks.remainder() {
+            counts[0][byte as usize] += 1;
+        }
+
+        let n = data.len() as f64;
+        (0..256)
+            .map(|i| counts[0][i] + counts[1][i] + counts[2][i] + counts[3][i])
+            .filter(|&count| count > 0)
+            .map(|count| {
+                let p = count as f64 / n;
+                -p * p.log2()
+            })
+            .sum()
+    }))
+}
+
+/// Zero a writable buffer in place.
+#[pyfunction]
+fn secure_zero(buffer: PyBuffer<u8>) -> PyResult<()> {
+    if buffer.readonly() {
+        return Err(PyTypeError::new_err("Buffer must be writable"));
+    }
+    if !buffer.is_c_contiguous() {
+        return Err(PyValueError::new_err("Buffer must be contiguous"));
+    }
+    let ptr = buffer.buf_ptr() as *mut u8;
+    for i in 0..buffer.len_bytes() {
+        // Volatile so the stores are not optimized away
+        unsafe { std::ptr::write_volatile(ptr.add(i), 0) };
+    }
+    compiler_fence(Ordering::SeqCst);
+    Ok(())
+}
+
+/// Hardware crypto support, as a dict of feature name -> bool.
+#[pyfunction]
+fn cpu_features() -> HashMap<&'static str, bool> {
+    let mut features = HashMap::new();
+    #[cfg(any(target_arch = "x86", target_arch = "x86_64"))]
+    {
+        features.insert("aesni", is_x86_feature_detected!("aes"));
+        features.insert("clmul", is_x86_feature_detected!("pclmulqdq"));
+        features.insert("shani", is_x86_feature_detected!("sha"));
+    }
+    #[cfg(not(any(target_arch = "x86", target_arch = "x86_64")))]
+    {
+        features.insert("aesni", false);
+        features.insert("clmul", false);
+        features.insert("shani", false);
+    }
+    features
+}
+
+#[pymodule]
+fn _rust(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add_function(wrap_pyfunction!(xor_bytes, m)?)?;
+    m.add_function(wrap_pyfunction!(shannon_entropy, m)?)?;
+    m.add_function(wrap_pyfunction!(secure_zero, m)?)?;
+    m.add_function(wrap_pyfunction!(cpu_features, m)?)?;
+    Ok(())
+}
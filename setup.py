@@ -3,23 +3,72 @@
 Setup script for fastCrypter package.
 """
 
-from setuptools import setup, find_packages
+import sys
 from pathlib import Path
 
+from setuptools import setup, find_namespace_packages
+from setuptools.command.build_clib import build_clib
+from distutils.errors import CCompilerError, DistutilsError
+
+# The C/C++ extensions (ISA-tiered _fast_crypto_<tier>, fast_compression
+# and, when Cython is installed, _xor) are defined in setup_extensions.py
+sys.path.insert(0, str(Path(__file__).parent))
+import setup_extensions
+from setup_extensions import C_LIBRARIES, StripBuildExt
+
 # Read README file
 readme_file = Path(__file__).parent / "README.md"
 long_description = (
     readme_file.read_text(encoding="utf-8") if readme_file.exists() else ""
 )
 
-# Read requirements
-requirements_file = Path(__file__).parent / "requirements.txt"
-requirements = []
-if requirements_file.exists():
-    requirements = requirements_file.read_text(encoding="utf-8").strip().split("\n")
-    requirements = [
-        req.strip() for req in requirements if req.strip() and not req.startswith("#")
-    ]
+# Runtime dependencies only; requirements.txt is the development
+# environment (test, lint and docs tools). Argon2id is the default KDF.
+requirements = [
+    "cryptography>=41.0.0",
+    "argon2-cffi>=23.1.0",
+]
+
+# The package works without the extensions, so an install on a machine
+# without a compiler falls back to the Python implementations
+ext_modules = setup_extensions.build_extensions()
+for ext in ext_modules:
+    ext.optional = True
+
+
+def _warn_build_failed(error):
+    print(f"Warning: Could not build the C/C++ extensions ({error}); "
+          "the Python implementations will be used")
+
+
+class OptionalBuildClib(build_clib):
+    """build_clib that warns instead of failing without a compiler."""
+
+    def run(self):
+        try:
+            super().run()
+        except (CCompilerError, DistutilsError, OSError) as e:
+            _warn_build_failed(e)
+
+
+class OptionalBuildExt(StripBuildExt):
+    """build_ext that warns instead of failing without a compiler."""
+
+    def run(self):
+        try:
+            super().run()
+        except (CCompilerError, DistutilsError, OSError) as e:
+            _warn_build_failed(e)
+
+
+# The C modules use the stable ABI only from Python 3.11 on (Py_buffer
+# joined the limited API in 3.11), and the Cython module never does, so
+# the wheel is only tagged abi3 when every module it contains is
+if ext_modules and all(getattr(ext, "py_limited_api", False) for ext in ext_modules):
+    wheel_options = {"bdist_wheel": {"py_limited_api": "cp311"}}
+else:
+    wheel_options = {}
+
 
 setup(
     name="fastcrypter",
@@ -30,7 +79,11 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/Pymmdrza/fastCrypter",
-    packages=find_packages(),
+    # Namespace discovery: fastcrypter.native has no __init__.py
+    packages=find_namespace_packages(
+        include=["fastcrypter", "fastcrypter.*"],
+        exclude=["fastcrypter.native.libs", "fastcrypter.native.libs.*", "*.__pycache__"],
+    ),
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
@@ -61,24 +114,35 @@ setup(
             "sphinx>=7.1.0",
             "sphinx-rtd-theme>=1.3.0",
         ],
+        "compression": [
+            "brotli>=1.1.0",
+        ],
         "native": [
             "numpy>=1.24.0",
             "cython>=3.0.0",
         ],
+        "performance": [
+            "numpy>=1.24.0",
+            "numba>=0.58",
+        ],
+        "rust": [
+            "setuptools-rust>=1.9",
+        ],
     },
     entry_points={
         "console_scripts": [
             "fastCrypter=fastCrypter.cli:main",
         ],
     },
-    include_package_data=True,
+    # Explicit list: sources (.c, .pyx, ...) belong in the sdist only
     package_data={
-        "fastCrypter": [
+        "fastcrypter": [
             "native/libs/*/*.so",
             "native/libs/*/*.dll",
             "native/libs/*/*.dylib",
             "*.md",
         ],
+        "fastcrypter.core": ["build_config.json"],
     },
     keywords=[
         "encryption",
@@ -102,4 +166,8 @@ setup(
         "Source": "https://github.com/Pymmdrza/fastCrypter",
         "Documentation": "https://fastCrypter.readthedocs.io/",
     },
+    ext_modules=ext_modules,
+    libraries=C_LIBRARIES,
+    cmdclass={"build_clib": OptionalBuildClib, "build_ext": OptionalBuildExt},
+    options=wheel_options,
 )
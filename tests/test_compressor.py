@@ -66,6 +66,17 @@ class TestCompressor:
         
         assert text.encode('utf-8') == decompressed
 
+    def test_store(self):
+        """Test storing data without compression."""
+        compressor = Compressor()
+        data = b"Stored data " * 10
+        
+        stored = compressor.store(data)
+        
+        assert stored[0] == 0  # Algorithm ID 0 = stored
+        assert stored[8:] == data
+        assert compressor.decompress(stored) == data
+
     def test_empty_data_error(self):
         """Test that empty data raises error."""
         compressor = Compressor()
@@ -104,6 +115,43 @@ class TestCompressor:
         compressed_large = compressor.compress(large_data)
         assert compressor.decompress(compressed_large) == large_data
 
+    def test_without_brotli(self, monkeypatch):
+        """Test behaviour when the optional brotli package is missing."""
+        from fastcrypter.core import compressor as compressor_module
+        monkeypatch.setattr(compressor_module, 'brotli', None)
+        
+        with pytest.raises(CompressionError):
+            Compressor(algorithm=CompressionAlgorithmType.BROTLI).compress(b"data " * 100)
+        
+        # Auto selection falls back to zlib for medium entropy data
+        data = bytes(range(64)) * 64
+        compressor = Compressor(auto_select=True)
+        assert compressor._select_best_algorithm(data) == CompressionAlgorithmType.ZLIB
+        assert compressor.decompress(compressor.compress(data)) == data
+
+    def test_fast_without_extension(self, monkeypatch):
+        """Test that fast codec data decodes without the extension."""
+        from fastcrypter.core import compressor as compressor_module
+        monkeypatch.setattr(compressor_module, 'fast_compression', None)
+        compressor = Compressor(algorithm=CompressionAlgorithmType.FAST)
+        
+        with pytest.raises(CompressionError):
+            compressor.compress(b"data " * 100)
+        
+        # "ab", a back-reference overlapping its own output, an escaped 0xFF
+        payload = b"ab\xff\x06\x02\xff\x00\x00c"
+        data = compressor._create_header(CompressionAlgorithmType.FAST, 10) + payload
+        assert data[0] == 4
+        assert compressor.decompress(data) == b"abababab\xffc"
+        
+        for truncated in (b"ab\xff", b"ab\xff\x03"):
+            header = compressor._create_header(CompressionAlgorithmType.FAST, 5)
+            with pytest.raises(CompressionError):
+                compressor.decompress(header + truncated)
+        with pytest.raises(CompressionError):
+            compressor.decompress(compressor._create_header(CompressionAlgorithmType.FAST, 5) +
+                                  b"ab\xff\x03\x03")
+
     def test_different_levels(self):
         """Test different compression levels."""
         data = b"Level test " * 100
@@ -31,8 +31,7 @@ class TestCustomEncoder:
         
         assert data == decoded
         # Check that only charset characters are used
-        for char in encoded:
-            assert char in encoder.charset
+        assert set(encoded) <= set(encoder.charset)
 
     def test_encode_empty(self):
         """Test encoding empty data."""
@@ -60,6 +59,22 @@ class TestCustomEncoder:
             decoded = encoder.decode(encoded)
             assert data == decoded, f"Failed for {data!r}"
 
+    @pytest.mark.parametrize("charset", [None, "01", "abcdef98Xvbvii"])
+    def test_length_prefix_round_trip(self, charset):
+        """Test lengths whose prefix contains the padding character."""
+        encoder = CustomEncoder(charset=charset) if charset else CustomEncoder()
+        
+        for length in (1, 2, 10, 21, 32, 100, 255, 256):
+            data = bytes(range(1, length + 1)) if length < 256 else bytes(range(256))
+            assert encoder.decode(encoder.encode(data)) == data, f"Failed for length {length}"
+
+    def test_all_zero_data(self):
+        """Test that data made of zero bytes keeps its length."""
+        encoder = CustomEncoder()
+        
+        for data in (b"\x00", bytes(4), bytes(21)):
+            assert encoder.decode(encoder.encode(data)) == data
+
     def test_invalid_charset_error(self):
         """Test that invalid charset raises error."""
         with pytest.raises(ValidationError):
@@ -201,8 +201,8 @@ class TestExampleOutputQuality:
         encoded = compressor.compress_and_encrypt_to_custom(test_data, custom_charset)
         
         # Verify only custom characters are used
-        for char in encoded:
-            assert char in custom_charset, f"Character '{char}' not in charset"
+        invalid = set(encoded).difference(custom_charset)
+        assert not invalid, f"Characters {sorted(invalid)} not in charset"
         
         # Decrypt and verify
         decoded = compressor.decrypt_and_decompress_from_custom(encoded, custom_charset).decode('utf-8')
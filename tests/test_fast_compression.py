@@ -0,0 +1,53 @@
+"""
+Tests for the fast_compression C++ extension.
+"""
+
+import os
+import zlib
+
+import pytest
+
+from fastcrypter.core.compressor import Compressor, CompressionAlgorithmType, _fast_decompress_py
+
+
+@pytest.fixture(scope="module")
+def fast_compression():
+    """fast_compression module, skipping when the extension is not built."""
+    try:
+        from fastcrypter.core import fast_compression
+    except ImportError:
+        pytest.skip("fast_compression extension not built")
+    return fast_compression
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\xff\x00\x00" * 10,
+    b"abcabcabc" * 100,
+    os.urandom(4096),
+])
+def test_round_trip(fast_compression, data):
+    compressed = fast_compression.fast_compress(data)
+    assert fast_compression.fast_decompress(compressed) == data
+    assert _fast_decompress_py(compressed) == data
+
+
+def test_compressor_header(fast_compression):
+    compressor = Compressor(algorithm=CompressionAlgorithmType.FAST)
+    data = b"abcabcabc" * 100
+    compressed = compressor.compress(data)
+    assert compressed[0] == Compressor.ALGORITHM_IDS[CompressionAlgorithmType.FAST]
+    assert Compressor().decompress(compressed) == data
+
+
+@pytest.mark.parametrize("length", [0, 1, 15, 63, 64, 65, 127, 1000, 1 << 20])
+def test_crc32_matches_zlib(fast_compression, length):
+    data = os.urandom(length)
+    assert fast_compression.fast_crc32(data) == zlib.crc32(data)
+    assert fast_compression.fast_crc32(data, 0xDEADBEEF) == zlib.crc32(data, 0xDEADBEEF)
+
+
+def test_crc32_incremental(fast_compression):
+    data = os.urandom(10000)
+    crc = fast_compression.fast_crc32(data[:777])
+    assert fast_compression.fast_crc32(data[777:], crc) == zlib.crc32(data)
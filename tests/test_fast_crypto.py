@@ -0,0 +1,178 @@
+"""
+Tests for the fast_crypto loader and its implementations.
+"""
+
+import importlib
+import math
+import os
+import sys
+import warnings
+from collections import Counter
+
+import pytest
+
+try:
+    from fastcrypter.core import fast_crypto
+except ImportError:
+    pytest.skip("no fast_crypto implementation available", allow_module_level=True)
+
+# Every C tier name of every architecture
+ALL_TIERS = sorted({name for tiers in fast_crypto.ISA_TIERS.values() for name, _ in tiers})
+
+
+def _xor_reference(data, key):
+    return bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
+
+
+def _entropy_reference(data):
+    return -sum(count / len(data) * math.log2(count / len(data))
+                for count in Counter(data).values())
+
+
+def _implementation(name):
+    """Import one implementation with fast_crypto's interface, or skip."""
+    if name.startswith("_fast_crypto_"):
+        if name[len("_fast_crypto_"):] not in fast_crypto._select_tiers():
+            pytest.skip(f"{name} needs instructions this CPU does not have")
+        return pytest.importorskip(f"fastcrypter.core.{name}")
+    module = pytest.importorskip(name)
+    return fast_crypto._FallbackExtension(module)
+
+
+IMPLEMENTATIONS = [f"_fast_crypto_{tier}" for tier in ALL_TIERS] + [
+    "fastcrypter._rust",
+    "fastcrypter.core._xor",
+    "fastcrypter.core.fast_crypto_numba",
+]
+
+
+def _block_imports(monkeypatch, *names):
+    """Make importing the given modules raise ImportError."""
+    for name in names:
+        monkeypatch.setitem(sys.modules, name, None)
+        # `from package import module` finds already imported submodules
+        # as package attributes
+        package, _, attribute = name.rpartition(".")
+        monkeypatch.delattr(sys.modules[package], attribute, raising=False)
+
+
+@pytest.mark.parametrize("name", IMPLEMENTATIONS)
+class TestImplementations:
+    """Every importable implementation against the Python references."""
+
+    @pytest.mark.parametrize("size, key_size", [(0, 1), (1, 1), (255, 7), (4096, 32), (100003, 256)])
+    def test_fast_xor(self, name, size, key_size):
+        impl = _implementation(name)
+        data, key = os.urandom(size), os.urandom(key_size)
+        assert bytes(impl.fast_xor(data, key)) == _xor_reference(data, key)
+
+    @pytest.mark.parametrize("data", [b"a", b"abcabc", bytes(range(256)) * 3, os.urandom(10000)])
+    def test_fast_entropy(self, name, data):
+        impl = _implementation(name)
+        assert impl.fast_entropy(data) == pytest.approx(_entropy_reference(data))
+
+    def test_secure_clear(self, name):
+        impl = _implementation(name)
+        buffer = bytearray(os.urandom(1000))
+        impl.secure_clear(buffer)
+        assert buffer == bytearray(1000)
+
+        # Read-only buffers are left alone
+        data = b"secret"
+        impl.secure_clear(data)
+        assert data == b"secret"
+
+    def test_cpu_features(self, name):
+        features = _implementation(name).cpu_features()
+        assert {"aesni", "clmul", "shani"} <= set(features)
+        assert all(isinstance(value, bool) for value in features.values())
+
+
+def test_selected_tier_is_usable():
+    """Test that the chosen tier is the best built one this CPU runs."""
+    assert fast_crypto.ISA_TIER in ALL_TIERS + ["rust", "cython", "numba"]
+    assert bytes(fast_crypto.fast_xor(b"\x0f\xf0", b"\xff")) == b"\xf0\x0f"
+
+
+def test_forced_tier(monkeypatch):
+    """Test that FASTCRYPTER_ISA forces a tier."""
+    monkeypatch.setenv("FASTCRYPTER_ISA", "sse2")
+    assert fast_crypto._select_tiers() == ["sse2"]
+
+    monkeypatch.delenv("FASTCRYPTER_ISA")
+    tiers = fast_crypto._select_tiers()
+    assert tiers and set(tiers) <= set(ALL_TIERS)
+
+    for tier in tiers:
+        try:
+            importlib.import_module(f"fastcrypter.core._fast_crypto_{tier}")
+        except ImportError:
+            continue
+        monkeypatch.setenv("FASTCRYPTER_ISA", tier)
+        assert fast_crypto._load()[0] == tier
+
+
+def test_fallback_without_c_tiers(monkeypatch):
+    """Test the rust -> C tier -> Cython -> Numba fallback chain."""
+    monkeypatch.delenv("FASTCRYPTER_ISA", raising=False)
+    _block_imports(monkeypatch, "fastcrypter._rust",
+                   *(f"fastcrypter.core._fast_crypto_{tier}" for tier in ALL_TIERS))
+
+    expected = []
+    for tier, module in (("cython", "fastcrypter.core._xor"),
+                         ("numba", "fastcrypter.core.fast_crypto_numba")):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        expected.append(tier)
+
+    if not expected:
+        with pytest.raises(ImportError):
+            fast_crypto._load()
+        return
+
+    tier, impl = fast_crypto._load()
+    assert tier == expected[0]
+    data, key = os.urandom(1000), b"key"
+    assert bytes(impl.fast_xor(data, key)) == _xor_reference(data, key)
+
+    if expected[0] == "cython":
+        _block_imports(monkeypatch, "fastcrypter.core._xor")
+        if "numba" in expected:
+            assert fast_crypto._load()[0] == "numba"
+        else:
+            with pytest.raises(ImportError):
+                fast_crypto._load()
+
+
+def test_fallback_extension_without_secure_zero():
+    """Test _FallbackExtension on a module with only the two loops."""
+    class Loops:
+        xor_bytes = staticmethod(_xor_reference)
+        shannon_entropy = staticmethod(_entropy_reference)
+
+    impl = fast_crypto._FallbackExtension(Loops)
+    buffer = bytearray(b"secret")
+    impl.secure_clear(buffer)
+    assert buffer == bytearray(6)
+    impl.secure_clear(memoryview(bytearray(b"x")).toreadonly())
+    impl.secure_clear(12345)  # Not a buffer: ignored
+    assert impl.cpu_features() == {"aesni": False, "clmul": False, "shani": False}
+
+
+def test_check_build_warns_when_built_tier_missing(monkeypatch):
+    """Test the RuntimeWarning for a built tier that could not be imported."""
+    monkeypatch.delenv("FASTCRYPTER_ISA", raising=False)
+    monkeypatch.setattr(fast_crypto, "_load_build_config", lambda: {"tiers": ALL_TIERS})
+    expected = fast_crypto._select_tiers()[0]
+
+    with pytest.warns(RuntimeWarning, match=f"built with the {expected} tier"):
+        fast_crypto._check_build("cython")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        fast_crypto._check_build(expected)
+        fast_crypto._check_build("rust")
+        monkeypatch.setattr(fast_crypto, "_load_build_config", lambda: {})
+        fast_crypto._check_build("cython")
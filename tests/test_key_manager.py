@@ -65,6 +65,22 @@ class TestKeyManager:
         assert len(key) == 32
         assert len(salt) >= 16
 
+    def test_derive_key_argon2id(self):
+        """Test raw Argon2id key derivation."""
+        km = KeyManager(kdf_algorithm='argon2id', memory_cost=8 * 1024 * 1024, parallelism=2)
+        
+        key, salt = km.derive_key("test_password", key_length=64)
+        
+        assert len(key) == 64
+        assert km.derive_key("test_password", salt, 64)[0] == key
+        assert km.derive_key("other_password", salt, 64)[0] != key
+
+    def test_argon2_memory_cost_unit(self):
+        """Test that both Argon2 modes read memory_cost in bytes."""
+        for algorithm in ('argon2', 'argon2id'):
+            km = KeyManager(kdf_algorithm=algorithm, memory_cost=8 * 1024 * 1024)
+            assert km._argon2_hasher.memory_cost == 8192
+
     def test_derive_key_with_salt(self):
         """Test key derivation with provided salt."""
         km = KeyManager()
@@ -0,0 +1,374 @@
+"""
+Tests for the native library wrappers.
+"""
+
+import array
+import hashlib
+import hmac
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from fastcrypter.native.native_loader import (
+    NativeLibraryError, NativeLibraryManager, get_crypto_core, get_hash_algorithms
+)
+
+
+def _xor_reference(data, key):
+    return bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
+
+
+@pytest.fixture
+def crypto_core():
+    """crypto_core wrapper, skipping when the library is not built."""
+    lib = get_crypto_core()
+    if lib is None:
+        pytest.skip("crypto_core native library not available")
+    return lib
+
+
+@pytest.fixture
+def hash_algorithms():
+    """hash_algorithms wrapper, skipping when the library is not built."""
+    lib = get_hash_algorithms()
+    if lib is None:
+        pytest.skip("hash_algorithms native library not available")
+    return lib
+
+
+def test_manager_loads_lazily(crypto_core):
+    """Test that libraries are only loaded when first used."""
+    manager = NativeLibraryManager()
+    assert manager._libraries == {}
+
+    assert manager.crypto_core is not None
+    assert list(manager._libraries) == ['crypto_core']
+    assert manager.crypto_core is manager.crypto_core
+
+    # Platform and path probes are shared between managers
+    other = NativeLibraryManager()
+    assert other._libs_path is manager._libs_path
+    assert other._get_library_path('crypto_core') == manager._get_library_path('crypto_core')
+
+
+def test_isa_selection_probes_cpu(monkeypatch):
+    """Test that ISA variants are picked by CPU probe, not only /proc/cpuinfo."""
+    from fastcrypter.native import native_loader
+
+    if native_loader._get_cpu_level() is None:
+        pytest.skip("no generic variant library (build_native.py --fat)")
+    monkeypatch.delenv('FASTCRYPTER_ISA', raising=False)
+    selected = native_loader._select_isa_variants()
+    assert selected
+
+    # Same answer as the /proc/cpuinfo flags where those exist
+    cpu_flags = native_loader._get_cpu_flags()
+    if cpu_flags is not None:
+        monkeypatch.setattr(native_loader, '_get_cpu_level', lambda: None)
+        assert native_loader._select_isa_variants() == selected
+        monkeypatch.undo()
+
+    # ...and without them (macOS, Windows)
+    monkeypatch.setattr(native_loader, '_get_cpu_flags', lambda: None)
+    assert native_loader._select_isa_variants() == selected
+
+    monkeypatch.setenv('FASTCRYPTER_ISA', 'generic')
+    assert native_loader._select_isa_variants() == ['generic']
+    monkeypatch.setenv('FASTCRYPTER_ISA', 'none')
+    assert native_loader._select_isa_variants() == []
+
+
+def test_wrappers_collected_without_finalizer(crypto_core):
+    """Test that wrappers are freed by refcounting alone, without the GC."""
+    import gc
+    import weakref
+    from fastcrypter.native.native_loader import CryptoCoreLib
+
+    manager = NativeLibraryManager()
+    wrapper = CryptoCoreLib(manager._resolve_library_path('crypto_core'))
+    ref = weakref.ref(wrapper)
+    gc.disable()
+    try:
+        del wrapper
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+class TestCryptoCore:
+    """Test suite for CryptoCoreLib."""
+
+    @pytest.mark.parametrize("size", [1, 7, 256, 257, 4099])
+    @pytest.mark.parametrize("key_size", [1, 3, 32, 300])
+    def test_fast_xor(self, crypto_core, size, key_size):
+        """Test XOR against a pure Python reference."""
+        data = os.urandom(size)
+        key = os.urandom(key_size)
+        
+        assert crypto_core.fast_xor(data, key) == _xor_reference(data, key)
+
+    def test_fast_xor_into(self, crypto_core):
+        """Test XOR into preallocated and in-place buffers."""
+        data = os.urandom(1000)
+        key = b"secret key"
+        expected = _xor_reference(data, key)
+        
+        out = bytearray(1024)
+        assert crypto_core.fast_xor_into(out, memoryview(data), bytearray(key)) is out
+        assert out[:1000] == expected
+        
+        buffer = bytearray(data)
+        crypto_core.fast_xor_into(buffer, buffer, key)
+        assert buffer == expected
+        
+        with pytest.raises(ValueError):
+            crypto_core.fast_xor_into(bytearray(10), data, key)
+        with pytest.raises(TypeError):
+            crypto_core.fast_xor_into(bytes(1000), data, key)
+
+    def test_base_convert_encode(self, crypto_core):
+        """Test that base conversion output stays within the charset."""
+        charset = "abcdef0123456789"
+        encoded = crypto_core.base_convert_encode(os.urandom(64), charset)
+        
+        assert isinstance(encoded, str) and encoded
+        assert set(encoded) <= set(charset)
+        assert crypto_core.base_convert_encode(b"", charset) == ""
+
+    def test_into_variants(self, crypto_core):
+        """Test the preallocated-output variants."""
+        out = bytearray(300)
+        written = crypto_core.fast_compress_rle_into(b"a" * 100, out)
+        assert crypto_core.fast_decompress_rle(bytes(out[:written])) == b"a" * 100
+        with pytest.raises(ValueError):
+            crypto_core.fast_compress_rle_into(bytes(range(100)), bytearray(10))
+
+        random_bytes = bytearray(64)
+        assert crypto_core.secure_random_bytes_into(random_bytes) == 64
+        assert random_bytes != bytearray(64)
+
+    @pytest.mark.parametrize("size", [1, 100, 5000, 70001])
+    def test_secure_memclear(self, crypto_core, size):
+        """Test zeroing buffers, including the non-temporal path."""
+        buffer = bytearray(b"\x5a" * (size + 2))
+        crypto_core.secure_memclear(memoryview(buffer)[1:-1])
+        assert buffer == b"\x5a" + bytes(size) + b"\x5a"
+
+    def test_secure_random_bytes_pool(self, crypto_core):
+        """Test pooled and direct random bytes, including after fork."""
+        from fastcrypter.native import native_loader
+
+        small = [crypto_core.secure_random_bytes(16) for _ in range(5000)]
+        assert len(set(small)) == len(small)
+        assert len(crypto_core.secure_random_bytes(100000)) == 100000
+
+        pool = native_loader._random_pool
+        assert bytes(pool.view[:pool.position]) == bytes(pool.position)
+
+        if not hasattr(os, 'fork'):
+            return
+        crypto_core.secure_random_bytes(16)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_fd, crypto_core.secure_random_bytes(16))
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert os.read(read_fd, 16) != crypto_core.secure_random_bytes(16)
+
+    @pytest.mark.parametrize("data", [
+        b"a",
+        b"\xff",
+        b"\xff" * 300,
+        b"\x00" * 1000 + b"abc" + b"\x01" * 7,
+        bytes(range(256)) * 4,
+    ])
+    @pytest.mark.parametrize("stride", [1, 3, 4])
+    def test_rle_roundtrip(self, crypto_core, data, stride):
+        """Test RLE round trips, including the 0xFF worst case."""
+        compressed = crypto_core.fast_compress_rle(data, stride=stride)
+        assert crypto_core.fast_decompress_rle(compressed, stride=stride) == data
+
+    def test_rle_swizzled_ratio(self, crypto_core):
+        """Test that per-component RLE finds runs in interleaved data."""
+        pixels = b"".join(bytes([i // 64, 7, 200, 255]) for i in range(4096))
+
+        plain = crypto_core.fast_compress_rle(pixels)
+        swizzled = crypto_core.fast_compress_rle(pixels, stride=4)
+        assert len(swizzled) * 10 < len(plain)
+
+        with pytest.raises(ValueError):
+            crypto_core.fast_compress_rle(pixels, stride=0)
+
+    @pytest.mark.parametrize("data", [
+        b"\x01",
+        b"\xff" * 4,
+        b"\x00" * 4 * 70000 + b"\x01\x02",
+        os.urandom(4 * 40000 + 3),
+        (b"\x00" * 64 + b"\xff" * 64 + b"bitmap") * 100,
+    ])
+    @pytest.mark.parametrize("mode", ["rle", "ewah"])
+    def test_compression_modes_roundtrip(self, crypto_core, data, mode):
+        """Test native codec round trips through the mode selector."""
+        compressed = crypto_core.fast_compress(data, mode=mode)
+        assert crypto_core.fast_decompress(compressed, mode=mode) == data
+
+    def test_ewah_bounded_expansion(self, crypto_core):
+        """Test that EWAH barely grows incompressible data."""
+        data = os.urandom(100000)
+        assert len(crypto_core.fast_compress_ewah(data)) <= len(data) + 16
+        assert len(crypto_core.fast_compress_ewah(bytes(100000))) < 100
+
+        with pytest.raises(ValueError):
+            crypto_core.fast_compress(data, mode="lz4")
+
+    @pytest.mark.parametrize("key_size", [16, 24, 32])
+    @pytest.mark.parametrize("size", [1, 16, 127, 128, 4099, 70000])
+    def test_aes_ctr(self, crypto_core, key_size, size):
+        """Test AES-CTR against the cryptography package."""
+        key = os.urandom(key_size)
+        iv = b"\xff" * 15 + b"\xfe"  # Carries across all 128 bits
+        data = os.urandom(size)
+
+        encryptor = Cipher(algorithms.AES(key), modes.CTR(iv)).encryptor()
+        expected = encryptor.update(data) + encryptor.finalize()
+
+        assert crypto_core.aes_ctr(key, iv, data) == expected
+        assert crypto_core.aes_ctr(key, iv, expected) == data
+
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"x",
+        os.urandom(5000),
+        b"\x00" * 10000 + os.urandom(100) + b"\xff" * 4096,
+    ])
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_pipeline_roundtrip(self, crypto_core, data, compress):
+        """Test fused compress + encrypt round trips."""
+        key, iv = os.urandom(32), os.urandom(16)
+        encrypted = crypto_core.pipeline_encrypt(data, key, iv, compress=compress)
+        assert crypto_core.pipeline_decrypt(encrypted, key, iv) == data
+
+    def test_pipeline_compresses_and_rejects_garbage(self, crypto_core):
+        """Test that the pipeline compresses and rejects malformed streams."""
+        key, iv = os.urandom(32), os.urandom(16)
+        data = b"\x00" * 100000
+        encrypted = crypto_core.pipeline_encrypt(data, key, iv)
+        assert len(encrypted) < len(data) // 10
+
+        with pytest.raises(NativeLibraryError):
+            crypto_core.pipeline_decrypt(encrypted[:-1], key, iv)
+        with pytest.raises(NativeLibraryError):
+            crypto_core.pipeline_decrypt(encrypted, os.urandom(32), iv)
+
+    def test_aes_ctr_validation(self, crypto_core):
+        """Test AES-CTR argument validation."""
+        with pytest.raises(ValueError):
+            crypto_core.aes_ctr(b"k" * 20, b"i" * 16, b"data")
+        with pytest.raises(ValueError):
+            crypto_core.aes_ctr(b"k" * 32, b"i" * 12, b"data")
+        assert crypto_core.aes_ctr(b"k" * 32, b"i" * 16, b"") == b""
+
+
+class TestHashAlgorithms:
+    """Test suite for HashAlgorithmsLib."""
+
+    def test_fast_pbkdf2_concurrent(self, hash_algorithms):
+        """Test that concurrent PBKDF2 calls (GIL released) stay correct."""
+        salts = [os.urandom(16) for _ in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            keys = list(executor.map(
+                lambda salt: hash_algorithms.fast_pbkdf2(b"password", salt, 2000, 70), salts))
+
+        for salt, key in zip(salts, keys):
+            assert key == hashlib.pbkdf2_hmac('sha256', b"password", salt, 2000, 70)
+
+    @pytest.mark.parametrize("length", [1, 32, 33, 100, 256])
+    def test_fast_pbkdf2_parallel(self, hash_algorithms, length):
+        """Test block-parallel PBKDF2 against hashlib."""
+        expected = hashlib.pbkdf2_hmac('sha256', b"password", b"salt", 500, length)
+        
+        assert hash_algorithms.fast_pbkdf2_parallel(b"password", b"salt", 500, length,
+                                                    max_workers=4) == expected
+        assert hash_algorithms.fast_pbkdf2(b"password", b"salt", 500, length) == expected
+        with pytest.raises(ValueError):
+            hash_algorithms.fast_pbkdf2_parallel(b"password", b"", 500, length)
+
+    def test_key_arena(self, hash_algorithms):
+        """Test that arena slots match the allocating keypair API."""
+        arena = hash_algorithms.key_arena(4)
+        message = b"message to sign"
+        
+        for slot in range(4):
+            arena.generate_keypair_into(slot)
+            arena.sign_into(slot, message)
+        
+        assert len({bytes(arena.private_key(slot)) for slot in range(4)}) == 4
+        assert arena.signature(2) != bytes(64)
+        for text in (message, b"other message"):
+            assert arena.verify_slot(2, text) == hash_algorithms.fast_verify(
+                arena.public_key(2), text, arena.signature(2))
+        
+        arena.clear()
+        assert arena.private_key(3) == bytes(32)
+        with pytest.raises(IndexError):
+            arena.sign_into(4, message)
+
+    def test_buffer_inputs(self, hash_algorithms):
+        """Test that any buffer-protocol object is accepted as input."""
+        words = array.array('I', range(1000))
+        mapped = mmap.mmap(-1, 4096)
+        mapped.write(b"m" * 4096)
+        data = os.urandom(1000)
+
+        assert hash_algorithms.fast_sha256(words) == hashlib.sha256(words.tobytes()).digest()
+        assert hash_algorithms.fast_sha256(mapped) == hashlib.sha256(b"m" * 4096).digest()
+        assert hash_algorithms.fast_sha256(memoryview(data)[::3]) == \
+            hashlib.sha256(data[::3]).digest()
+        assert hash_algorithms.fast_hmac_sha256(bytearray(b"key"), memoryview(data)) == \
+            hash_algorithms.fast_hmac_sha256(b"key", data)
+
+    def test_secret_outputs_wiped(self, hash_algorithms):
+        """Test that derived keys do not stay in the scratch buffer."""
+        from fastcrypter.native import native_loader
+
+        key = hash_algorithms.fast_pbkdf2(b"password", b"salt", 10, 32)
+        assert key == hashlib.pbkdf2_hmac('sha256', b"password", b"salt", 10, 32)
+        assert bytes(native_loader._scratch.view[:32]) == bytes(32)
+
+    def test_into_variants(self, hash_algorithms):
+        """Test the preallocated-output variants against hashlib."""
+        out = bytearray(32)
+        assert hash_algorithms.fast_sha256_into(b"data", out) == 32
+        assert out == hashlib.sha256(b"data").digest()
+
+        hash_algorithms.fast_hmac_sha256_into(b"key", b"data", memoryview(out))
+        assert out == hmac.new(b"key", b"data", hashlib.sha256).digest()
+
+        key = bytearray(70)
+        assert hash_algorithms.fast_pbkdf2_into(b"password", b"salt", 100, key) == 70
+        assert key == hashlib.pbkdf2_hmac('sha256', b"password", b"salt", 100, 70)
+
+        with pytest.raises(ValueError):
+            hash_algorithms.fast_sha256_into(b"data", bytearray(16))
+
+    def test_fast_sha256_many(self, hash_algorithms):
+        """Test batched SHA-256 against hashlib."""
+        messages = [os.urandom(size) for size in (0, 1, 55, 56, 64, 1000)]
+        
+        digests = hash_algorithms.fast_sha256_many(messages)
+        
+        assert digests == [hashlib.sha256(m).digest() for m in messages]
+        assert hash_algorithms.fast_sha256_many([]) == []
+
+    def test_benchmark_hash_loop(self, hash_algorithms):
+        """Test the native vs Python-driven hashing benchmark."""
+        results = hash_algorithms.benchmark_hash_loop(os.urandom(256), iterations=200, threads=3)
+        
+        assert set(results) == {'native', 'python', 'threaded', 'call_overhead'}
+        assert all(value >= 0 for value in results.values())
+        with pytest.raises(ValueError):
+            hash_algorithms.benchmark_hash_loop(b"data", iterations=0)
+
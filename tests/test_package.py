@@ -0,0 +1,39 @@
+"""
+Tests for the package namespace.
+"""
+
+import subprocess
+import sys
+
+import fastcrypter
+
+
+class TestPackage:
+    """Test suite for the top-level package."""
+
+    def test_import_is_lazy(self):
+        """Test that importing the package does not import heavy submodules."""
+        code = (
+            "import sys, fastcrypter\n"
+            "loaded = [m for m in sys.modules\n"
+            "          if m.startswith(('fastcrypter.core', 'fastcrypter.native', 'cryptography'))]\n"
+            "assert not loaded, loaded\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_lazy_attributes(self):
+        """Test that lazily imported names resolve to the real objects."""
+        from fastcrypter.secure_compressor import SecureCompressor
+
+        assert fastcrypter.SecureCompressor is SecureCompressor
+        assert isinstance(fastcrypter.NATIVE_SUPPORT, bool)
+        assert "features" in fastcrypter.PACKAGE_INFO
+        assert "Encryptor" in dir(fastcrypter)
+
+        namespace = {}
+        exec("from fastcrypter import *", namespace)
+        assert set(fastcrypter.__all__) <= set(namespace)
+
+    def test_unknown_attribute(self):
+        """Test that unknown names still raise AttributeError."""
+        assert not hasattr(fastcrypter, "does_not_exist")
@@ -2,6 +2,7 @@
 Tests for SecureCompressor class.
 """
 
+import io
 import pytest
 from fastcrypter import SecureCompressor
 from fastcrypter.exceptions import ValidationError, EncrypterError
@@ -15,6 +16,14 @@ class TestSecureCompressor:
         compressor = SecureCompressor(password="test_password123")
         assert compressor.password == "test_password123"
 
+    def test_default_kdf(self):
+        """Test that Argon2id is the default KDF."""
+        compressor = SecureCompressor(password="test_password123")
+        assert compressor.key_manager.kdf_algorithm == 'argon2id'
+
+        compressor = SecureCompressor(password="test_password123", kdf_algorithm='pbkdf2')
+        assert compressor.key_manager.kdf_algorithm == 'pbkdf2'
+
     def test_weak_password_error(self):
         """Test that weak password raises error."""
         with pytest.raises(ValidationError):
@@ -52,12 +61,40 @@ class TestSecureCompressor:
         
         # Should be a string with only specified characters
         assert isinstance(encrypted, str)
-        for char in encrypted:
-            assert char in "abcdef0123456789"
+        assert set(encrypted) <= set("abcdef0123456789")
         
         decrypted = compressor.decrypt_and_decompress(encrypted, input_format='custom')
         assert data == decrypted
 
+    def test_skip_compression_for_incompressible_input(self):
+        """Test that small and high-entropy inputs are stored uncompressed."""
+        compressor = SecureCompressor(password="test_password", use_fast_extensions=False)
+
+        small = b"short record"
+        assert compressor._compress(small)[0] == 0
+        random_data = bytes(range(256)) * 64
+        assert compressor._compress(random_data)[0] == 0
+        assert compressor._compress(b"compressible " * 100)[0] != 0
+
+        compressor = SecureCompressor(password="test_password", use_fast_extensions=False,
+                                      min_compress_size=1)
+        assert compressor._compress(b"a" * 32)[0] != 0
+
+        for data in (small, random_data):
+            assert compressor.decrypt_and_decompress(compressor.compress_and_encrypt(data)) == data
+
+        # The fast codec is only used once the checks have passed
+        compressor = SecureCompressor(password="test_password")
+        assert compressor._compress(small)[0] == 0
+        assert compressor._compress(random_data)[0] == 0
+
+    def test_fast_extension_output_is_portable(self):
+        """Test that output written with the extensions reads back without them."""
+        data = b"portable record " * 100
+        encrypted = SecureCompressor(password="test_password").compress_and_encrypt(data)
+        compressor = SecureCompressor(password="test_password", use_fast_extensions=False)
+        assert compressor.decrypt_and_decompress(encrypted) == data
+
     def test_password_strength_validation(self):
         """Test password strength validation."""
         compressor = SecureCompressor(password="WeakPass123!")
@@ -69,6 +106,21 @@ class TestSecureCompressor:
         assert 'checks' in strength
         assert 'recommendations' in strength
 
+    def test_password_strength_character_classes(self):
+        """Test character class detection, including non-ASCII characters."""
+        compressor = SecureCompressor(password="WeakPass123!")
+
+        checks = compressor.validate_password_strength("ÉCOLE²")['checks']
+        assert checks['has_uppercase']
+        assert not checks['has_lowercase']
+        assert checks['has_digits']
+        assert not checks['has_special_chars']
+
+        weak = compressor.validate_password_strength("abc def")
+        assert weak['checks']['has_special_chars']
+        assert "Add uppercase letters" in weak['recommendations']
+        assert "Add numbers" in weak['recommendations']
+
     def test_change_password(self):
         """Test changing password."""
         compressor = SecureCompressor(password="old_password123")
@@ -96,6 +148,8 @@ class TestSecureCompressor:
         ratio = compressor.get_compression_ratio(data, encrypted)
         
         assert ratio > 0
+        assert compressor.get_compression_ratio(len(data), encrypted) == ratio
+        assert compressor.get_compression_ratio(data.decode(), encrypted) == ratio
 
     def test_estimate_output_size(self):
         """Test output size estimation."""
@@ -118,6 +172,21 @@ class TestSecureCompressor:
         assert 'key_manager_info' in info
         assert 'password_strength' in info
 
+    def test_get_info_is_lazy(self):
+        """Test that get_info only computes the entries that are read."""
+        compressor = SecureCompressor(password="test_password")
+        calls = []
+        compressor.validate_password_strength = lambda: calls.append(1) or {}
+
+        info = compressor.get_info()
+        assert info['version'] == '1.0.0'
+        assert 'password_strength' in info
+        assert calls == []
+
+        info['password_strength']
+        info['password_strength']
+        assert calls == [1]
+
     def test_benchmark_performance(self):
         """Test performance benchmarking."""
         compressor = SecureCompressor(password="test_password")
@@ -149,3 +218,57 @@ class TestSecureCompressor:
         decrypted = compressor.decrypt_and_decompress_to_string(encrypted)
         
         assert text == decrypted
+
+    @pytest.mark.parametrize("algorithm", ["zlib", "lzma", "brotli"])
+    def test_stream_roundtrip(self, algorithm):
+        """Test streaming compression and encryption round trip."""
+        compressor = SecureCompressor(password="test_password",
+                                      compression_algorithm=algorithm)
+        data = b"Streaming test data " * 20000
+
+        encrypted = io.BytesIO()
+        written = compressor.compress_and_encrypt_stream(io.BytesIO(data), encrypted.write)
+        assert written == len(encrypted.getvalue())
+
+        # Feed the ciphertext back in chunks that do not align with anything
+        blob = encrypted.getvalue()
+        chunks = [blob[i:i + 1000] for i in range(0, len(blob), 1000)]
+        decrypted = io.BytesIO()
+        compressor.decrypt_and_decompress_stream(chunks, decrypted.write)
+
+        assert decrypted.getvalue() == data
+        assert compressor.decrypt_and_decompress(blob) == data
+
+    def test_stream_tampering_detected(self):
+        """Test that modified or truncated streams are rejected."""
+        compressor = SecureCompressor(password="test_password")
+        encrypted = io.BytesIO()
+        compressor.compress_and_encrypt_stream([b"Secret data " * 100], encrypted.write)
+        blob = encrypted.getvalue()
+
+        with pytest.raises(EncrypterError):
+            compressor.decrypt_and_decompress_stream([blob[:-1]], io.BytesIO().write)
+
+        tampered = bytearray(blob)
+        tampered[-1] ^= 1
+        with pytest.raises(EncrypterError):
+            compressor.decrypt_and_decompress_stream([bytes(tampered)], io.BytesIO().write)
+
+    def test_batch_roundtrip(self):
+        """Test batch compression and encryption round trip."""
+        compressor = SecureCompressor(password="test_password")
+        records = [b"record %d " % i * (i + 1) for i in range(20)] + ["text record"]
+
+        encrypted = list(compressor.batch_compress_and_encrypt(records))
+        assert len(encrypted) == len(records)
+        assert len(set(encrypted)) == len(encrypted)
+
+        # Batch records use the regular format
+        assert compressor.decrypt_and_decompress(encrypted[3]) == records[3]
+
+        # Mix in a record from the single-message API with its own salt
+        encrypted.append(compressor.compress_and_encrypt(b"single"))
+        decrypted = list(compressor.batch_decrypt_and_decompress(encrypted))
+        assert decrypted[:-2] == records[:-1]
+        assert decrypted[-2] == b"text record"
+        assert decrypted[-1] == b"single"